@@ -1,20 +1,49 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.dependencies.base import get_session
+from app.api.dependencies.base import get_read_session, get_session
+from app.api.dependencies.outbox import get_outbox_repository
+from app.api.dependencies.unit_of_work import get_unit_of_work
 from app.application.ports.auction_repository import AuctionRepository
+from app.application.ports.outbox_repository import OutboxRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.application.services.auction_service import AuctionService
+from app.core.config import settings
 from app.core.logging_setup import get_logger
 from app.infrastructure.db.repositories.sqlalchemy_auction_repository import SQLAlchemyAuctionRepository
+from app.infrastructure.memory.repositories.in_memory_auction_repository import InMemoryAuctionRepository
+from app.infrastructure.memory.store import memory_store
+from app.infrastructure.observability.tracing import traced
 
 
 async def get_auction_repository(
         session: AsyncSession = Depends(get_session)
 ) -> AuctionRepository:
-    return SQLAlchemyAuctionRepository(session)
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryAuctionRepository(memory_store), "repository")
+    return traced(SQLAlchemyAuctionRepository(session), "repository")
+
+
+async def get_auction_read_repository(
+        session: AsyncSession = Depends(get_read_session)
+) -> AuctionRepository:
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryAuctionRepository(memory_store), "repository")
+    return traced(SQLAlchemyAuctionRepository(session), "repository")
 
 
 async def get_auction_service(
-        repo: AuctionRepository = Depends(get_auction_repository)
+        repo: AuctionRepository = Depends(get_auction_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work),
+        outbox: OutboxRepository = Depends(get_outbox_repository)
+) -> AuctionService:
+    auction_logger = get_logger("auctions")
+    return traced(AuctionService(repo, auction_logger, uow, outbox), "service")
+
+
+async def get_auction_read_service(
+        repo: AuctionRepository = Depends(get_auction_read_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> AuctionService:
+    """Servicio para rutas de solo lectura (puede leer de la réplica). La unidad de trabajo no se llega a usar."""
     auction_logger = get_logger("auctions")
-    return AuctionService(repo, auction_logger)
+    return traced(AuctionService(repo, auction_logger, uow), "service")
@@ -1,11 +1,20 @@
 import jwt
 
 from app.core.config import settings
-from app.api.dependencies.users import get_user_repository
+from app.api.dependencies.auth_sessions import auth_session_cache, get_auth_session_repository
+from app.api.dependencies.unit_of_work import get_unit_of_work
+from app.api.dependencies.users import get_user_read_repository, get_user_repository
 from app.api.v1.schemas.token import TokenPayload
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.application.ports.user_repository import UserRepository
+from app.application.services.auth_service import AuthService
+from app.core.logging_setup import get_logger
 from app.domain.exceptions import UserInactiveError
 from app.domain.models.user import User
+from app.infrastructure.db.routing import replica_router
+from app.infrastructure.observability.tracing import traced
+from datetime import timedelta
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import PyJWTError, InvalidTokenError
@@ -21,9 +30,21 @@ token.
 """
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl = f"{settings.API_V1_STR}/auth/login")
 
+async def get_auth_service(
+        session_repo: AuthSessionRepository = Depends(get_auth_session_repository),
+        user_repo: UserRepository = Depends(get_user_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work)
+) -> AuthService:
+    auth_logger = get_logger("users")
+    refresh_token_lifetime = timedelta(days = settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    return traced(AuthService(session_repo, user_repo, auth_session_cache, refresh_token_lifetime, auth_logger, uow), "service")
+
+
 async def get_current_user(
         token: Annotated[str, Depends(oauth2_scheme)],
-        user_repo: Annotated[UserRepository, Depends(get_user_repository)]
+        user_read_repo: Annotated[UserRepository, Depends(get_user_read_repository)],
+        user_repo: Annotated[UserRepository, Depends(get_user_repository)],
+        auth_service: Annotated[AuthService, Depends(get_auth_service)]
 ) -> User:
     credentials_exception = HTTPException(
         status_code = status.HTTP_401_UNAUTHORIZED,
@@ -46,10 +67,24 @@ async def get_current_user(
     except (PyJWTError, ValidationError, InvalidTokenError):
         # Capturamos tanto errores de firma (JWT) como de estructura (Pydantic)
         raise credentials_exception
+
+    # Tokens de una sesión cerrada (logout o reutilización del refresh token). Casi siempre sin consultas
+    if token_data.sid:
+        try:
+            session_id = UUID(token_data.sid)
+        except ValueError:
+            raise credentials_exception
+        if not await auth_service.is_session_active(session_id):
+            raise credentials_exception
     
-    # Usamos el repositorio para buscar al usuario
+    # Usamos el repositorio para buscar al usuario (primero en la réplica, si la hay)
     user_id_uuid = UUID(token_data.sub)
-    user = await user_repo.get_by_id(user_id_uuid)
+    user = await user_read_repo.get_by_id(user_id_uuid)
+
+    # Un usuario recién creado puede no haber llegado aún a la réplica
+    # (la sesión de la primaria no abre conexión hasta que se usa)
+    if not user and replica_router.has_replica:
+        user = await user_repo.get_by_id(user_id_uuid)
 
     if not user:
         raise credentials_exception
@@ -58,3 +93,12 @@ async def get_current_user(
         raise UserInactiveError("Usuario inactivo.")
     
     return user
+
+
+async def get_current_superuser(
+        current_user: Annotated[User, Depends(get_current_user)]
+) -> User:
+    """Rutas de administración y diagnóstico."""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code = status.HTTP_403_FORBIDDEN, detail = "Se necesitan permisos de administrador")
+    return current_user
@@ -0,0 +1,26 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies.base import get_session
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.application.services.auth_service import AuthSessionCache
+from app.core.config import settings
+from app.infrastructure.db.repositories.sqlalchemy_auth_session_repository import SQLAlchemyAuthSessionRepository
+from app.infrastructure.memory.repositories.in_memory_auth_session_repository import InMemoryAuthSessionRepository
+from app.infrastructure.memory.store import memory_store
+from app.infrastructure.observability.tracing import traced
+
+
+# Instancia única por proceso: estado de las sesiones para no consultarlo en cada petición
+auth_session_cache = AuthSessionCache(
+    ttl_seconds = settings.AUTH_SESSION_CACHE_TTL_SECONDS,
+    max_entries = settings.AUTH_SESSION_CACHE_MAX_ENTRIES
+)
+
+
+async def get_auth_session_repository(
+        session: AsyncSession = Depends(get_session)
+) -> AuthSessionRepository:
+    # Siempre la primaria: una sesión revocada no puede parecer activa por el retraso de la réplica
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryAuthSessionRepository(memory_store), "repository")
+    return traced(SQLAlchemyAuthSessionRepository(session), "repository")
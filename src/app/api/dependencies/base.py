@@ -1,9 +1,56 @@
+import math
+
+from app.core.config import settings
+from app.infrastructure.db.routing import replica_router
 from app.infrastructure.db.session import AsyncSessionLocal
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Marca de read-your-writes: cookie para navegadores, cabecera para clientes sin cookies
+READ_YOUR_WRITES_COOKIE = "licit_ryw"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def get_write_marker(request: Request) -> Optional[str]:
+    """Marca firmada de la última escritura del cliente (la valida 'replica_router')."""
+    return request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    # Quien modifica datos lee de la primaria durante un tiempo (read-your-writes). La marca viaja
+    # con el cliente: la siguiente lectura puede atenderla otro worker. Sin réplica, no hace falta
+    if request.method not in SAFE_METHODS and replica_router.has_replica:
+        marker = replica_router.mark_write()
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            marker,
+            max_age = math.ceil(settings.DB_READ_YOUR_WRITES_SECONDS),
+            httponly = True,
+            secure = settings.ENV_STATE != "dev",
+            samesite = "lax"
+        )
+        response.headers[READ_YOUR_WRITES_HEADER] = marker
+
     async with AsyncSessionLocal() as session:
         yield session
         # Al salir del bloque 'async with', la sesión se cierra automáticamente
+
+
+async def get_read_session(
+        request: Request,
+        session: AsyncSession = Depends(get_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sesión para rutas de solo lectura: réplica o primaria según retraso y escrituras recientes.
+    Si la lectura va a la primaria, se reutiliza la sesión de la petición (una sola conexión).
+    """
+    if not replica_router.route(get_write_marker(request)):
+        yield session
+        return
+
+    async with replica_router.replica_factory() as replica_session:
+        yield replica_session
@@ -1,23 +1,54 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.dependencies.base import get_session
-from app.api.dependencies.auctions import get_auction_repository
+from app.api.dependencies.base import get_read_session, get_session
+from app.api.dependencies.auctions import get_auction_read_repository, get_auction_repository
+from app.api.dependencies.outbox import get_outbox_repository
+from app.api.dependencies.unit_of_work import get_unit_of_work
 from app.application.ports.auction_repository import AuctionRepository
 from app.application.ports.bid_repository import BidRepository
+from app.application.ports.outbox_repository import OutboxRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.application.services.bid_service import BidService
+from app.core.config import settings
 from app.core.logging_setup import get_logger
 from app.infrastructure.db.repositories.sqlalchemy_bid_repository import SQLAlchemyBidRepository
+from app.infrastructure.events.in_process_event_bus import event_bus
+from app.infrastructure.memory.repositories.in_memory_bid_repository import InMemoryBidRepository
+from app.infrastructure.memory.store import memory_store
+from app.infrastructure.observability.tracing import traced
 
 
 async def get_bid_repository(
         session: AsyncSession = Depends(get_session)
 ) -> BidRepository:
-    return SQLAlchemyBidRepository(session)
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryBidRepository(memory_store), "repository")
+    return traced(SQLAlchemyBidRepository(session), "repository")
+
+
+async def get_bid_read_repository(
+        session: AsyncSession = Depends(get_read_session)
+) -> BidRepository:
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryBidRepository(memory_store), "repository")
+    return traced(SQLAlchemyBidRepository(session), "repository")
 
 
 async def get_bid_service(
         bid_repo: BidRepository = Depends(get_bid_repository),
-        auction_repo: AuctionRepository = Depends(get_auction_repository)
+        auction_repo: AuctionRepository = Depends(get_auction_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work),
+        outbox: OutboxRepository = Depends(get_outbox_repository)
+) -> BidService:
+    bid_logger = get_logger("bids")
+    return traced(BidService(bid_logger, bid_repo, auction_repo, uow, event_bus, outbox), "service")
+
+
+async def get_bid_read_service(
+        bid_repo: BidRepository = Depends(get_bid_read_repository),
+        auction_repo: AuctionRepository = Depends(get_auction_read_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> BidService:
+    """Servicio para rutas de solo lectura (puede leer de la réplica). La unidad de trabajo no se llega a usar."""
     bid_logger = get_logger("bids")
-    return BidService(bid_logger, bid_repo, auction_repo)
+    return traced(BidService(bid_logger, bid_repo, auction_repo, uow), "service")
@@ -0,0 +1,62 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies.auctions import get_auction_repository
+from app.api.dependencies.base import get_read_session, get_session
+from app.api.dependencies.unit_of_work import get_unit_of_work
+from app.application.ports.auction_image_repository import AuctionImageRepository
+from app.application.ports.auction_repository import AuctionRepository
+from app.application.ports.unit_of_work import UnitOfWork
+from app.application.services.auction_image_service import AuctionImageService
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.db.repositories.sqlalchemy_auction_image_repository import SQLAlchemyAuctionImageRepository
+from app.infrastructure.memory.repositories.in_memory_auction_image_repository import InMemoryAuctionImageRepository
+from app.infrastructure.memory.store import memory_store
+from app.infrastructure.storage.local_object_store import LocalObjectStore
+from app.infrastructure.storage.thumbnailer import ProcessPoolThumbnailer
+from app.infrastructure.observability.tracing import traced
+
+
+# Instancias únicas por proceso. El pool de miniaturas se para en el 'lifespan' (main.py)
+object_store = LocalObjectStore(settings.IMAGE_STORAGE_PATH)
+image_thumbnailer = ProcessPoolThumbnailer(
+    object_store,
+    max_side = settings.IMAGE_THUMBNAIL_SIZE,
+    workers = settings.IMAGE_THUMBNAIL_WORKERS,
+    logger = get_logger("auctions")
+)
+
+
+async def get_auction_image_repository(
+        session: AsyncSession = Depends(get_session)
+) -> AuctionImageRepository:
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryAuctionImageRepository(memory_store), "repository")
+    return traced(SQLAlchemyAuctionImageRepository(session), "repository")
+
+
+async def get_auction_image_read_repository(
+        session: AsyncSession = Depends(get_read_session)
+) -> AuctionImageRepository:
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryAuctionImageRepository(memory_store), "repository")
+    return traced(SQLAlchemyAuctionImageRepository(session), "repository")
+
+
+async def get_auction_image_service(
+        image_repo: AuctionImageRepository = Depends(get_auction_image_repository),
+        auction_repo: AuctionRepository = Depends(get_auction_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work)
+) -> AuctionImageService:
+    auction_logger = get_logger("auctions")
+    return traced(AuctionImageService(image_repo, auction_repo, object_store, image_thumbnailer, auction_logger, uow), "service")
+
+
+async def get_auction_image_read_service(
+        image_repo: AuctionImageRepository = Depends(get_auction_image_read_repository),
+        auction_repo: AuctionRepository = Depends(get_auction_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work)
+) -> AuctionImageService:
+    """Servicio para rutas de solo lectura (puede leer de la réplica). La unidad de trabajo no se llega a usar."""
+    auction_logger = get_logger("auctions")
+    return traced(AuctionImageService(image_repo, auction_repo, object_store, image_thumbnailer, auction_logger, uow), "service")
@@ -0,0 +1,18 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies.base import get_session
+from app.application.ports.outbox_repository import OutboxRepository
+from app.core.config import settings
+from app.infrastructure.db.repositories.sqlalchemy_outbox_repository import SQLAlchemyOutboxRepository
+from app.infrastructure.memory.repositories.in_memory_outbox_repository import InMemoryOutboxRepository
+from app.infrastructure.memory.store import memory_store
+from app.infrastructure.observability.tracing import traced
+
+
+async def get_outbox_repository(
+        session: AsyncSession = Depends(get_session)
+) -> OutboxRepository:
+    # Misma sesión que el resto de repositorios de la petición: el evento se confirma con el cambio
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryOutboxRepository(memory_store), "repository")
+    return traced(SQLAlchemyOutboxRepository(session), "repository")
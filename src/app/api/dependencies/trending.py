@@ -0,0 +1,24 @@
+from fastapi import Depends
+from app.api.dependencies.auctions import get_auction_read_repository
+from app.application.ports.auction_repository import AuctionRepository
+from app.application.services.trending_service import TrendingService, TrendingTracker
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.observability.tracing import traced
+
+
+# Instancia única por proceso: se alimenta de los eventos 'BidPlaced' (ver 'lifespan' en main.py)
+trending_tracker = TrendingTracker(
+    window_seconds = settings.TRENDING_WINDOW_MINUTES * 60,
+    bucket_seconds = settings.TRENDING_BUCKET_SECONDS,
+    max_tracked = settings.TRENDING_MAX_TRACKED,
+    snapshot_seconds = settings.TRENDING_SNAPSHOT_SECONDS,
+    max_k = settings.TRENDING_MAX_K
+)
+
+
+async def get_trending_service(
+        repo: AuctionRepository = Depends(get_auction_read_repository)
+) -> TrendingService:
+    auction_logger = get_logger("auctions")
+    return traced(TrendingService(trending_tracker, repo, auction_logger), "service")
@@ -0,0 +1,17 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies.base import get_session
+from app.application.ports.unit_of_work import UnitOfWork
+from app.core.config import settings
+from app.infrastructure.db.unit_of_work import SQLAlchemyUnitOfWork
+from app.infrastructure.memory.unit_of_work import InMemoryUnitOfWork
+from app.infrastructure.observability.tracing import traced
+
+
+async def get_unit_of_work(
+        session: AsyncSession = Depends(get_session)
+) -> UnitOfWork:
+    # Misma sesión que los repositorios de la petición: un commit confirma todos sus cambios
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryUnitOfWork(), "unit_of_work")
+    return traced(SQLAlchemyUnitOfWork(session), "unit_of_work")
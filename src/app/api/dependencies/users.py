@@ -1,20 +1,40 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.dependencies.base import get_session
+from app.api.dependencies.auth_sessions import auth_session_cache, get_auth_session_repository
+from app.api.dependencies.base import get_read_session, get_session
+from app.api.dependencies.unit_of_work import get_unit_of_work
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.application.ports.user_repository import UserRepository
 from app.application.services.user_service import UserService
+from app.core.config import settings
 from app.core.logging_setup import get_logger
 from app.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.infrastructure.memory.repositories.in_memory_user_repository import InMemoryUserRepository
+from app.infrastructure.memory.store import memory_store
+from app.infrastructure.observability.tracing import traced
 
 
 async def get_user_repository(
         session: AsyncSession = Depends(get_session)
 ) -> UserRepository:
-    return SQLAlchemyUserRepository(session)
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryUserRepository(memory_store), "repository")
+    return traced(SQLAlchemyUserRepository(session), "repository")
+
+
+async def get_user_read_repository(
+        session: AsyncSession = Depends(get_read_session)
+) -> UserRepository:
+    if settings.REPOSITORY_BACKEND == "memory":
+        return traced(InMemoryUserRepository(memory_store), "repository")
+    return traced(SQLAlchemyUserRepository(session), "repository")
 
 
 async def get_user_service(
-        repo: UserRepository = Depends(get_user_repository)
+        repo: UserRepository = Depends(get_user_repository),
+        uow: UnitOfWork = Depends(get_unit_of_work),
+        session_repo: AuthSessionRepository = Depends(get_auth_session_repository)
 ) -> UserService:
     user_logger = get_logger("users")
-    return UserService(repo, user_logger)
+    return traced(UserService(repo, user_logger, uow, session_repo, auth_session_cache), "service")
@@ -0,0 +1,37 @@
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.db import profiling
+from fastapi import Request
+
+
+db_logger = get_logger("db")
+
+async def query_profiler_middleware(request: Request, call_next):
+    # 1. Abrir el contador de sentencias para esta petición
+    # (request_id_middleware ya ha fijado el request_id en el contexto)
+    request_id = request.state.request_id
+    profiling.start_request(request_id)
+
+    try:
+        response = await call_next(request)
+    finally:
+        # 2. Cerrar el contador siempre, aunque la petición falle
+        stats = profiling.finish_request(request_id)
+
+    # 3. Exponer las métricas al cliente y a los logs
+    response.headers["Server-Timing"] = stats.server_timing()
+    db_logger.bind(request_id = request_id).debug(
+        "{} {} -> {} sentencias SQL y {} commits en {:.2f} ms (más lenta: {:.2f} ms)",
+        request.method, request.url.path, stats.statements, stats.commits, stats.total_ms, stats.slowest_ms
+    )
+
+    # 4. Avisar si se supera el presupuesto de sentencias o hay una sentencia lenta
+    if stats.statements > settings.DB_QUERY_BUDGET or stats.slowest_ms >= settings.DB_SLOW_QUERY_MS:
+        db_logger.bind(request_id = request_id).warning(
+            "{} {} excede el presupuesto SQL: {} sentencias (máx. {}), {:.2f} ms en total. "
+            "Sentencia más lenta ({:.2f} ms): {} | parámetros: {}",
+            request.method, request.url.path, stats.statements, settings.DB_QUERY_BUDGET, stats.total_ms,
+            stats.slowest_ms, stats.slowest_statement, stats.slowest_parameters
+        )
+
+    return response
@@ -0,0 +1,108 @@
+import math
+import re
+import time
+
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.db.concurrency_limiter import AdaptiveConcurrencyLimiter, Priority, is_overload_error
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+db_logger = get_logger("db")
+
+# (método, ruta bajo API_V1_STR, prioridad). La primera que coincide; el resto son NORMAL
+ROUTE_PRIORITIES = [
+    ("POST", re.compile(r"^/bids/(batch)?$"), Priority.CRITICAL),
+    ("GET", re.compile(r"^/auctions/(?!trending$|export$)[^/]+$"), Priority.CRITICAL), # Detalle de subasta
+    ("GET", re.compile(r"^/auctions/$"), Priority.LOW), # Listado completo
+    ("GET", re.compile(r"^/auctions/export$"), Priority.LOW),
+    ("POST", re.compile(r"^/auctions/import$"), Priority.LOW),
+]
+
+# Rutas cuya duración no depende de la BD (no se usan como muestra): streaming de ficheros y
+# perfiles, que duran lo que se pida
+UNSAMPLED_ROUTES = re.compile(r"^(/auctions/(export|import)|/debug/(profile|memory))$")
+
+
+def route_priority(method: str, path: str) -> Priority:
+    for route_method, pattern, priority in ROUTE_PRIORITIES:
+        if method == route_method and pattern.match(path):
+            return priority
+    return Priority.NORMAL
+
+
+class LoadSheddingMiddleware:
+    """
+    Control de admisión delante de las rutas de la API (todas usan la BD).
+
+    Middleware ASGI puro (no 'app.middleware("http")'): la plaza se libera cuando termina de
+    enviarse la respuesta, también en las respuestas en streaming.
+    - Por encima del límite de su prioridad, la petición recibe 503 con 'Retry-After' al momento.
+    - Si la petición falla por sobrecarga de la BD (pool agotado o sentencia cortada) y aún no
+      se ha enviado nada, también se responde 503 y el límite se recorta.
+    """
+    def __init__(self, app: ASGIApp, limiter: AdaptiveConcurrencyLimiter):
+        self.app = app
+        self.limiter = limiter
+        self.prefix = settings.API_V1_STR
+        self._last_warning = 0.0
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"][len(self.prefix):]
+        if not self.limiter.try_acquire(route_priority(scope["method"], path)):
+            self._warn_shedding(scope)
+            await self._overloaded_response(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        start = time.perf_counter()
+        latency = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+            if not UNSAMPLED_ROUTES.match(path):
+                latency = time.perf_counter() - start
+
+        except Exception as exc:
+            if not is_overload_error(exc):
+                raise
+            self.limiter.on_overload()
+            db_logger.warning("{} {}: BD saturada ({}). Límite: {:.1f}", scope["method"], scope["path"], type(exc).__name__, self.limiter.limit)
+            if response_started:
+                raise
+            await self._overloaded_response(scope, receive, send)
+
+        finally:
+            self.limiter.release(latency)
+
+
+    async def _overloaded_response(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code = 503,
+            content = {"error_code": "SERVICE_OVERLOADED", "message": "El servicio está saturado. Inténtelo de nuevo en unos segundos."},
+            headers = {"Retry-After": str(math.ceil(settings.LOAD_SHEDDING_RETRY_AFTER_SECONDS))}
+        )
+        await response(scope, receive, send)
+
+
+    def _warn_shedding(self, scope: Scope) -> None:
+        # Como mucho un aviso por segundo: bajo sobrecarga se rechazan cientos de peticiones
+        now = time.monotonic()
+        if now - self._last_warning >= 1.0:
+            self._last_warning = now
+            db_logger.warning(
+                "Rechazando peticiones por sobrecarga (p. ej. {} {}): {}",
+                scope["method"], scope["path"], self.limiter.snapshot()
+            )
@@ -0,0 +1,55 @@
+from app.core.logging_setup import request_id_var
+from app.infrastructure.observability.tracing import Tracer, current_span
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class TracingMiddleware:
+    """
+    Span raíz de cada petición muestreada: lo heredan los spans de servicios, repositorios y SQL.
+
+    Middleware ASGI puro, como el de control de admisión: el span termina cuando se ha enviado
+    la respuesta completa (también en streaming). El nombre es la plantilla de la ruta
+    ('GET /api/v1/auctions/{auction_id}'), para agrupar las trazas por endpoint.
+    La respuesta lleva 'X-Trace-ID' para localizar la traza en el fichero.
+    """
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent = Headers(scope = scope).get("traceparent"),
+            attributes = {"http.method": scope["method"], "http.path": scope["path"], "request_id": request_id_var.get()}
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                MutableHeaders(scope = message)["X-Trace-ID"] = root.trace.trace_id
+            await send(message)
+
+        token = current_span.set(root)
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+            if error is None and root.attributes.get("http.status_code", 500) >= 500:
+                root.status = "error"
+            self.tracer.end_trace(root, error)
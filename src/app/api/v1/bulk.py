@@ -0,0 +1,166 @@
+"""
+Lectura y escritura en streaming de ficheros de subastas (CSV y NDJSON) para la importación
+y exportación masivas. Todo funciona por líneas o por lotes: ni el cuerpo de la petición ni
+la respuesta se cargan enteros en memoria.
+"""
+import codecs
+import csv
+import io
+import json
+
+from app.api.v1.schemas.auction import AuctionResponse
+from app.domain.models.auction import Auction
+from typing import AsyncIterable, AsyncIterator, Optional
+
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Columnas de la exportación. La importación solo usa las de 'AuctionCreate' e ignora el resto,
+# así que un fichero exportado se puede volver a importar
+EXPORT_FIELDS = [
+    "id", "title", "description", "starting_price", "current_price", "start_time", "end_time", "state",
+    "seller_id", "winner_id", "bid_count", "bidder_count", "last_bid_at", "created_at", "updated_at",
+]
+
+MAX_LINE_CHARS = 64 * 1024 # Una fila más larga se rechaza sin acumularla
+EXPORT_FLUSH_ROWS = 200 # Filas por fragmento de la respuesta
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    """'csv' o 'ndjson' según la cabecera Content-Type (None si no es ninguno de los dos)."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json"):
+        return "ndjson"
+    return None
+
+
+# --- IMPORTACIÓN ---
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Líneas de texto (con su salto de línea) de un cuerpo en UTF-8 que llega por fragmentos.
+    Una línea de más de 'MAX_LINE_CHARS' se descarta y se devuelve como None.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors = "replace")
+    buffer, too_long = "", False
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        while True:
+            newline = buffer.find("\n")
+            if newline == -1:
+                break
+            line, buffer = buffer[:newline + 1], buffer[newline + 1:]
+            yield None if too_long else line
+            too_long = False
+        if len(buffer) > MAX_LINE_CHARS:
+            buffer, too_long = "", True
+
+    buffer += decoder.decode(b"", final = True)
+    if too_long:
+        yield None
+    elif buffer:
+        yield buffer
+
+
+async def parse_csv(lines: AsyncIterable[Optional[str]]) -> AsyncIterator[tuple[int, dict | str]]:
+    """
+    Filas de un CSV con cabecera como (nº de fila, {columna: valor}) o (nº de fila, mensaje de error).
+    Las celdas vacías se omiten (el campo toma su valor por defecto). Admite campos entre comillas
+    con saltos de línea.
+    """
+    header, pending, row_number = None, "", 0
+
+    async for line in lines:
+        if line is None:
+            row_number += 1
+            pending = ""
+            yield row_number, "Fila demasiado larga."
+            continue
+
+        pending += line
+        # Comillas impares: un campo entre comillas continúa en la línea siguiente
+        if pending.count('"') % 2 and len(pending) <= MAX_LINE_CHARS:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            row_number += 1
+            yield row_number, f"CSV no válido: {e}"
+            continue
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, f"Se esperaban {len(header)} columnas y la fila tiene {len(values)}."
+            continue
+        yield row_number, {name: value for name, value in zip(header, values) if value != ""}
+
+    if pending.strip():
+        yield row_number + 1, "Comillas sin cerrar al final del fichero."
+
+
+async def parse_ndjson(lines: AsyncIterable[Optional[str]]) -> AsyncIterator[tuple[int, dict | str]]:
+    """Objetos de un NDJSON (uno por línea) como (nº de fila, objeto) o (nº de fila, mensaje de error)."""
+    row_number = 0
+
+    async for line in lines:
+        if line is not None and not line.strip():
+            continue
+        row_number += 1
+        if line is None:
+            yield row_number, "Fila demasiado larga."
+            continue
+
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, f"JSON no válido: {e.msg}."
+            continue
+
+        if not isinstance(data, dict):
+            yield row_number, "Cada línea debe ser un objeto JSON."
+            continue
+        yield row_number, data
+
+
+def parse_rows(chunks: AsyncIterable[bytes], format: str) -> AsyncIterator[tuple[int, dict | str]]:
+    lines = iter_lines(chunks)
+    return parse_csv(lines) if format == "csv" else parse_ndjson(lines)
+
+
+# --- EXPORTACIÓN ---
+async def encode_auctions(auctions: AsyncIterable[Auction], format: str) -> AsyncIterator[str]:
+    """Texto del fichero exportado, en fragmentos de 'EXPORT_FLUSH_ROWS' filas."""
+    buffer = io.StringIO()
+    writer = None
+    if format == "csv":
+        writer = csv.DictWriter(buffer, fieldnames = EXPORT_FIELDS, extrasaction = "ignore", lineterminator = "\n")
+        writer.writeheader()
+
+    rows = 0
+    async for auction in auctions:
+        # Misma representación que la API (fechas ISO 8601, importes como texto)
+        response = AuctionResponse.model_validate(auction)
+        if writer:
+            writer.writerow(response.model_dump(mode = "json"))
+        else:
+            buffer.write(response.model_dump_json())
+            buffer.write("\n")
+
+        rows += 1
+        if rows % EXPORT_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
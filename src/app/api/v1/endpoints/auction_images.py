@@ -0,0 +1,118 @@
+from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.images import get_auction_image_read_service, get_auction_image_service
+from app.api.v1 import uploads
+from app.api.v1.schemas.auction import AuctionImageResponse
+from app.application.services.auction_image_service import AuctionImageService
+from app.core.config import settings
+from app.domain.exceptions import ImageTooLargeError, UnsupportedImageError
+from app.domain.models.auction_image import AuctionImage
+from app.domain.models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from typing import Annotated, Literal
+from uuid import UUID
+
+
+router = APIRouter(prefix = "/auctions")
+
+# Alias para dependencias
+ImageServiceDep = Annotated[AuctionImageService, Depends(get_auction_image_service)]
+ImageReadServiceDep = Annotated[AuctionImageService, Depends(get_auction_image_read_service)] # Rutas GET (réplica)
+CurrentUserDep = Annotated[User, Depends(get_current_user)]
+
+# Margen para las cabeceras y el resto de campos de un multipart
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+def to_response(image: AuctionImage) -> AuctionImageResponse:
+    base_url = f"{settings.API_V1_STR}/auctions/{image.auction_id}/images/{image.id}"
+    return AuctionImageResponse(
+        id = image.id,
+        auction_id = image.auction_id,
+        content_type = image.content_type,
+        size_bytes = image.size_bytes,
+        sha256 = image.sha256,
+        width = image.width,
+        height = image.height,
+        created_at = image.created_at,
+        url = f"{base_url}/original",
+        thumbnail_url = f"{base_url}/thumbnail" if image.thumbnail_key else None
+    )
+
+
+@router.post("/{auction_id}/images", response_model = AuctionImageResponse, status_code = 201)
+async def upload_auction_image(
+    auction_id: UUID,
+    request: Request,
+    response: Response,
+    current_user: CurrentUserDep,
+    service: ImageServiceDep
+):
+    """
+    Sube una imagen (JPEG, PNG, GIF o WebP) a una subasta propia. El cuerpo puede ser el fichero
+    tal cual (p. ej. 'Content-Type: image/jpeg') o un 'multipart/form-data' con un campo de fichero.
+    Se procesa en streaming. Si la subasta ya tenía esa misma imagen, se devuelve con un 200.
+    """
+    # Rechazo temprano si el cliente declara el tamaño (si no, se corta al superar el máximo)
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > settings.IMAGE_MAX_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code = status.HTTP_413_CONTENT_TOO_LARGE, detail = "La imagen supera el tamaño máximo.")
+
+    try:
+        image, created = await service.upload_image(
+            auction_id,
+            current_user.id,
+            uploads.upload_chunks(request),
+            max_bytes = settings.IMAGE_MAX_BYTES,
+            max_images = settings.IMAGE_MAX_PER_AUCTION
+        )
+    except PermissionError as e:
+        service.logger.error("Error: {}", e)
+        raise HTTPException(status_code = status.HTTP_403_FORBIDDEN, detail = str(e))
+    except ImageTooLargeError as e:
+        service.logger.error("Error: {}", e)
+        raise HTTPException(status_code = status.HTTP_413_CONTENT_TOO_LARGE, detail = str(e))
+    except UnsupportedImageError as e:
+        service.logger.error("Error: {}", e)
+        raise HTTPException(status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail = str(e))
+    except ValueError as e:
+        service.logger.error("Error: {}", e)
+        raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST, detail = str(e))
+
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return to_response(image)
+
+
+@router.get("/{auction_id}/images", response_model = list[AuctionImageResponse])
+async def list_auction_images(
+    auction_id: UUID,
+    service: ImageReadServiceDep
+):
+    return [to_response(image) for image in await service.list_images(auction_id)]
+
+
+@router.get("/{auction_id}/images/{image_id}/{variant}")
+async def get_auction_image_file(
+    auction_id: UUID,
+    image_id: UUID,
+    variant: Literal["original", "thumbnail"],
+    request: Request,
+    service: ImageReadServiceDep
+):
+    """
+    Sirve la imagen o su miniatura desde el almacén, con soporte de 'Range' (206) e 'If-Range'.
+    El contenido de una clave no cambia nunca: ETag por hash y caché 'immutable'.
+    """
+    found = await service.get_image_file(auction_id, image_id, variant)
+    if not found:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "Imagen no encontrada.")
+    image, path, content_type = found
+
+    etag = f'"{image.sha256}"' if variant == "original" else f'"{image.sha256}-{settings.IMAGE_THUMBNAIL_SIZE}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.IMAGE_CACHE_MAX_AGE_SECONDS}, immutable"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code = status.HTTP_304_NOT_MODIFIED, headers = headers)
+
+    # FileResponse lee el fichero por bloques en un hilo (o usa 'pathsend' si el servidor lo admite)
+    return FileResponse(path, media_type = content_type, headers = headers)
@@ -1,12 +1,19 @@
-from app.api.dependencies.auctions import get_auction_service
+from app.api.dependencies.auctions import get_auction_read_service, get_auction_service
 from app.api.dependencies.auth import get_current_user
-from app.api.v1.schemas.auction import AuctionCreate, AuctionResponse
+from app.api.dependencies.trending import get_trending_service
+from app.api.v1 import bulk
+from app.api.v1.schemas.auction import (
+    AuctionCreate, AuctionImportResponse, AuctionImportRowError, AuctionResponse, TrendingAuction, TrendingResponse
+)
 from app.application.services.auction_service import AuctionService
+from app.application.services.trending_service import TrendingService
+from app.core.config import settings
 from app.domain.exceptions import AuctionCreationError
 from app.domain.models.auction import Auction
 from app.domain.models.user import User
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Literal, Optional
 from uuid import UUID
 
 
@@ -14,7 +21,9 @@ router = APIRouter(prefix = "/auctions")
 
 # Alias para dependencias
 ServiceDep = Annotated[AuctionService, Depends(get_auction_service)]
+ReadServiceDep = Annotated[AuctionService, Depends(get_auction_read_service)] # Rutas GET (réplica)
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
+TrendingServiceDep = Annotated[TrendingService, Depends(get_trending_service)]
 
 @router.post("/", response_model = Auction, status_code = 201) # El 201 es el estándar para 'Created'
 async def create_auction(
@@ -25,26 +34,89 @@ async def create_auction(
     try:
         return await service.create_auction(auction_in, seller_id = current_user.id)
     except AuctionCreationError as e:
-        service.logger.error(f"Error: {e}")
+        service.logger.error("Error: {}", e)
         raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST, detail = str(e))
 
 
 @router.get("/", response_model = list[AuctionResponse], status_code = 200)
 async def list_auctions(
-    service: ServiceDep
+    service: ReadServiceDep
 ):
     return await service.list_auctions()
 
 
+@router.post("/import", response_model = AuctionImportResponse)
+async def import_auctions(
+    request: Request,
+    current_user: CurrentUserDep,
+    service: ServiceDep,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description = "Por defecto, según el Content-Type")
+):
+    """
+    Importación masiva de subastas del usuario. El cuerpo es el fichero tal cual (no multipart):
+    CSV con cabecera ('text/csv') o un objeto JSON por línea ('application/x-ndjson').
+    Se procesa en streaming; la respuesta indica las filas rechazadas y el motivo.
+    """
+    format = format or bulk.detect_format(request.headers.get("content-type"))
+    if not format:
+        raise HTTPException(
+            status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail = "Formato no soportado: usa 'text/csv' o 'application/x-ndjson'."
+        )
+
+    report = await service.import_auctions(
+        bulk.parse_rows(request.stream(), format),
+        seller_id = current_user.id,
+        chunk_size = settings.AUCTION_IMPORT_CHUNK_SIZE,
+        max_errors = settings.AUCTION_IMPORT_MAX_ERRORS
+    )
+    return AuctionImportResponse(
+        imported = report.imported,
+        failed = report.failed,
+        errors = [AuctionImportRowError(row = row, error = error) for row, error in report.errors],
+        errors_truncated = report.errors_truncated
+    )
+
+
+# Debe declararse antes de '/{auction_id}' para que "export" no se interprete como un ID
+@router.get("/export")
+async def export_auctions(
+    service: ReadServiceDep,
+    format: Literal["csv", "ndjson"] = "ndjson",
+    seller_id: Optional[UUID] = None
+):
+    """Exportación de las subastas (o las de un vendedor) en streaming, con un cursor del servidor."""
+    auctions = service.export_auctions(seller_id, settings.AUCTION_EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        bulk.encode_auctions(auctions, format),
+        media_type = bulk.FORMATS[format],
+        headers = {"Content-Disposition": f'attachment; filename="auctions.{format}"'}
+    )
+
+
+# Debe declararse antes de '/{auction_id}' para que "trending" no se interprete como un ID
+@router.get("/trending", response_model = TrendingResponse)
+async def trending_auctions(
+    service: TrendingServiceDep,
+    limit: int = Query(10, ge = 1, le = settings.TRENDING_MAX_K)
+):
+    most_bids = await service.get_most_bids(limit)
+    return TrendingResponse(
+        window_minutes = settings.TRENDING_WINDOW_MINUTES,
+        most_bids = [TrendingAuction(auction = AuctionResponse.model_validate(a), recent_bids = n) for a, n in most_bids],
+        ending_soon = await service.get_ending_soon(limit)
+    )
+
+
 @router.get("/{auction_id}", response_model = AuctionResponse)
 async def get_auction(
     auction_id: UUID, 
-    service: ServiceDep
+    service: ReadServiceDep
 ):
     try:
         return await service.get_auction(auction_id)
     except ValueError as e:
-        service.logger.error(f"Error: {e}")
+        service.logger.error("Error: {}", e)
         raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "Subasta no encontrada.")
     
 
@@ -59,10 +131,10 @@ async def update_auction_details(
     try:
         return await service.update_details(auction_id, current_user.id, title, description)
     except PermissionError as e:
-        service.logger.error(f"Error: {e}")
+        service.logger.error("Error: {}", e)
         raise HTTPException(status_code = status.HTTP_403_FORBIDDEN, detail = f"No eres el dueño de esta subasta: {e}")
     except ValueError as e:
-        service.logger.error(f"Error: {e}")
+        service.logger.error("Error: {}", e)
         raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST, detail = str(e))
 
 
@@ -75,8 +147,8 @@ async def cancel_auction(
     try:
         return await service.cancel_auction(auction_id, current_user.id)
     except PermissionError as e:
-        service.logger.error(f"Error: {e}")
+        service.logger.error("Error: {}", e)
         raise HTTPException(status_code = status.HTTP_403_FORBIDDEN, detail = "No tienes permiso")
     except ValueError as e:
-        service.logger.error(f"Error: {e}")
-        raise HTTPException(status_code = status.HTTP_400, detail = str(e))
+        service.logger.error("Error: {}", e)
+        raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST, detail = str(e))
@@ -1,7 +1,8 @@
+from app.api.dependencies.auth import get_auth_service
 from app.api.dependencies.users import get_user_service
-from app.api.v1.schemas.token import Token
+from app.api.v1.schemas.token import RefreshTokenRequest, Token
+from app.application.services.auth_service import AuthService
 from app.application.services.user_service import UserService
-from app.core.security import create_access_token, verify_password
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import Annotated
@@ -12,19 +13,43 @@ router = APIRouter(prefix = "/auth")
 @router.post("/login", response_model = Token)
 async def login(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-        user_repo: Annotated[UserService, Depends(get_user_service)]
+        user_repo: Annotated[UserService, Depends(get_user_service)],
+        auth_service: Annotated[AuthService, Depends(get_auth_service)]
 ):
     user = await user_repo.authenticate(
         identifier = form_data.username,
         password = form_data.password
     )
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    # 'authenticate' ya ha verificado la contraseña: otro Argon2 aquí duplicaría el coste del login
+    if not user:
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail = "Usuario o contraseña incorrectos",
             headers = {"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(subject = user.id)
-    return {"access_token": access_token, "token_type": "bearer"}
+    access_token, refresh_token = await auth_service.start_session(user)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/refresh", response_model = Token)
+async def refresh(
+        body: RefreshTokenRequest,
+        auth_service: Annotated[AuthService, Depends(get_auth_service)]
+):
+    """
+    Access token nuevo a partir del refresh token, sin contraseña (ni Argon2).
+    El refresh token se rota: el de la respuesta sustituye al enviado, que deja de valer.
+    """
+    access_token, refresh_token = await auth_service.refresh(body.refresh_token)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/logout", status_code = status.HTTP_204_NO_CONTENT)
+async def logout(
+        body: RefreshTokenRequest,
+        auth_service: Annotated[AuthService, Depends(get_auth_service)]
+):
+    """Cierra la sesión: su refresh token y sus access tokens dejan de valer."""
+    await auth_service.logout(body.refresh_token)
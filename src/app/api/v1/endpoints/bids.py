@@ -1,6 +1,6 @@
-from app.api.dependencies.bids import get_bid_service
+from app.api.dependencies.bids import get_bid_read_service, get_bid_service
 from app.api.dependencies.auth import get_current_user
-from app.api.v1.schemas.bid import BidCreate, BidResponse
+from app.api.v1.schemas.bid import BidBatchCreate, BidBatchItemResult, BidBatchResponse, BidCreate, BidResponse
 from app.application.services.bid_service import BidService
 from app.domain.models.user import User
 from fastapi import APIRouter, Depends, HTTPException, status, Query
@@ -10,7 +10,8 @@ from uuid import UUID
 router = APIRouter(prefix = "/bids")
 
 ServiceDep = Annotated[BidService, Depends(get_bid_service)]
-CurrentUserDep = Annotated[User, get_current_user]
+ReadServiceDep = Annotated[BidService, Depends(get_bid_read_service)] # Rutas GET (réplica)
+CurrentUserDep = Annotated[User, Depends(get_current_user)]
 
 @router.post("/", response_model = BidResponse, status_code = 201)
 async def place_bid(
@@ -28,10 +29,29 @@ async def place_bid(
         raise HTTPException(status_code = status.HTTP_400_BAD_REQUEST, detail = str(e))
 
 
+@router.post("/batch", response_model = BidBatchResponse)
+async def place_bids(
+    batch_in: BidBatchCreate,
+    current_user: CurrentUserDep,
+    service: ServiceDep
+):
+    """
+    Varias pujas (en una o varias subastas) en una sola petición y una sola transacción.
+    Cada puja se acepta o rechaza por separado: la respuesta trae un resultado por puja, en el mismo orden.
+    """
+    results = await service.place_bids(batch_in.bids, bidder_id = current_user.id)
+    created = sum(1 for r in results if r.bid)
+    return BidBatchResponse(
+        created = created,
+        rejected = len(results) - created,
+        results = [BidBatchItemResult.model_validate(r) for r in results]
+    )
+
+
 @router.get("/auction/{auction_id}", response_model = list[BidResponse])
 async def list_auction_bids(
     auction_id: UUID,
-    service: ServiceDep
+    service: ReadServiceDep
 ):
     return await service.get_auction_bids(auction_id)
 
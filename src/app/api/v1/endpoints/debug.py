@@ -0,0 +1,67 @@
+import asyncio
+
+from app.api.dependencies.auth import get_current_superuser
+from app.core.config import settings
+from app.infrastructure.observability.profiler import ProfilerBusyError, SamplingProfiler
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from typing import Literal
+
+
+# Diagnóstico del proceso que atiende la petición (con varios workers, cada uno tiene el suyo)
+router = APIRouter(prefix = "/debug", dependencies = [Depends(get_current_superuser)])
+
+@router.get("/event-loop")
+async def event_loop_stats(request: Request):
+    """Lag del bucle de eventos (p50/p99/máx. de la última ventana) y los últimos bloqueos con su pila."""
+    loop_monitor = getattr(request.app.state, "loop_monitor", None)
+    if not loop_monitor:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "El monitor del bucle de eventos está desactivado")
+    return loop_monitor.snapshot()
+
+
+@router.get("/profile", response_class = PlainTextResponse)
+async def cpu_profile(
+    request: Request,
+    seconds: float = Query(10.0, gt = 0, le = settings.DEBUG_PROFILE_MAX_SECONDS),
+    include_idle: bool = Query(False, description = "Incluir los hilos que solo esperan (bucle sin trabajo, pools ociosos)")
+):
+    """
+    Perfil de CPU por muestreo de todos los hilos del worker durante 'seconds'.
+    Devuelve pilas "collapsed" (una por línea con su nº de muestras), listas para
+    'flamegraph.pl' o speedscope. El muestreo va en un hilo: el worker sigue atendiendo peticiones.
+    """
+    profiler = getattr(request.app.state, "sampling_profiler", None)
+    if not profiler:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "El perfilado bajo demanda está desactivado")
+    try:
+        result = await asyncio.to_thread(profiler.profile, seconds, include_idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code = status.HTTP_409_CONFLICT, detail = str(e))
+
+    return PlainTextResponse(
+        SamplingProfiler.collapsed(result["stacks"]),
+        headers = {
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Interval-Ms": str(result["interval_ms"]),
+            "X-Profile-Idle-Skipped": str(result["idle_samples_skipped"]),
+            "X-Profile-Sampler-CPU-Pct": str(result["sampler_cpu_pct"]),
+        }
+    )
+
+
+@router.get("/memory")
+async def memory_profile(
+    request: Request,
+    seconds: float = Query(10.0, gt = 0, le = settings.DEBUG_PROFILE_MAX_SECONDS, description = "Ventana de medida si tracemalloc no está activo desde el arranque"),
+    limit: int = Query(25, ge = 1, le = 200),
+    group_by: Literal["lineno", "filename", "traceback"] = Query("lineno")
+):
+    """Mayores puntos de asignación de memoria del worker (tracemalloc)."""
+    profiler = getattr(request.app.state, "memory_profiler", None)
+    if not profiler:
+        raise HTTPException(status_code = status.HTTP_404_NOT_FOUND, detail = "El perfilado bajo demanda está desactivado")
+    try:
+        return await profiler.top_allocations(seconds, limit, group_by)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code = status.HTTP_409_CONFLICT, detail = str(e))
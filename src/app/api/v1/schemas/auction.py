@@ -44,9 +44,48 @@ class AuctionResponse(AuctionBase):
     current_price: Decimal
     seller_id: UUID
     winner_id: Optional[UUID] = None
+    bid_count: int = 0
+    bidder_count: int = 0
+    last_bid_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime] = None
 
     # Configuración para leer desde ORM
     model_config = ConfigDict(from_attributes = True)
+
+
+class TrendingAuction(BaseModel):
+    auction: AuctionResponse
+    recent_bids: int # Pujas dentro de la ventana
+
+
+class TrendingResponse(BaseModel):
+    window_minutes: int
+    most_bids: list[TrendingAuction]
+    ending_soon: list[AuctionResponse]
+
+
+class AuctionImportRowError(BaseModel):
+    row: int # Nº de fila de datos (sin contar la cabecera del CSV), empezando en 1
+    error: str
+
+
+class AuctionImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: list[AuctionImportRowError]
+    errors_truncated: bool # Hay más filas rechazadas que errores listados
+
+
+class AuctionImageResponse(BaseModel):
+    id: UUID
+    auction_id: UUID
+    content_type: str
+    size_bytes: int
+    sha256: str
+    width: Optional[int] = None # Sin miniatura no se conocen las dimensiones
+    height: Optional[int] = None
+    created_at: datetime
+    url: str
+    thumbnail_url: Optional[str] = None
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, ConfigDict
+from app.core.config import settings
+from pydantic import BaseModel, ConfigDict, Field
 from decimal import Decimal
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
 
@@ -22,3 +23,24 @@ class BidResponse(BidBase):
 
     # Configuración para leer desde ORM
     model_config = ConfigDict(from_attributes = True)
+
+
+class BidBatchCreate(BaseModel):
+    bids: list[BidCreate] = Field(..., min_length = 1, max_length = settings.BID_BATCH_MAX_ITEMS)
+
+
+class BidBatchItemResult(BaseModel):
+    index: int # Posición de la puja en la petición
+    auction_id: UUID
+    amount: Decimal
+    status: Literal["created", "rejected"]
+    bid: Optional[BidResponse] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes = True)
+
+
+class BidBatchResponse(BaseModel):
+    created: int
+    rejected: int
+    results: list[BidBatchItemResult]
@@ -3,6 +3,12 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str
+
+
+class RefreshTokenRequest(BaseModel):
+    """Cuerpo de 'POST /auth/refresh' y 'POST /auth/logout'."""
+    refresh_token: str
 
 
 class TokenPayload(BaseModel):
@@ -11,3 +17,4 @@ class TokenPayload(BaseModel):
     cuando lo decodificamos en 'get_current_user'.
     """
     sub: str | None = None
+    sid: str | None = None # Sesión (refresh token) de la que sale el access token
@@ -0,0 +1,87 @@
+"""
+Lectura en streaming del fichero de una subida: cuerpo binario tal cual ('image/jpeg', ...) o
+'multipart/form-data' con un campo de fichero. A diferencia de 'UploadFile', el multipart se
+analiza según llega y los datos del fichero se entregan trozo a trozo, sin copiarlos a un
+temporal ni acumularlos en memoria.
+"""
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+from typing import AsyncIterable, AsyncIterator
+
+
+class _FilePart:
+    """Estado del parser: solo se recogen los datos del primer campo con 'filename'."""
+    def __init__(self):
+        self.header_field = b""
+        self.header_value = b""
+        self.disposition = b""
+        self.in_file = False
+        self.found = False
+        self.done = False
+        self.pending: list[bytes] = []
+
+    def on_part_begin(self) -> None:
+        self.disposition = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self.header_field.lower() == b"content-disposition":
+            self.disposition = self.header_value
+        self.header_field, self.header_value = b"", b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.disposition)
+        self.in_file = b"filename" in options and not self.found
+        self.found = self.found or self.in_file
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        # El resto de campos se descartan (no se acumulan)
+        if self.in_file:
+            self.pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self.in_file:
+            self.in_file = False
+            self.done = True
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+
+async def multipart_file_chunks(chunks: AsyncIterable[bytes], boundary: bytes) -> AsyncIterator[bytes]:
+    """Datos del primer fichero de un cuerpo multipart, según llegan. ValueError si no hay fichero."""
+    part = _FilePart()
+    parser = MultipartParser(boundary, part.callbacks())
+
+    async for chunk in chunks:
+        parser.write(chunk)
+        pending, part.pending = part.pending, []
+        for data in pending:
+            yield data
+        if part.done:
+            return # El resto del cuerpo no interesa
+
+    raise ValueError("El formulario no contiene ningún fichero completo.")
+
+
+def upload_chunks(request: Request) -> AsyncIterator[bytes]:
+    """Contenido del fichero subido, en streaming, sea cual sea la forma de la petición."""
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type == b"multipart/form-data":
+        if b"boundary" not in options:
+            raise ValueError("Falta el 'boundary' del multipart.")
+        return multipart_file_chunks(request.stream(), options[b"boundary"])
+    return request.stream()
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from app.domain.models.auction_image import AuctionImage
+from uuid import UUID
+
+
+class AuctionImageRepository(ABC):
+    """
+    Puerto de salida: Interfaz abstracta para los metadatos de las imágenes de subastas.
+    El contenido no pasa por aquí: está en el 'ObjectStore'.
+    Las escrituras no se confirman aquí: lo hace el servicio con su 'UnitOfWork'.
+    """
+
+
+    @abstractmethod
+    async def create(self, image: AuctionImage) -> AuctionImage:
+        """Registra una imagen. Lanza AuctionError si la subasta ya tiene una imagen con el mismo contenido."""
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def get_by_id(self, image_id: UUID) -> AuctionImage | None:
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def get_by_auction_id(self, auction_id: UUID) -> list[AuctionImage]:
+        """Imágenes de una subasta, en orden de subida."""
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def count_by_auction_id(self, auction_id: UUID) -> int:
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def find_by_sha256(self, sha256: str, auction_id: UUID | None = None) -> AuctionImage | None:
+        """Una imagen con ese contenido: de la subasta indicada o, sin ella, de cualquiera."""
+        raise NotImplementedError
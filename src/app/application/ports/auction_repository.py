@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from app.domain.models.auction import Auction
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 
@@ -7,6 +8,7 @@ class AuctionRepository(ABC):
     """
     Puerto de salida: Interfaz abstracta para la persistencia de subastas.
     No sabe nada de SQLAlchemy, solo conoce modelos de dominio.
+    Las escrituras no se confirman aquí: lo hace el servicio con su 'UnitOfWork'.
     """
 
 
@@ -15,6 +17,21 @@ class AuctionRepository(ABC):
         """Persiste una nueva subasta en el sistema."""
         raise NotImplementedError
     
+    @abstractmethod
+    async def create_many(self, auctions: list[Auction]) -> list[Auction]:
+        """Persiste varias subastas nuevas de una vez (un único INSERT con executemany)."""
+        raise NotImplementedError
+
+
+    @abstractmethod
+    def stream(self, seller_id: Optional[UUID] = None, batch_size: int = 500) -> AsyncIterator[Auction]:
+        """
+        Recorre las subastas (sin sus pujas) con un cursor en el servidor, de 'batch_size' en 'batch_size':
+        la memoria no depende del nº de subastas. Opcionalmente, solo las de un vendedor.
+        """
+        raise NotImplementedError
+
+
     @abstractmethod
     async def get_all(self) -> list[Auction]:
         """Obtiene todas las subastas."""
@@ -24,6 +41,38 @@ class AuctionRepository(ABC):
     async def get_by_id(self, auction_id: UUID) -> Auction | None:
         """Recupera una subasta por su ID único."""
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id_for_update(self, auction_id: UUID) -> Auction | None:
+        """Recupera una subasta con sus pujas y la bloquea hasta el fin de la transacción."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_ids(self, auction_ids: list[UUID]) -> list[Auction]:
+        """Recupera varias subastas por ID (sin sus pujas), en cualquier orden."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many_for_update(self, auction_ids: list[UUID]) -> list[Auction]:
+        """
+        Recupera varias subastas con sus pujas y las bloquea hasta el fin de la transacción.
+        Se bloquean en orden de ID: dos lotes con subastas en común no se interbloquean.
+        """
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def get_ending_soon(self, limit: int) -> list[Auction]:
+        """Subastas activas que terminan antes, la más próxima primero (sin sus pujas)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_expired(self, limit: int) -> list[Auction]:
+        """
+        Subastas todavía activas cuya fecha de fin ya ha pasado (sin sus pujas), para cerrarlas.
+        Quedan bloqueadas hasta el fin de la transacción; las que ya tiene bloqueadas otra se omiten.
+        """
+        raise NotImplementedError
     
     
     @abstractmethod
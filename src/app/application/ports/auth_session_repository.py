@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from app.domain.models.auth_session import AuthSession
+from datetime import datetime
+from uuid import UUID
+
+
+class AuthSessionRepository(ABC):
+    """
+    Puerto de salida: Interfaz abstracta para las sesiones de autenticación (refresh tokens).
+    Todas las operaciones van por la clave primaria, salvo la revocación de todas las sesiones
+    de un usuario (índice de 'user_id') y la limpieza de sesiones caducadas.
+    Las escrituras no se confirman aquí: lo hace el servicio con su 'UnitOfWork'.
+    """
+
+
+    @abstractmethod
+    async def create(self, auth_session: AuthSession) -> AuthSession:
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def get_by_id(self, session_id: UUID) -> AuthSession | None:
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def rotate(self, session_id: UUID, current_hash: str, new_hash: str) -> bool:
+        """
+        Sustituye el token vigente por uno nuevo (el vigente pasa a ser el anterior), solo si
+        'current_hash' sigue siendo el vigente y la sesión no está revocada. Es una escritura
+        condicional: de dos renovaciones simultáneas con el mismo token, solo una devuelve True.
+        """
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def revoke(self, session_id: UUID) -> None:
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def revoke_all_for_user(self, user_id: UUID) -> list[UUID]:
+        """Revoca todas las sesiones aún no revocadas del usuario. Devuelve sus IDs."""
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        """Borra hasta 'limit' sesiones caducadas antes de 'before'. Devuelve cuántas ha borrado."""
+        raise NotImplementedError
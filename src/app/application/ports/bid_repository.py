@@ -7,6 +7,7 @@ class BidRepository(ABC):
     """
     Puerto de salida: Interfaz abstracta para la persistencia de subastas.
     No sabe nada de SQLAlchemy, solo conoce modelos de dominio.
+    Las escrituras no se confirman aquí: lo hace el servicio con su 'UnitOfWork'.
     """
 
 
@@ -14,6 +15,12 @@ class BidRepository(ABC):
     async def create(self, bid: Bid) -> Bid:
         """Persiste una nueva puja en el sistema."""
         raise NotImplementedError
+
+
+    @abstractmethod
+    async def create_many(self, bids: list[Bid]) -> list[Bid]:
+        """Persiste varias pujas de una vez (un solo envío a la BD)."""
+        raise NotImplementedError
     
 
     @abstractmethod
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from app.domain.events import DomainEvent
+
+
+class EventPublisher(ABC):
+    """
+    Puerto de salida: Interfaz abstracta para publicar eventos de dominio.
+    Los servicios publican después de persistir; no saben quién escucha.
+    """
+
+
+    @abstractmethod
+    async def publish(self, event: DomainEvent) -> None:
+        """Entrega el evento a todos sus suscriptores."""
+        raise NotImplementedError
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class EventSink(ABC):
+    """
+    Puerto de salida: Destino de los eventos que publica el relay del outbox
+    (fichero, cola de mensajes, webhook...).
+    """
+
+
+    @abstractmethod
+    async def publish(self, messages: list[dict[str, Any]]) -> None:
+        """
+        Publica un lote de mensajes en orden. Si lanza una excepción, el lote entero se reintenta:
+        el destino debe tolerar duplicados (entrega al menos una vez, deduplicable por 'id').
+        """
+        raise NotImplementedError
+
+
+    async def close(self) -> None:
+        """Libera los recursos del destino (opcional)."""
+        return None
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+
+@dataclass
+class OutbidNotification:
+    """Aviso a un usuario de que ha dejado de ir ganando una subasta (agrupa los 'outbids' de una ventana)."""
+    user_id: UUID
+    auction_id: UUID
+    current_price: Decimal # Precio tras la última puja que le superó
+    times_outbid: int
+    first_outbid_at: datetime
+    last_outbid_at: datetime
+
+
+class NotificationChannel(ABC):
+    """
+    Puerto de salida: Canal de entrega de notificaciones (email, push, webhook...).
+    """
+
+
+    @abstractmethod
+    async def send(self, notification: OutbidNotification) -> None:
+        """Entrega una notificación. Una excepción cuenta como entrega fallida."""
+        raise NotImplementedError
+
+
+    async def close(self) -> None:
+        """Libera los recursos del canal (opcional)."""
+        return None
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable
+
+
+@dataclass
+class StoredObject:
+    key: str
+    sha256: str
+    size: int
+    created: bool # False si el contenido ya estaba guardado (deduplicado)
+
+
+class ObjectStore(ABC):
+    """
+    Puerto de salida: Almacén de objetos binarios (imágenes), al estilo de S3.
+    Las claves se derivan del SHA-256 del contenido: un objeto nunca cambia una vez escrito
+    y subir dos veces lo mismo no ocupa el doble.
+    """
+
+
+    @abstractmethod
+    async def put_stream(self, prefix: str, chunks: AsyncIterable[bytes]) -> StoredObject:
+        """
+        Guarda el flujo bajo '<prefix>/' sin tenerlo entero en memoria, calculando su SHA-256 por el camino.
+        Si el flujo lanza una excepción, no queda nada guardado y la excepción se propaga.
+        """
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Borra el objeto. No hace nada si no existe."""
+        raise NotImplementedError
+
+
+    @abstractmethod
+    def local_path(self, key: str) -> Path | None:
+        """
+        Ruta en disco del objeto, para servirlo directamente (con soporte de Range).
+        None si el almacén es remoto (se serviría con una URL firmada).
+        """
+        raise NotImplementedError
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from app.domain.events import DomainEvent
+
+
+class OutboxRepository(ABC):
+    """
+    Puerto de salida: Interfaz abstracta para la bandeja de salida de eventos (transactional outbox).
+    El evento se guarda junto con el cambio de estado que lo provoca; un proceso aparte
+    (relay) lo publica después para los consumidores externos.
+    """
+
+
+    @abstractmethod
+    async def add(self, event: DomainEvent) -> None:
+        """
+        Registra el evento en la transacción en curso, sin confirmarla:
+        se guarda con la siguiente escritura del repositorio que comparta la sesión.
+        """
+        raise NotImplementedError
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass
+class Thumbnail:
+    key: str
+    width: int # Dimensiones de la imagen original
+    height: int
+
+
+class Thumbnailer(ABC):
+    """
+    Puerto de salida: Generación de miniaturas a partir de una imagen del almacén de objetos.
+    Decodificar y redimensionar es CPU pura: la implementación no debe hacerlo en el event loop.
+    """
+
+
+    @abstractmethod
+    async def create(self, source_key: str) -> Thumbnail | None:
+        """
+        Genera la miniatura de la imagen (con la misma clave para el mismo contenido).
+        Devuelve None si las miniaturas están desactivadas; lanza ValueError si la imagen no se puede decodificar.
+        """
+        raise NotImplementedError
+
+
+    async def close(self) -> None:
+        """Libera los recursos (procesos, conexiones). Opcional."""
+        return None
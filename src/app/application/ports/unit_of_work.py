@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+
+
+class UnitOfWork(ABC):
+    """
+    Puerto de salida: Interfaz abstracta para la transacción de un caso de uso.
+    Los repositorios solo preparan los cambios; el servicio los confirma todos juntos, una vez:
+
+        async with self.uow:
+            ...                      # Lecturas y escrituras a través de los repositorios
+            await self.uow.commit()  # Un único commit (y un único fsync en MariaDB)
+
+    Si el bloque termina con una excepción, se deshace todo lo no confirmado.
+    """
+
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            await self.rollback()
+
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Confirma todos los cambios pendientes de los repositorios."""
+        raise NotImplementedError
+
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Descarta todos los cambios pendientes."""
+        raise NotImplementedError
@@ -7,6 +7,7 @@ class UserRepository(ABC):
     """
     Puerto de salida: Interfaz abstracta para la persistencia de usuarios.
     No sabe nada de SQLAlchemy, solo conoce modelos de dominio.
+    Las escrituras no se confirman aquí: lo hace el servicio con su 'UnitOfWork'.
     """
     @abstractmethod
     async def create(self, user: User) -> User:
@@ -0,0 +1,181 @@
+from app.application.ports.auction_image_repository import AuctionImageRepository
+from app.application.ports.auction_repository import AuctionRepository
+from app.application.ports.object_store import ObjectStore
+from app.application.ports.thumbnailer import Thumbnailer
+from app.application.ports.unit_of_work import UnitOfWork
+from app.domain.exceptions import AuctionError, AuctionNotFoundError, ImageTooLargeError, UnsupportedImageError
+from app.domain.models.auction_image import AuctionImage
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Literal
+from uuid import UUID
+
+
+IMAGE_PREFIX = "images"
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+
+# Firmas (magic bytes) de los formatos admitidos: el Content-Type del cliente no es fiable
+_SIGNATURE_BYTES = 12
+
+
+def detect_image_type(header: bytes) -> str | None:
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class AuctionImageService:
+    def __init__(
+        self,
+        image_repo: AuctionImageRepository,
+        auction_repo: AuctionRepository,
+        store: ObjectStore,
+        thumbnailer: Thumbnailer,
+        logger,
+        uow: UnitOfWork
+    ):
+        self.image_repo = image_repo
+        self.auction_repo = auction_repo
+        self.store = store
+        self.thumbnailer = thumbnailer
+        self.logger = logger
+        self.uow = uow
+
+
+    async def upload_image(
+            self,
+            auction_id: UUID,
+            user_id: UUID,
+            chunks: AsyncIterable[bytes],
+            max_bytes: int,
+            max_images: int
+    ) -> tuple[AuctionImage, bool]:
+        """
+        Sube una imagen a una subasta del vendedor. Devuelve la imagen y si es nueva.
+        1. El contenido va en streaming al almacén de objetos: se comprueban la firma del formato y el
+           tamaño según llega, sin tenerlo entero en memoria.
+        2. Si la subasta ya tiene esa misma imagen (mismo SHA-256), se devuelve la existente.
+        3. La miniatura se genera fuera del event loop, o se reutiliza si otra subasta ya tiene esa imagen.
+        4. Los metadatos se registran con un único commit, con la subasta bloqueada: el límite de
+           imágenes se vuelve a comprobar ahí (dos subidas simultáneas no pueden superarlo).
+        """
+        auction = await self.auction_repo.get_by_id(auction_id)
+        if not auction:
+            raise AuctionNotFoundError(f"La subasta con ID {auction_id} no existe.")
+        if auction.seller_id != user_id:
+            raise PermissionError("Solo el vendedor puede subir imágenes a esta subasta.")
+        # Comprobación rápida, antes de subir nada (la definitiva se hace al registrar)
+        if await self.image_repo.count_by_auction_id(auction_id) >= max_images:
+            raise ValueError(f"La subasta ya tiene el máximo de {max_images} imágenes.")
+
+        # 1. Subida en streaming (si el flujo falla, el almacén no guarda nada)
+        detected: dict[str, str] = {}
+        stored = await self.store.put_stream(IMAGE_PREFIX, self._checked(chunks, max_bytes, detected))
+
+        # 2. Deduplicado dentro de la subasta
+        existing = await self.image_repo.find_by_sha256(stored.sha256, auction_id)
+        if existing:
+            self.logger.info("Imagen {} ya presente en la subasta {}.", stored.sha256[:12], auction_id)
+            return existing, False
+
+        # 3. Miniatura
+        image = AuctionImage(
+            auction_id = auction_id,
+            sha256 = stored.sha256,
+            content_type = detected["content_type"],
+            size_bytes = stored.size,
+            original_key = stored.key
+        )
+        twin = await self.image_repo.find_by_sha256(stored.sha256)
+        if twin and twin.thumbnail_key:
+            image.thumbnail_key, image.width, image.height = twin.thumbnail_key, twin.width, twin.height
+        else:
+            try:
+                thumbnail = await self.thumbnailer.create(stored.key)
+            except ValueError as e:
+                # La firma era válida pero el contenido no se puede decodificar: no se guarda
+                if stored.created and not twin:
+                    await self.store.delete(stored.key)
+                raise UnsupportedImageError(str(e))
+            if thumbnail:
+                image.thumbnail_key, image.width, image.height = thumbnail.key, thumbnail.width, thumbnail.height
+
+        # 4. Metadatos
+        try:
+            async with self.uow:
+                await self.auction_repo.get_by_id_for_update(auction_id)
+                if await self.image_repo.count_by_auction_id(auction_id) >= max_images:
+                    if stored.created and not twin:
+                        await self.store.delete(stored.key)
+                    raise ValueError(f"La subasta ya tiene el máximo de {max_images} imágenes.")
+                await self.image_repo.create(image)
+                await self.uow.commit()
+        except AuctionError:
+            # Dos subidas simultáneas de la misma imagen: la otra ha ganado
+            existing = await self.image_repo.find_by_sha256(stored.sha256, auction_id)
+            if existing:
+                return existing, False
+            raise
+
+        self.logger.info("Imagen {} subida a la subasta {} ({} bytes).", image.id, auction_id, image.size_bytes)
+        return image, True
+
+
+    async def _checked(self, chunks: AsyncIterable[bytes], max_bytes: int, detected: dict[str, str]) -> AsyncIterator[bytes]:
+        """Deja pasar el flujo comprobando la firma del formato (al principio) y el tamaño máximo."""
+        header = b""
+        size = 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise ImageTooLargeError(f"La imagen supera el tamaño máximo de {max_bytes} bytes.")
+
+            if "content_type" not in detected:
+                header += chunk
+                if len(header) < _SIGNATURE_BYTES:
+                    continue
+                self._detect(header, detected)
+                chunk, header = header, b""
+            yield chunk
+
+        if "content_type" not in detected:
+            self._detect(header, detected)
+            yield header
+
+
+    @staticmethod
+    def _detect(header: bytes, detected: dict[str, str]) -> None:
+        content_type = detect_image_type(header)
+        if not content_type:
+            raise UnsupportedImageError("Formato de imagen no admitido: usa JPEG, PNG, GIF o WebP.")
+        detected["content_type"] = content_type
+
+
+    async def list_images(self, auction_id: UUID) -> list[AuctionImage]:
+        return await self.image_repo.get_by_auction_id(auction_id)
+
+
+    async def get_image_file(
+            self,
+            auction_id: UUID,
+            image_id: UUID,
+            variant: Literal["original", "thumbnail"]
+    ) -> tuple[AuctionImage, Path, str] | None:
+        """Imagen, ruta del fichero a servir y su Content-Type. None si no existe (o no tiene esa variante)."""
+        image = await self.image_repo.get_by_id(image_id)
+        if not image or image.auction_id != auction_id:
+            return None
+
+        if variant == "thumbnail":
+            key, content_type = image.thumbnail_key, THUMBNAIL_CONTENT_TYPE
+        else:
+            key, content_type = image.original_key, image.content_type
+        path = self.store.local_path(key) if key else None
+        if path is None:
+            return None
+        return image, path, content_type
@@ -1,23 +1,49 @@
 from app.application.ports.auction_repository import AuctionRepository
+from app.application.ports.outbox_repository import OutboxRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.api.v1.schemas.auction import AuctionCreate, AuctionResponse
 from app.domain.enums import AuctionState
+from app.domain.events import AuctionCancelled, AuctionClosed
 from app.domain.models.auction import Auction
-from app.domain.exceptions import AuctionNotFoundError
-from typing import Optional
+from app.domain.exceptions import AuctionCreationError, AuctionNotFoundError
+from dataclasses import dataclass, field
+from pydantic import ValidationError
+from typing import AsyncIterable, AsyncIterator, Optional
 from uuid import UUID
 
 
+@dataclass
+class AuctionImportReport:
+    """Resultado de una importación masiva. Solo se guardan los primeros 'max_errors' errores."""
+    max_errors: int
+    imported: int = 0
+    failed: int = 0
+    errors: list[tuple[int, str]] = field(default_factory = list) # (nº de fila, motivo)
+
+    def add_error(self, row: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row, error))
+
+    @property
+    def errors_truncated(self) -> bool:
+        return self.failed > len(self.errors)
+
+
 class AuctionService:
-    def __init__(self, auction_repo: AuctionRepository, logger):
+    def __init__(self, auction_repo: AuctionRepository, logger, uow: UnitOfWork, outbox: OutboxRepository | None = None):
         self.auction_repo = auction_repo
         self.logger = logger
+        self.read_logger = logger.bind(sampled = True) # Lecturas y listados: se muestrean en producción
+        self.uow = uow
+        self.outbox = outbox
 
 
     async def create_auction(self, auction_in: AuctionCreate, seller_id: UUID) -> AuctionResponse:
         """
         Crea una nueva subasta.
         """
-        self.logger.info(f"Creando subasta para el usuario {seller_id}.")
+        self.logger.info("Creando subasta para el usuario {}.", seller_id)
 
         # Transformamos el esquema de entrada en un modelo de Dominio puro
         # Aquí es donde el Dominio genera su propio UUID.
@@ -32,22 +58,106 @@ class AuctionService:
         )
 
         try:
-            return await self.auction_repo.create(new_auction)
+            async with self.uow:
+                await self.auction_repo.create(new_auction)
+                await self.uow.commit()
+            return new_auction
         
         except Exception as e:
-            self.logger.error(f"{e}", exc_info = True)
+            self.logger.error("{}", e, exc_info = True)
             raise e
 
 
+    async def import_auctions(
+            self,
+            rows: AsyncIterable[tuple[int, dict | str]],
+            seller_id: UUID,
+            chunk_size: int = 500,
+            max_errors: int = 1000
+    ) -> AuctionImportReport:
+        """
+        Importación masiva de subastas del vendedor, en streaming:
+        1. Cada fila (ya decodificada, o el error de decodificación) se valida con las reglas de 'AuctionCreate'.
+        2. Las válidas se acumulan en lotes de 'chunk_size' y cada lote se inserta en bloque y se confirma
+           (un commit por lote): un fallo solo afecta a las filas de su lote.
+        Nunca hay en memoria más de un lote.
+        """
+        report = AuctionImportReport(max_errors = max_errors)
+        chunk: list[tuple[int, Auction]] = []
+
+        async for row_number, auction in self._validate_rows(rows, seller_id, report):
+            chunk.append((row_number, auction))
+            if len(chunk) >= chunk_size:
+                await self._insert_chunk(chunk, report)
+                chunk = []
+        if chunk:
+            await self._insert_chunk(chunk, report)
+
+        self.logger.info(
+            "Importación del usuario {}: {} subastas creadas, {} filas rechazadas.", seller_id, report.imported, report.failed
+        )
+        return report
+
+
+    async def _validate_rows(
+            self,
+            rows: AsyncIterable[tuple[int, dict | str]],
+            seller_id: UUID,
+            report: AuctionImportReport
+    ) -> AsyncIterator[tuple[int, Auction]]:
+        """Generador: deja pasar las filas válidas como entidades de dominio y apunta el resto en el informe."""
+        async for row_number, data in rows:
+            if isinstance(data, str):
+                report.add_error(row_number, data)
+                continue
+            try:
+                auction_in = AuctionCreate.model_validate(data)
+            except ValidationError as e:
+                report.add_error(row_number, "; ".join(
+                    f"{'.'.join(str(loc) for loc in error['loc']) or 'fila'}: {error['msg']}" for error in e.errors()
+                ))
+                continue
+
+            yield row_number, Auction(
+                title = auction_in.title,
+                description = auction_in.description,
+                starting_price = auction_in.starting_price,
+                start_time = auction_in.start_time,
+                end_time = auction_in.end_time,
+                seller_id = seller_id,
+                state = auction_in.state
+            )
+
+
+    async def _insert_chunk(self, chunk: list[tuple[int, Auction]], report: AuctionImportReport) -> None:
+        try:
+            async with self.uow:
+                await self.auction_repo.create_many([auction for _, auction in chunk])
+                await self.uow.commit()
+            report.imported += len(chunk)
+        except AuctionCreationError as e:
+            if len(chunk) == 1:
+                report.add_error(chunk[0][0], e.message)
+                return
+            # Algún INSERT del lote viola una restricción de la BD: se repite fila a fila para aislarlo
+            for row in chunk:
+                await self._insert_chunk([row], report)
+
+
+    def export_auctions(self, seller_id: Optional[UUID] = None, batch_size: int = 500) -> AsyncIterator[Auction]:
+        """Todas las subastas (o las de un vendedor), en streaming desde la BD."""
+        return self.auction_repo.stream(seller_id, batch_size)
+
+
     async def list_auctions(self) -> list[Auction]:
         """
         Obtiene todas las subastas
         """
-        self.logger.info(f"Se van a obtener todas las subastas")
+        self.read_logger.info("Se van a obtener todas las subastas")
         try:
             return await self.auction_repo.get_all()
         except Exception as e:
-            self.logger.error(f"{e}", exc_info = True)
+            self.logger.error("{}", e, exc_info = True)
             raise e
 
 
@@ -55,7 +165,7 @@ class AuctionService:
         """
        Obtiene una subasta por ID.
         """
-        self.logger.info(f"Se va a obtener la subasta con ID {auction_id}")
+        self.read_logger.info("Se va a obtener la subasta con ID {}", auction_id)
 
         try:
             auction = await self.auction_repo.get_by_id(auction_id)
@@ -64,10 +174,18 @@ class AuctionService:
             return auction
         
         except Exception as e:
-            self.logger.error(f"{e}", exc_info = True)
+            self.logger.error("{}", e, exc_info = True)
             raise e
 
 
+    async def _get_auction_for_update(self, auction_id: UUID) -> Auction:
+        """La subasta, bloqueada hasta el fin de la transacción (como al pujar y al cerrarla)."""
+        auction = await self.auction_repo.get_by_id_for_update(auction_id)
+        if not auction:
+            raise AuctionNotFoundError(f"La subasta con ID {auction_id} no existe.")
+        return auction
+
+
     async def update_details(
             self,
             auction_id: UUID,
@@ -79,29 +197,65 @@ class AuctionService:
         Permite al vendedor corregir título o descripción.
         No permite cambiar precios ni fechas (por seguridad).
         """
-        auction = await self.get_auction(auction_id)
+        async with self.uow:
+            auction = await self._get_auction_for_update(auction_id)
 
-        if auction.seller_id != user_id:
-            raise PermissionError("Solo el vendedor puede editar esta subasta.")
+            if auction.seller_id != user_id:
+                raise PermissionError("Solo el vendedor puede editar esta subasta.")
 
-        if auction.state == AuctionState.CANCELLED:
-            raise ValueError("No se puede editar una subasta cancelada.")
-        
-        has_changed = auction.update_details(title, description)
+            if auction.state == AuctionState.CANCELLED:
+                raise ValueError("No se puede editar una subasta cancelada.")
+            
+            has_changed = auction.update_details(title, description)
 
-        if has_changed:
-            return await self.auction_repo.update(auction)
+            if has_changed:
+                await self.auction_repo.update(auction)
+                await self.uow.commit()
         
         return auction
 
 
     async def cancel_auction(self, auction_id: UUID, user_id: UUID) -> Auction:
-        auction = await self.get_auction(auction_id)
+        async with self.uow:
+            # Bloqueada: 'cancel' comprueba el estado que va a sobrescribir (el cierre periódico
+            # no puede finalizarla entre la lectura y el commit)
+            auction = await self._get_auction_for_update(auction_id)
 
-        if auction.seller_id != user_id:
-            raise PermissionError("No tienes permiso para cancelar esta subasta.")
-        
-        if auction.cancel():
-            return await self.auction_repo.update(auction)
+            if auction.seller_id != user_id:
+                raise PermissionError("No tienes permiso para cancelar esta subasta.")
+            
+            if auction.cancel():
+                # El evento se guarda en la misma transacción que el cambio de estado
+                if self.outbox:
+                    await self.outbox.add(AuctionCancelled(auction_id = auction.id, seller_id = auction.seller_id))
+                await self.auction_repo.update(auction)
+                await self.uow.commit()
         
         return auction
+
+
+    async def close_expired_auctions(self, limit: int = 100) -> int:
+        """
+        Finaliza las subastas activas cuya fecha de fin ya pasó (tarea periódica).
+        Devuelve el nº de subastas cerradas; si es igual a 'limit', quedan más por cerrar.
+        El lote completo se confirma en un único commit.
+        """
+        closed = 0
+        async with self.uow:
+            for auction in await self.auction_repo.get_expired(limit):
+                if not auction.close():
+                    continue
+                if self.outbox:
+                    await self.outbox.add(AuctionClosed(
+                        auction_id = auction.id,
+                        seller_id = auction.seller_id,
+                        winner_id = auction.winner_id,
+                        final_price = auction.current_price
+                    ))
+                await self.auction_repo.update(auction)
+                closed += 1
+            await self.uow.commit()
+
+        if closed:
+            self.logger.info("{} subastas finalizadas.", closed)
+        return closed
@@ -0,0 +1,191 @@
+import time
+
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.application.ports.unit_of_work import UnitOfWork
+from app.application.ports.user_repository import UserRepository
+from app.core.security import create_access_token, create_refresh_token, parse_refresh_token
+from app.domain.exceptions import InvalidRefreshTokenError
+from app.domain.models.auth_session import AuthSession
+from app.domain.models.user import User
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from uuid import UUID
+
+
+class AuthSessionCache:
+    """
+    Estado de las sesiones (activa o no) en memoria del proceso, con caducidad y tamaño máximo.
+
+    Evita ir a la BD en cada petición autenticada para saber si la sesión del access token
+    sigue viva, y descarta sin consultas los refresh tokens de sesiones ya revocadas.
+    Cada worker tiene su propia caché: una revocación hecha en otro worker se ve aquí
+    como mucho 'ttl_seconds' después.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        # ID de sesión -> (activa, caducidad de la sesión, caducidad de la entrada). Orden = orden de inserción
+        self._entries: OrderedDict[UUID, tuple[bool, datetime | None, float]] = OrderedDict()
+
+
+    def get(self, session_id: UUID) -> bool | None:
+        """True/False si se conoce el estado de la sesión; None si hay que consultarlo."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        active, expires_at, valid_until = entry
+        if valid_until <= self.clock():
+            del self._entries[session_id]
+            return None
+        return active and expires_at > datetime.now(timezone.utc)
+
+
+    def put(self, auth_session: AuthSession) -> None:
+        self._set(auth_session.id, (auth_session.is_active(), auth_session.expires_at, self.clock() + self.ttl_seconds))
+
+
+    def mark_revoked(self, session_id: UUID) -> None:
+        self._set(session_id, (False, None, self.clock() + self.ttl_seconds))
+
+
+    def _set(self, session_id: UUID, entry: tuple[bool, datetime | None, float]) -> None:
+        self._entries[session_id] = entry
+        self._entries.move_to_end(session_id)
+        # Todas las entradas duran lo mismo: las primeras son las que caducan antes
+        now = self.clock()
+        while self._entries:
+            oldest_id, (_, _, valid_until) = next(iter(self._entries.items()))
+            if valid_until > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[oldest_id]
+
+
+class AuthService:
+    """
+    Sesiones de autenticación con refresh tokens rotatorios.
+
+    La contraseña (Argon2) solo se comprueba en el login. Con el refresh token se obtiene
+    un access token nuevo sin ningún hash lento: una lectura y una escritura por clave primaria.
+    Cada renovación entrega un refresh token nuevo e invalida el anterior; si el anterior
+    vuelve a aparecer, alguien más lo tiene y se revoca la sesión entera.
+    """
+    def __init__(
+        self,
+        session_repo: AuthSessionRepository,
+        user_repo: UserRepository,
+        cache: AuthSessionCache,
+        refresh_token_lifetime: timedelta,
+        logger,
+        uow: UnitOfWork
+    ):
+        self.session_repo = session_repo
+        self.user_repo = user_repo
+        self.cache = cache
+        self.refresh_token_lifetime = refresh_token_lifetime
+        self.logger = logger
+        self.uow = uow
+
+
+    async def start_session(self, user: User) -> tuple[str, str]:
+        """Abre una sesión para un usuario ya autenticado. Devuelve (access token, refresh token)."""
+        auth_session = AuthSession(
+            user_id = user.id,
+            token_hash = "",
+            expires_at = datetime.now(timezone.utc) + self.refresh_token_lifetime
+        )
+        refresh_token, auth_session.token_hash = create_refresh_token(auth_session.id)
+
+        async with self.uow:
+            await self.session_repo.create(auth_session)
+            await self.uow.commit()
+
+        self.cache.put(auth_session)
+        return create_access_token(subject = user.id, session_id = auth_session.id), refresh_token
+
+
+    async def refresh(self, refresh_token: str) -> tuple[str, str]:
+        """
+        Renueva la sesión:
+        1. Validar el formato del token y descartar sesiones que ya se sabe que están revocadas
+        2. Leer la sesión y comprobar que el token es el vigente (si es el anterior: reutilización)
+        3. Comprobar que el usuario sigue activo
+        4. Rotar el token con una escritura condicional
+        """
+        # 1. Sin consultas para tokens mal formados o de sesiones revocadas
+        parsed = parse_refresh_token(refresh_token)
+        if not parsed:
+            raise InvalidRefreshTokenError("Refresh token no válido.")
+        session_id, token_hash = parsed
+        if self.cache.get(session_id) is False:
+            raise InvalidRefreshTokenError("La sesión ha caducado o se ha cerrado.")
+
+        # 2. Sesión y token
+        auth_session = await self.session_repo.get_by_id(session_id)
+        if not auth_session or not auth_session.is_active():
+            self.cache.mark_revoked(session_id)
+            raise InvalidRefreshTokenError("La sesión ha caducado o se ha cerrado.")
+
+        if token_hash == auth_session.previous_token_hash:
+            await self._revoke_reused(auth_session)
+        if token_hash != auth_session.token_hash:
+            raise InvalidRefreshTokenError("Refresh token no válido.")
+
+        # 3. Usuario (por clave primaria)
+        user = await self.user_repo.get_by_id(auth_session.user_id)
+        if not user or not user.is_active:
+            await self.revoke(session_id)
+            raise InvalidRefreshTokenError("Usuario inactivo.")
+
+        # 4. Rotación. Si otra petición ha rotado antes con el mismo token, este ya es el anterior
+        new_refresh_token, new_hash = create_refresh_token(session_id)
+        async with self.uow:
+            rotated = await self.session_repo.rotate(session_id, token_hash, new_hash)
+            await self.uow.commit()
+        if not rotated:
+            await self._revoke_reused(auth_session)
+
+        self.cache.put(auth_session)
+        return create_access_token(subject = user.id, session_id = session_id), new_refresh_token
+
+
+    async def logout(self, refresh_token: str) -> None:
+        """Cierra la sesión del refresh token. Solo quien tiene el token vigente puede cerrarla."""
+        parsed = parse_refresh_token(refresh_token)
+        if not parsed:
+            raise InvalidRefreshTokenError("Refresh token no válido.")
+        session_id, token_hash = parsed
+
+        auth_session = await self.session_repo.get_by_id(session_id)
+        if not auth_session or token_hash != auth_session.token_hash:
+            raise InvalidRefreshTokenError("Refresh token no válido.")
+        await self.revoke(session_id)
+        self.logger.info("Sesión {} del usuario {} cerrada.", session_id, auth_session.user_id)
+
+
+    async def revoke(self, session_id: UUID) -> None:
+        async with self.uow:
+            await self.session_repo.revoke(session_id)
+            await self.uow.commit()
+        self.cache.mark_revoked(session_id)
+
+
+    async def is_session_active(self, session_id: UUID) -> bool:
+        """Comprobación de cada petición autenticada: casi siempre se resuelve en la caché."""
+        active = self.cache.get(session_id)
+        if active is not None:
+            return active
+
+        auth_session = await self.session_repo.get_by_id(session_id)
+        if not auth_session:
+            self.cache.mark_revoked(session_id)
+            return False
+        self.cache.put(auth_session)
+        return auth_session.is_active()
+
+
+    async def _revoke_reused(self, auth_session: AuthSession) -> None:
+        await self.revoke(auth_session.id)
+        self.logger.warning("Refresh token reutilizado: sesión {} del usuario {} revocada.", auth_session.id, auth_session.user_id)
+        raise InvalidRefreshTokenError("Refresh token ya utilizado: la sesión se ha cerrado por seguridad.")
@@ -1,43 +1,172 @@
 from app.application.ports.auction_repository import AuctionRepository
 from app.application.ports.bid_repository import BidRepository
+from app.application.ports.event_publisher import EventPublisher
+from app.application.ports.outbox_repository import OutboxRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.api.v1.schemas.bid import BidCreate, BidResponse
 from app.domain.enums import AuctionState
+from app.domain.events import BidPlaced, BidRetracted
 from app.domain.models.bid import Bid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
 from uuid import UUID
 
 
+@dataclass
+class BidBatchResult:
+    """Resultado de una puja de un lote: la puja creada o el motivo del rechazo."""
+    index: int # Posición en la petición
+    auction_id: UUID
+    amount: Decimal
+    bid: Optional[Bid] = None
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        return "created" if self.bid else "rejected"
+
+
 class BidService:
-    def __init__(self, logger, bid_repo: BidRepository, auction_repo: AuctionRepository):
+    def __init__(
+        self,
+        logger,
+        bid_repo: BidRepository,
+        auction_repo: AuctionRepository,
+        uow: UnitOfWork,
+        event_publisher: EventPublisher | None = None,
+        outbox: OutboxRepository | None = None
+    ):
         self.logger = logger
         self.bid_repo = bid_repo
         self.auction_repo = auction_repo
+        self.uow = uow
+        self.event_publisher = event_publisher
+        self.outbox = outbox
 
     
     async def place_bid(self, bid_in: BidCreate, auction_id: UUID, bidder_id: UUID) -> Bid:
         """
         Orquesta el proceso de pujar:
-        1. Obtiene la subasta.
+        1. Obtiene y bloquea la subasta (dos pujas simultáneas se aplican una tras otra).
         2. Ejecuta la lógica de dominio (validaciones).
         3. Guarda la puja.
         4. Actualiza la subasta (nuevo precio/ganador).
+        5. Confirma todo en una sola transacción.
+        6. Publica el evento 'BidPlaced'.
         """
-        # 1. Obtener subasta (con sus pujas actuales cargadas, si es posible)
-        auction = await self.auction_repo.get_by_id(auction_id)
-        if not auction:
-            raise ValueError("Subasta no encontrada")
-        
-        # 2. Lógica de Dominio (Entidad Auction decide si la puja es válida)
-        new_bid = auction.place_bid(amount = bid_in.amount, bidder_id = bidder_id)
+        async with self.uow:
+            # 1. Obtener subasta con sus pujas, bloqueada hasta el commit
+            auction = await self.auction_repo.get_by_id_for_update(auction_id)
+            if not auction:
+                raise ValueError("Subasta no encontrada")
+            
+            # 2. Lógica de Dominio (Entidad Auction decide si la puja es válida)
+            previous_winner_id = auction.winner_id
+            new_bid = auction.place_bid(amount = bid_in.amount, bidder_id = bidder_id)
 
-        # 3. Persistir puja
-        saved_bid = await self.bid_repo.create(new_bid)
+            event = BidPlaced(
+                bid_id = new_bid.id,
+                auction_id = new_bid.auction_id,
+                bidder_id = new_bid.bidder_id,
+                amount = new_bid.amount,
+                previous_winner_id = previous_winner_id,
+                occurred_at = new_bid.created_at
+            )
+
+            # 3. Persistir puja (el evento del outbox va en la misma transacción)
+            if self.outbox:
+                await self.outbox.add(event)
+            saved_bid = await self.bid_repo.create(new_bid)
+
+            # 4. Persistir cambios en subasta (precio y ganador actualizados)
+            await self.auction_repo.update(auction)
 
-        # 4. Persistir cambios en subasta (precio y ganador actualizados)
-        await self.auction_repo.update(auction)
+            # 5. Un único commit: puja, subasta y evento, o nada
+            await self.uow.commit()
+
+        # 6. Avisar a los suscriptores en proceso (solo cuando la puja ya está confirmada)
+        if self.event_publisher:
+            await self.event_publisher.publish(event)
 
         return saved_bid
     
 
+    async def place_bids(self, bids_in: list[BidCreate], bidder_id: UUID) -> list[BidBatchResult]:
+        """
+        Pujas en lote, en varias subastas. Cada puja se valida con las reglas de 'Auction.place_bid'
+        como si llegara sola y en el orden de la petición; las rechazadas no impiden las demás.
+        1. Agrupa las pujas por subasta.
+        2. Lee y bloquea todas las subastas en una consulta, en orden de ID (sin interbloqueos entre lotes).
+        3. Aplica la lógica de dominio puja a puja.
+        4. Guarda las pujas aceptadas, sus eventos y las subastas modificadas, y confirma en un único commit.
+        5. Publica un 'BidPlaced' por cada puja aceptada.
+        Devuelve un resultado por puja, en el orden de la petición.
+        """
+        results = [BidBatchResult(index = i, auction_id = b.auction_id, amount = b.amount) for i, b in enumerate(bids_in)]
+
+        # 1. Agrupar por subasta, conservando el orden de la petición dentro de cada una
+        by_auction: dict[UUID, list[BidBatchResult]] = {}
+        for result in results:
+            by_auction.setdefault(result.auction_id, []).append(result)
+
+        events, new_bids = [], []
+        async with self.uow:
+            # 2. Subastas con sus pujas, bloqueadas
+            auctions = await self.auction_repo.get_many_for_update(list(by_auction))
+            found = {auction.id: auction for auction in auctions}
+
+            # 3. Lógica de Dominio, subasta a subasta
+            modified = []
+            for auction_id, items in by_auction.items():
+                auction = found.get(auction_id)
+                if not auction:
+                    for result in items:
+                        result.error = "Subasta no encontrada"
+                    continue
+
+                for result in items:
+                    previous_winner_id = auction.winner_id
+                    try:
+                        new_bid = auction.place_bid(amount = result.amount, bidder_id = bidder_id)
+                    except ValueError as e:
+                        result.error = str(e)
+                        continue
+
+                    result.bid = new_bid
+                    new_bids.append(new_bid)
+                    events.append(BidPlaced(
+                        bid_id = new_bid.id,
+                        auction_id = new_bid.auction_id,
+                        bidder_id = new_bid.bidder_id,
+                        amount = new_bid.amount,
+                        previous_winner_id = previous_winner_id,
+                        occurred_at = new_bid.created_at
+                    ))
+
+                if any(result.bid for result in items):
+                    modified.append(auction)
+
+            # 4. Persistir en bloque: un INSERT de pujas, uno de eventos y un UPDATE por subasta modificada
+            if new_bids:
+                if self.outbox:
+                    for event in events:
+                        await self.outbox.add(event)
+                await self.bid_repo.create_many(new_bids)
+                for auction in modified:
+                    await self.auction_repo.update(auction)
+            await self.uow.commit() # También si no hay cambios: libera los bloqueos
+
+        self.logger.info("Lote de {} pujas del usuario {}: {} aceptadas.", len(results), bidder_id, len(new_bids))
+
+        # 5. Avisar a los suscriptores en proceso (solo cuando las pujas ya están confirmadas)
+        if self.event_publisher:
+            for event in events:
+                await self.event_publisher.publish(event)
+
+        return results
+
+
     async def get_auction_bids(self, auction_id: UUID) -> list[Bid]:
         """Obtiene el historial de pujas activas."""
         all_bids = await self.bid_repo.get_by_auction_id(auction_id)
@@ -50,48 +179,34 @@ class BidService:
         Borrado lógico de una puja.
         Si la puja eliminada era la ganadora, recalcula el estado de la subasta.
         """
-        # 1. Recuperar la puja.
-        bid = await self.bid_repo.get_by_id(bid_id)
-        if not bid:
-            raise ValueError("Puja no encontrada.")
-        
-        # 2. Seguridad: ¿Es el dueño de la puja?
-        if bid.bidder_id != user_id:
-            raise PermissionError("No tienes permiso para retirar esta puja.")
-        
-        # 3. Recuperar la subasta asociada
-        auction = await self.auction_repo.get_by_id(bid.auction_id)
-
-        # Validar: No se pueden retirar pujas si la subasta ya acabó
-        if not auction.is_open and auction.state != AuctionState.ACTIVE:
-            raise ValueError("No se puede retirar una puja de una subasta finalizada.")
-        
-        # 4. Ejecutar el borrado lógico
-        await self.bid_repo.delete(bid_id)
-
-        # 5. Recalculo el estado.
-        # Verifico si la puja borrada era la ganadora actual
-        is_winner = (auction.winner_id == bid.bidder_id) and (auction.current_price == bid.amount)
-
-        if is_winner:
-            # Necesitamos encontrar al "Segundo Mejor Postor"
-            all_bids = await self.bid_repo.get_by_auction_id(auction.id)
-
-            # Filtramos la que acabamos de borrar y cualquier otra borrada y asumimos que el repositorio las devuelve ordenadas por monto DESC
-            active_bids = [
-                b for b in all_bids
-                if b.deleted_at is None and b.id != bid_id
-            ]
-
-            if not active_bids:
-                # Caso A: No quedan pujas. Volvemos al inicio
-                auction.current_price = auction.starting_price
-                auction.winner_id = None
-            else:
-                # Caso B: Hay una segunda puja más alta
-                next_best_bid = active_bids[0]
-                auction.current_price = next_best_bid.amount
-                auction.winner_id = next_best_bid.bidder_id
+        async with self.uow:
+            # 1. Recuperar la puja.
+            bid = await self.bid_repo.get_by_id(bid_id)
+            if not bid:
+                raise ValueError("Puja no encontrada.")
+            
+            # 2. Seguridad: ¿Es el dueño de la puja?
+            if bid.bidder_id != user_id:
+                raise PermissionError("No tienes permiso para retirar esta puja.")
             
-            # Guardamos el nuevo estado corregido de la subasta
+            # 3. Recuperar la subasta asociada, bloqueada (como al pujar)
+            auction = await self.auction_repo.get_by_id_for_update(bid.auction_id)
+
+            # Validar: No se pueden retirar pujas si la subasta ya acabó
+            if not auction.is_open and auction.state != AuctionState.ACTIVE:
+                raise ValueError("No se puede retirar una puja de una subasta finalizada.")
+            
+            # 4. Lógica de Dominio: borrado lógico y recálculo de ganador, precio y estadísticas
+            auction.retract_bid(bid_id)
+
+            # 5. Persistir la puja borrada (con su evento) y el nuevo estado de la subasta, en un único commit
+            if self.outbox:
+                await self.outbox.add(BidRetracted(
+                    bid_id = bid.id,
+                    auction_id = bid.auction_id,
+                    bidder_id = bid.bidder_id,
+                    amount = bid.amount
+                ))
+            await self.bid_repo.delete(bid_id)
             await self.auction_repo.update(auction)
+            await self.uow.commit()
@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+from app.application.ports.notification_channel import NotificationChannel, OutbidNotification
+from app.domain.events import BidPlaced
+from dataclasses import dataclass
+from typing import Callable, Optional
+from uuid import UUID
+
+
+@dataclass
+class _Window:
+    """Ventana de agrupación de un (usuario, subasta): hasta 'due' no se envía otro aviso."""
+    due: float
+    notification: Optional[OutbidNotification] = None # Outbids acumulados desde el último envío
+
+
+class OutbidNotifier:
+    """
+    Avisa al líder anterior cuando una puja le supera, fuera de la petición HTTP.
+
+    1. 'on_bid_placed' (suscriptor del bus de eventos) solo encola: O(1) y nunca bloquea.
+       Si la cola acotada está llena, el evento se descarta y se cuenta en 'stats["dropped"]'.
+    2. Un único worker agrupa por (usuario, subasta): el primer outbid se envía en el momento y
+       los siguientes dentro de 'coalesce_seconds' se acumulan en un solo aviso al cerrar la ventana.
+       Como mucho un aviso por ventana y por (usuario, subasta).
+    3. Las entregas van a todos los canales, con como mucho 'max_in_flight' en curso: si los canales
+       son lentos, el worker espera, la cola se llena y se descarta en la entrada (backpressure).
+
+    Memoria acotada: cola de 'queue_size' eventos y como mucho 'max_windows' ventanas abiertas
+    (al superarlo se cierra la más antigua). Los avisos pendientes se envían al parar.
+    """
+    def __init__(
+        self,
+        channels: list[NotificationChannel],
+        logger,
+        queue_size: int = 10_000,
+        coalesce_seconds: float = 30.0,
+        max_windows: int = 50_000,
+        max_in_flight: int = 100,
+        send_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.channels = channels
+        self.logger = logger
+        self.coalesce_seconds = coalesce_seconds
+        self.max_windows = max_windows
+        self.send_timeout = send_timeout
+        self.clock = clock
+
+        self.queue: asyncio.Queue[BidPlaced] = asyncio.Queue(maxsize = queue_size)
+        # Orden de inserción = orden de vencimiento (todas las ventanas duran lo mismo)
+        self._windows: dict[tuple[UUID, UUID], _Window] = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._deliveries: set[asyncio.Task] = set()
+        self._worker: asyncio.Task | None = None
+
+        self.stats = {"received": 0, "dropped": 0, "coalesced": 0, "sent": 0, "failed": 0}
+
+
+    # --- ENTRADA (en la petición) ---
+    def on_bid_placed(self, event: BidPlaced) -> None:
+        """Suscriptor del bus de eventos."""
+        if not event.previous_winner_id or event.previous_winner_id == event.bidder_id:
+            return
+        try:
+            self.queue.put_nowait(event)
+            self.stats["received"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] % 1000 == 1: # Un aviso cada 1000 descartes, no uno por evento
+                self.logger.warning("Cola de notificaciones llena: {} avisos descartados", self.stats["dropped"])
+
+
+    # --- CICLO DE VIDA ---
+    def start(self) -> None:
+        self._worker = asyncio.create_task(self._run())
+
+
+    async def stop(self) -> None:
+        """Para el worker, envía lo acumulado y espera a las entregas en curso."""
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions = True)
+
+        while not self.queue.empty():
+            await self._handle(self.queue.get_nowait())
+        await self._flush(force = True)
+
+        await asyncio.gather(*self._deliveries, return_exceptions = True)
+        for channel in self.channels:
+            await channel.close()
+
+
+    # --- WORKER ---
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._windows:
+                timeout = max(0.0, next(iter(self._windows.values())).due - self.clock())
+
+            try:
+                await self._handle(await asyncio.wait_for(self.queue.get(), timeout))
+                # Procesar la ráfaga ya encolada sin volver a esperar
+                while not self.queue.empty():
+                    await self._handle(self.queue.get_nowait())
+            except asyncio.TimeoutError:
+                pass
+
+            await self._flush()
+
+
+    async def _handle(self, event: BidPlaced) -> None:
+        key = (event.previous_winner_id, event.auction_id)
+        window = self._windows.get(key)
+
+        if window is None:
+            # Primer outbid: aviso inmediato y se abre la ventana
+            if len(self._windows) >= self.max_windows:
+                oldest_key = next(iter(self._windows))
+                oldest = self._windows.pop(oldest_key)
+                if oldest.notification:
+                    await self._dispatch(oldest.notification)
+            self._windows[key] = _Window(due = self.clock() + self.coalesce_seconds)
+            await self._dispatch(self._notification(event))
+            return
+
+        self.stats["coalesced"] += 1
+        if window.notification is None:
+            window.notification = self._notification(event)
+        else:
+            window.notification.current_price = event.amount
+            window.notification.times_outbid += 1
+            window.notification.last_outbid_at = event.occurred_at
+
+
+    async def _flush(self, force: bool = False) -> None:
+        """Cierra las ventanas vencidas (todas si 'force') y envía lo acumulado en ellas."""
+        now = self.clock()
+        while self._windows:
+            key, window = next(iter(self._windows.items()))
+            if not force and window.due > now:
+                break
+            del self._windows[key]
+            if window.notification:
+                await self._dispatch(window.notification)
+                if not force:
+                    # Se ha avisado: nueva ventana para no volver a avisar antes de tiempo
+                    self._windows[key] = _Window(due = now + self.coalesce_seconds)
+
+
+    # --- ENTREGA ---
+    async def _dispatch(self, notification: OutbidNotification) -> None:
+        """Lanza la entrega en segundo plano. Espera si ya hay 'max_in_flight' en curso (backpressure)."""
+        await self._in_flight.acquire()
+        task = asyncio.create_task(self._send(notification))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+
+    async def _send(self, notification: OutbidNotification) -> None:
+        try:
+            for channel in self.channels:
+                try:
+                    await asyncio.wait_for(channel.send(notification), self.send_timeout)
+                    self.stats["sent"] += 1
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.logger.error("Error enviando aviso de outbid por {}: {}", type(channel).__name__, e)
+        finally:
+            self._in_flight.release()
+
+
+    @staticmethod
+    def _notification(event: BidPlaced) -> OutbidNotification:
+        return OutbidNotification(
+            user_id = event.previous_winner_id,
+            auction_id = event.auction_id,
+            current_price = event.amount,
+            times_outbid = 1,
+            first_outbid_at = event.occurred_at,
+            last_outbid_at = event.occurred_at
+        )
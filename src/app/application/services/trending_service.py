@@ -0,0 +1,160 @@
+import heapq
+import math
+import time
+
+from app.application.ports.auction_repository import AuctionRepository
+from app.domain.enums import AuctionState
+from app.domain.events import BidPlaced
+from app.domain.models.auction import Auction
+from collections import deque
+from operator import itemgetter
+from typing import Callable
+from uuid import UUID
+
+
+class TrendingTracker:
+    """
+    Contador de pujas por subasta en una ventana deslizante, en memoria del proceso.
+
+    - La ventana se divide en cubetas de 'bucket_seconds'. Cada puja suma 1 en la cubeta actual
+      y en el total de su subasta; al caducar una cubeta se restan sus conteos. Todo es O(1) por puja.
+    - Memoria acotada: como mucho 'max_tracked' subastas. Al superarlo se descartan las de menos
+      pujas en la ventana (un 10% de golpe, para amortizar el coste).
+    - El top-K se calcula con un heap (O(n log K)) como mucho una vez cada 'snapshot_seconds';
+      entre medias se sirve la instantánea.
+
+    Cada worker de uvicorn tiene su propio contador y solo ve las pujas que atiende: con N workers,
+    el ranking es una muestra de ~1/N de las pujas (ver 'serve.py').
+    """
+    def __init__(
+        self,
+        window_seconds: float,
+        bucket_seconds: float,
+        max_tracked: int,
+        snapshot_seconds: float,
+        max_k: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = max(1, math.ceil(window_seconds / bucket_seconds))
+        self.max_tracked = max_tracked
+        self.snapshot_seconds = snapshot_seconds
+        self.max_k = max_k
+        self.clock = clock
+
+        self._buckets: deque[tuple[int, dict[UUID, int]]] = deque() # (nº de cubeta, pujas por subasta)
+        self._totals: dict[UUID, int] = {}
+
+        self._snapshot: list[tuple[UUID, int]] = []
+        self._snapshot_at: float | None = None
+
+
+    # --- ENTRADA ---
+    def on_bid_placed(self, event: BidPlaced) -> None:
+        """Suscriptor del bus de eventos."""
+        self.record(event.auction_id)
+
+
+    def record(self, auction_id: UUID, count: int = 1) -> None:
+        current = self._current_bucket()
+        self._expire(current)
+
+        if not self._buckets or self._buckets[-1][0] != current:
+            self._buckets.append((current, {}))
+        counts = self._buckets[-1][1]
+        counts[auction_id] = counts.get(auction_id, 0) + count
+        self._totals[auction_id] = self._totals.get(auction_id, 0) + count
+
+        if len(self._totals) > self.max_tracked:
+            self._evict()
+
+
+    # --- SALIDA ---
+    def top(self, k: int) -> list[tuple[UUID, int]]:
+        """Las 'k' subastas con más pujas en la ventana: [(auction_id, pujas), ...]."""
+        now = self.clock()
+        if self._snapshot_at is None or now - self._snapshot_at >= self.snapshot_seconds:
+            self._expire(self._current_bucket())
+            self._snapshot = heapq.nlargest(self.max_k, self._totals.items(), key = itemgetter(1))
+            self._snapshot_at = now
+        return self._snapshot[:k]
+
+
+    def forget(self, auction_ids: list[UUID]) -> None:
+        """Deja de contar subastas que ya no pueden recibir pujas (cerradas o canceladas)."""
+        forgotten = set(auction_ids)
+        for auction_id in forgotten:
+            self._totals.pop(auction_id, None)
+            for _, counts in self._buckets:
+                counts.pop(auction_id, None)
+        self._snapshot = [entry for entry in self._snapshot if entry[0] not in forgotten]
+
+
+    @property
+    def tracked(self) -> int:
+        return len(self._totals)
+
+
+    # --- INTERNOS ---
+    def _current_bucket(self) -> int:
+        return int(self.clock() // self.bucket_seconds)
+
+
+    def _expire(self, current: int) -> None:
+        oldest_valid = current - self.num_buckets + 1
+        while self._buckets and self._buckets[0][0] < oldest_valid:
+            _, counts = self._buckets.popleft()
+            for auction_id, count in counts.items():
+                remaining = self._totals[auction_id] - count
+                if remaining > 0:
+                    self._totals[auction_id] = remaining
+                else:
+                    del self._totals[auction_id]
+
+
+    def _evict(self) -> None:
+        target = int(self.max_tracked * 0.9)
+        victims = heapq.nsmallest(len(self._totals) - target, self._totals.items(), key = itemgetter(1))
+        for auction_id, _ in victims:
+            del self._totals[auction_id]
+            for _, counts in self._buckets:
+                counts.pop(auction_id, None)
+
+
+class TrendingService:
+    def __init__(self, tracker: TrendingTracker, auction_repo: AuctionRepository, logger):
+        self.tracker = tracker
+        self.auction_repo = auction_repo
+        self.logger = logger
+
+
+    async def get_most_bids(self, limit: int) -> list[tuple[Auction, int]]:
+        """
+        Subastas activas con más pujas en la ventana, con su nº de pujas recientes.
+        Las que se han cerrado o cancelado dentro de la ventana no se muestran: se sigue bajando
+        por la instantánea, de 'limit' en 'limit', hasta completar 'limit' activas.
+        """
+        candidates = self.tracker.top(self.tracker.max_k)
+        result, inactive = [], []
+
+        for start in range(0, len(candidates), limit):
+            page = candidates[start:start + limit]
+            auctions = {a.id: a for a in await self.auction_repo.get_by_ids([auction_id for auction_id, _ in page])}
+            for auction_id, count in page:
+                auction = auctions.get(auction_id)
+                if auction and auction.state == AuctionState.ACTIVE:
+                    result.append((auction, count))
+                else:
+                    inactive.append(auction_id)
+            if len(result) >= limit:
+                break
+
+        # Ya no reciben pujas: fuera del contador, para no volver a consultarlas
+        if inactive:
+            self.tracker.forget(inactive)
+        return result[:limit]
+
+
+    async def get_ending_soon(self, limit: int) -> list[Auction]:
+        return await self.auction_repo.get_ending_soon(limit)
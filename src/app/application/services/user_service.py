@@ -1,6 +1,9 @@
 from app.api.v1.schemas.user import UserCreate, UserUpdate, UserPasswordUpdate
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.application.ports.unit_of_work import UnitOfWork
 from app.application.ports.user_repository import UserRepository
-from app.core.security import get_password_hash, verify_password
+from app.application.services.auth_service import AuthSessionCache
+from app.core.security import get_password_hash, verify_and_update_password, verify_password
 from app.domain.models.user import User
 from app.domain.exceptions import UserAlreadyExistsError, UserNotFoundError
 from datetime import datetime, timezone
@@ -8,9 +11,20 @@ from uuid import UUID
 
 
 class UserService:
-    def __init__(self, user_repo: UserRepository, logger):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        logger,
+        uow: UnitOfWork,
+        session_repo: AuthSessionRepository | None = None,
+        session_cache: AuthSessionCache | None = None
+    ):
         self.user_repo = user_repo
         self.logger = logger
+        self.read_logger = logger.bind(sampled = True) # Lecturas: se muestrean en producción
+        self.uow = uow
+        self.session_repo = session_repo
+        self.session_cache = session_cache
 
     
     async def register_user(self, user_in: UserCreate) -> User:
@@ -21,7 +35,7 @@ class UserService:
         3. Crear Entidad
         4. Persistir
         """
-        self.logger.info(f"Se va a crear el usuario {user_in.username}")
+        self.logger.info("Se va a crear el usuario {}", user_in.username)
 
         # 1. Regla de negocio: Email único
         if await self.user_repo.get_by_email(user_in.email):
@@ -41,21 +55,37 @@ class UserService:
 
         # 4. Persistencia
         try:
-            new_user = await self.user_repo.create(new_user)
-            self.logger.info(f"Usuario {user_in.username} creado correctamente.")
+            async with self.uow:
+                new_user = await self.user_repo.create(new_user)
+                await self.uow.commit()
+            self.logger.info("Usuario {} creado correctamente.", user_in.username)
             return new_user
         
         except Exception as e:
-            self.logger.error(f"{e}", exc_info = True)
+            self.logger.error("{}", e, exc_info = True)
             raise e
 
 
     async def authenticate(self, identifier: str, password: str) -> User | None:
+        """
+        Comprueba las credenciales (un único Argon2). Si el hash guardado usa parámetros
+        antiguos, se guarda el hash con los actuales: los hashes migran solos con los logins.
+        """
         user = await self.user_repo.get_by_identifier(identifier)
+        if not user:
+            return None
 
-        if not user or not verify_password(password, user.password_hash) or not user.is_active:
+        verified, updated_hash = verify_and_update_password(password, user.password_hash)
+        if not verified or not user.is_active:
             return None
-        
+
+        if updated_hash:
+            user.password_hash = updated_hash
+            async with self.uow:
+                await self.user_repo.update(user)
+                await self.uow.commit()
+            self.logger.info("Hash de la contraseña de {} actualizado a los parámetros actuales.", user.username)
+
         return user
 
 
@@ -63,7 +93,7 @@ class UserService:
         """
         Obtiene un usuario por ID.
         """
-        self.logger.info(f"Se va a obtener el usuario con ID {user_id}")
+        self.read_logger.info("Se va a obtener el usuario con ID {}", user_id)
 
         try:
             user = await self.user_repo.get_by_id(user_id)
@@ -72,7 +102,7 @@ class UserService:
             return user
         
         except Exception as e:
-            self.logger.error(f"{e}", exc_info = True)
+            self.logger.error("{}", e, exc_info = True)
             raise e
 
 
@@ -102,7 +132,10 @@ class UserService:
         if not has_changed:
             return user
         
-        return await self.user_repo.update(user)
+        async with self.uow:
+            await self.user_repo.update(user)
+            await self.uow.commit()
+        return user
     
 
     async def change_password(self, user_id: UUID, pass_in: UserPasswordUpdate) -> User:
@@ -122,10 +155,38 @@ class UserService:
         user.password_hash = get_password_hash(pass_in.new_password)
         user.updated_at = datetime.now(timezone.utc)
         
-        return await self.user_repo.update(user)
+        # La contraseña y el cierre de todas las sesiones abiertas con la anterior, en un único commit
+        async with self.uow:
+            await self.user_repo.update(user)
+            revoked_sessions = await self._revoke_all_sessions(user.id)
+            await self.uow.commit()
+        self._forget_sessions(revoked_sessions)
+        self.logger.info("Contraseña de {} cambiada: {} sesiones cerradas.", user.username, len(revoked_sessions))
+        return user
 
     
     async def delete_user(self, user_id: UUID) -> User:
         user = await self.get_user(user_id)
         user.delete()
-        return await self.user_repo.update(user)
+
+        # Un usuario borrado no conserva ninguna sesión (ni sus refresh tokens)
+        async with self.uow:
+            await self.user_repo.update(user)
+            revoked_sessions = await self._revoke_all_sessions(user.id)
+            await self.uow.commit()
+        self._forget_sessions(revoked_sessions)
+        self.logger.info("Usuario {} borrado: {} sesiones cerradas.", user.username, len(revoked_sessions))
+        return user
+
+
+    async def _revoke_all_sessions(self, user_id: UUID) -> list[UUID]:
+        if not self.session_repo:
+            return []
+        return await self.session_repo.revoke_all_for_user(user_id)
+
+
+    def _forget_sessions(self, session_ids: list[UUID]) -> None:
+        """Tras el commit: este worker deja de aceptar las sesiones en el acto (los demás, al caducar su caché)."""
+        if self.session_cache:
+            for session_id in session_ids:
+                self.session_cache.mark_revoked(session_id)
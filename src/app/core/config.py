@@ -1,6 +1,7 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field
+from typing import Optional
 
 class Settings(BaseSettings):
     
@@ -16,17 +17,154 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
     DB_HOST: str = "localhost"
+    # URL completa opcional (p. ej. SQLite para benchmarks). Si se define, tiene prioridad
+    DB_URL: Optional[str] = None
+    # Réplica de solo lectura (opcional). Sin ella, las lecturas van a la primaria
+    DB_READ_URL: Optional[str] = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0 # Por encima, las lecturas vuelven a la primaria
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 1.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0 # Tras escribir, el usuario lee de la primaria durante este tiempo
+
+    # Pool de conexiones: presupuesto TOTAL del servicio, que se reparte entre los workers
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0 # Espera máxima por una conexión libre
+    DB_STATEMENT_TIMEOUT_SECONDS: float = 10.0 # 'max_statement_time' de MariaDB por sentencia (0 = sin límite)
+
+    # Límite adaptativo de peticiones concurrentes por worker (503 + Retry-After por encima)
+    LOAD_SHEDDING_ENABLED: bool = True
+    LOAD_SHEDDING_MIN_LIMIT: int = 2
+    LOAD_SHEDDING_MAX_LIMIT: int = 500
+    LOAD_SHEDDING_LATENCY_TOLERANCE: float = 2.0 # El límite baja si la latencia supera N veces la de referencia
+    LOAD_SHEDDING_RETRY_AFTER_SECONDS: float = 1.0
+
+    # Servidor de producción ('serve.py')
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0 # 0 = un proceso por CPU. 'serve.py' lo fija para que los workers lo conozcan
+    SERVER_LOOP: str = "auto" # "auto" = uvloop si está instalado (no existe en Windows), si no asyncio
+    SERVER_HTTP: str = "httptools"
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 75 # Mayor que el timeout de inactividad del balanceador (60 s en la mayoría)
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30 # Espera a las peticiones en curso al parar o reciclar un worker
+    SERVER_MAX_REQUESTS: int = 50_000 # Peticiones antes de reciclar un worker (0 = nunca)
+    SERVER_MAX_REQUESTS_JITTER: int = 5_000 # Cada worker suma al límite un aleatorio en [0, jitter]: no se reciclan a la vez
+    SERVER_ACCESS_LOG: bool = True # Muestreado según la configuración de logs (módulo "access")
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1" # Proxies de confianza para X-Forwarded-*
+
+    # Implementación de los repositorios: "sqlalchemy" (MariaDB) o "memory" (benchmarks y pruebas rápidas)
+    REPOSITORY_BACKEND: str = "sqlalchemy"
 
     # Secret Key para JWT
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     ALGORITHM: str
 
+    # Coste de Argon2 para las contraseñas (por defecto, los de argon2-cffi). Calibrar con 'benchmarks/argon2_calibrate.py'
+    PASSWORD_ARGON2_TIME_COST: int = 3 # Iteraciones
+    PASSWORD_ARGON2_MEMORY_KIB: int = 65_536 # Memoria por hash (64 MiB)
+    PASSWORD_ARGON2_PARALLELISM: int = 4 # Hilos por hash
+
+    # Sesiones con refresh tokens rotatorios ('POST /auth/refresh' no vuelve a calcular Argon2)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30 # Vida máxima de una sesión desde el login (no se alarga al renovar)
+    AUTH_SESSION_CACHE_TTL_SECONDS: float = 30.0 # Retraso máximo con el que otro worker ve un logout
+    AUTH_SESSION_CACHE_MAX_ENTRIES: int = 100_000
+    AUTH_SESSION_CLEANUP_INTERVAL_SECONDS: float = 3600 # Borrado de sesiones caducadas (0 = desactivado)
+    AUTH_SESSION_CLEANUP_BATCH_SIZE: int = 1000
+
+    # Monitor del bucle de eventos: lag continuo y pila de los bloqueos (barato: apto para producción)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.25
+    LOOP_MONITOR_BLOCK_THRESHOLD_MS: float = 100.0 # Bloqueos más largos se registran con su pila (0 = solo lag)
+    LOOP_MONITOR_WINDOW_SECONDS: float = 60.0 # Ventana de los percentiles de lag
+    LOOP_MONITOR_MAX_EVENTS: int = 20 # Bloqueos recientes que se guardan para '/debug/event-loop'
+
+    # Trazas por petición (ruta, servicios, repositorios y SQL) en un fichero NDJSON
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.05 # Fracción de peticiones trazadas (si el llamante no envía 'traceparent')
+    TRACING_EXPORT_PATH: str = "logs/traces.ndjson"
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 1.0
+    TRACING_MAX_SPANS_PER_TRACE: int = 500
+    TRACING_MAX_QUEUED_SPANS: int = 50_000 # Si la exportación se atasca, se descartan los más antiguos
+    TRACING_SQL_MAX_CHARS: int = 1000 # Longitud máxima de la sentencia guardada en el span
+
+    # Perfilado bajo demanda ('/debug/profile' y '/debug/memory', solo superusuarios)
+    DEBUG_PROFILING_ENABLED: bool = False
+    DEBUG_PROFILE_MAX_SECONDS: float = 30.0
+    DEBUG_PROFILE_INTERVAL_MS: float = 10.0 # 100 muestras por segundo
+    DEBUG_TRACEMALLOC_FRAMES: int = 10 # Marcos guardados por asignación
+    DEBUG_TRACEMALLOC_AT_STARTUP: bool = False # Activo siempre (más lento): permite ver el crecimiento entre llamadas
+
+    # Perfilado de SQL por petición (modo depuración)
+    DB_PROFILING: bool = False
+    DB_QUERY_BUDGET: int = 15 # Nº máximo de sentencias por petición antes de avisar
+    DB_SLOW_QUERY_MS: float = 100.0
+
+    # Archivado de pujas frías (subastas cerradas y pujas borradas) en 'bids_archive'
+    BID_ARCHIVE_AFTER_DAYS: float = 30
+    BID_ARCHIVE_BATCH_SIZE: int = 500 # Pujas por transacción (las subastas se archivan enteras)
+    BID_ARCHIVE_INTERVAL_SECONDS: float = 0 # 0 = sin tarea periódica (solo ejecución manual)
+
+    # Ranking de subastas "en tendencia" (contador en memoria de cada proceso)
+    TRENDING_WINDOW_MINUTES: int = 15
+    TRENDING_BUCKET_SECONDS: int = 30
+    TRENDING_MAX_TRACKED: int = 10_000 # Cota de memoria: nº máximo de subastas con contador
+    TRENDING_SNAPSHOT_SECONDS: float = 5.0
+    TRENDING_MAX_K: int = 50
+
+    # Importación y exportación masivas de subastas (CSV / NDJSON, en streaming)
+    AUCTION_IMPORT_CHUNK_SIZE: int = 500 # Filas por INSERT en bloque y por commit
+    AUCTION_IMPORT_MAX_ERRORS: int = 1000 # Errores por fila que se devuelven en el informe
+    AUCTION_EXPORT_BATCH_SIZE: int = 500 # Filas por lote del cursor del servidor
+
+    # Imágenes de subastas (subida en streaming a un almacén de objetos y miniaturas en procesos aparte)
+    IMAGE_STORAGE_PATH: str = "media" # Raíz del almacén local (sustituto de S3/MinIO)
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    IMAGE_MAX_PER_AUCTION: int = 20
+    IMAGE_THUMBNAIL_SIZE: int = 400 # Lado mayor de la miniatura, en píxeles
+    IMAGE_THUMBNAIL_WORKERS: int = 2 # Procesos del pool de miniaturas (0 = sin miniaturas)
+    IMAGE_CACHE_MAX_AGE_SECONDS: int = 31_536_000 # El contenido de una clave nunca cambia: caché de un año
+
+    # Pujas en lote ('POST /bids/batch')
+    BID_BATCH_MAX_ITEMS: int = 100
+
+    # Cierre automático de subastas vencidas (0 = desactivado)
+    AUCTION_CLOSE_INTERVAL_SECONDS: float = 30
+    AUCTION_CLOSE_BATCH_SIZE: int = 100
+
+    # Outbox de eventos: relay en segundo plano hacia un fichero NDJSON (0 = desactivado)
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_SINK_PATH: str = "logs/events.ndjson"
+    OUTBOX_SINK_FSYNC: bool = True
+
+    # Avisos de "te han superado" (en segundo plano, fuera de la petición)
+    NOTIFICATIONS_ENABLED: bool = True
+    NOTIFICATION_CHANNELS: str = "log" # Separados por comas: log, file, webhook
+    NOTIFICATION_QUEUE_SIZE: int = 10_000
+    NOTIFICATION_COALESCE_SECONDS: float = 30.0
+    NOTIFICATION_MAX_WINDOWS: int = 50_000
+    NOTIFICATION_MAX_IN_FLIGHT: int = 100
+    NOTIFICATION_FILE_PATH: str = "logs/notifications.ndjson"
+    NOTIFICATION_WEBHOOK_LATENCY_MS: float = 50.0
+
     @computed_field
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return f"mysql+asyncmy://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @computed_field
+    @property
+    def DB_POOL_SIZE_PER_WORKER(self) -> int:
+        return max(1, self.DB_POOL_SIZE // max(1, self.SERVER_WORKERS))
+
+    @computed_field
+    @property
+    def DB_MAX_OVERFLOW_PER_WORKER(self) -> int:
+        return self.DB_MAX_OVERFLOW // max(1, self.SERVER_WORKERS)
+
     model_config = SettingsConfigDict(
         # Orden de prioridad: .env.dev sobrescribe a .env.base
         # Las variables de entono reales sobrescriben a ambos
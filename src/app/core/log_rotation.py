@@ -0,0 +1,44 @@
+"""
+Rotación de los ficheros de log de desarrollo. Se importa solo al configurar los sinks de
+ficheros ('setup_logging' en modo desarrollo): en producción los logs van a la consola.
+"""
+import os
+import time
+
+
+class HybridRotation:
+    """
+    Rotación híbrida (Tamaño o Tiempo) que no toca el disco en cada mensaje.
+
+    Loguru la invoca antes de escribir cada línea. Solo cuando el sink abre un fichero
+    nuevo se consulta su tamaño y su fecha de creación; a partir de ahí se lleva en memoria
+    la cuenta de lo escrito y la fecha límite de rotación.
+    """
+    def __init__(self, max_size_mb: float, max_age_hours: float):
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_hours * 3600
+        self._file = None
+        self._written = 0
+        self._deadline = 0.0
+
+    def _track(self, file):
+        # Solo se ejecuta una vez por fichero (al arrancar o tras rotar)
+        file.seek(0, 2)
+        self._file = file
+        self._written = file.tell()
+        self._deadline = os.path.getctime(file.name) + self.max_age_seconds
+
+    def __call__(self, message, file) -> bool:
+        if file is not self._file:
+            self._track(file)
+
+        # Se cuentan caracteres, no bytes: es una aproximación suficiente para el límite
+        self._written += len(message)
+
+        # Tamaño o Tiempo
+        if self._written >= self.max_bytes or time.time() >= self._deadline:
+            # Loguru abre un fichero nuevo tras rotar: lo detectamos en la siguiente llamada
+            self._file = None
+            return True
+
+        return False
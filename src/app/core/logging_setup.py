@@ -1,12 +1,11 @@
 import json
 import logging
-import os
+import random
 import sys
 import threading
 
 from app.core.config import settings
 from contextvars import ContextVar
-from datetime import datetime, timedelta
 from loguru import logger
 from pathlib import Path
 
@@ -15,29 +14,135 @@ from pathlib import Path
 request_id_var: ContextVar[str] = ContextVar("request_id", default = "N/A")
 
 
+class LogSampler:
+    """
+    Muestreo de logs por módulo.
+
+    Cada módulo configurado define qué fracción de los registros "correctos" se conserva
+    ('success_rate') y qué fracción de los errores ('error_rate'). Los módulos sin configurar
+    no se muestrean. En el módulo 'access' se puede limitar el muestreo a ciertos métodos HTTP
+    (p. ej. solo GET): el resto de peticiones se registran siempre.
+
+    En los módulos de dominio solo se muestrean los registros marcados con 'sampled'
+    ('logger.bind(sampled = True)'): lecturas y listados, los de mucho volumen. Las escrituras
+    y los registros de auditoría no se marcan y se conservan siempre.
+    """
+    # Módulos que ya se muestrean en InterceptHandler (no se vuelven a muestrear en el sink)
+    INTERCEPTED_MODULES = frozenset({"access", "system"})
+
+    def __init__(self, rules: dict[str, dict]):
+        self.rules = rules
+
+    def should_log(self, module: str | None, is_error: bool, method: str | None = None) -> bool:
+        rule = self.rules.get(module)
+        if rule is None:
+            return True
+
+        if method is not None and "methods" in rule and method not in rule["methods"]:
+            return True
+
+        rate = rule.get("error_rate", 1.0) if is_error else rule.get("success_rate", 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+    def filter(self, record) -> bool:
+        """Filtro para los sinks de Loguru (los WARNING o superiores cuentan como error)."""
+        module = record["extra"].get("module")
+        if module in self.INTERCEPTED_MODULES or not record["extra"].get("sampled"):
+            return True
+        return self.should_log(module, record["level"].no >= logging.WARNING)
+
+
+class BatchedStreamSink:
+    """
+    Sink que agrupa las líneas ya serializadas y las escribe en bloque.
+
+    Con un 'sys.stderr' normal, Loguru hace un write + flush por línea. Aquí se acumulan
+    hasta 'max_lines' o como mucho 'flush_interval' segundos, y se vuelcan con una sola escritura.
+    Loguru llama a 'stop' al quitar el sink (y al salir del proceso), que vacía lo pendiente.
+    """
+    def __init__(self, stream, max_lines: int = 256, flush_interval: float = 1.0):
+        self.stream = stream
+        self.max_lines = max_lines
+        self.flush_interval = flush_interval
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target = self._flush_periodically, name = "log-flusher", daemon = True)
+        self._flusher.start()
+
+    def write(self, message: str) -> None:
+        with self._lock:
+            self._buffer.append(message)
+            if len(self._buffer) >= self.max_lines:
+                self._flush_locked()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            with self._lock:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        self.stream.write("".join(self._buffer))
+        self.stream.flush()
+        self._buffer.clear()
+
+
 class InterceptHandler(logging.Handler):
+    # Loggers de mucho volumen: no se recorre la pila para localizar el origen del mensaje
+    FAST_PATH_LOGGERS = frozenset({"uvicorn.access"})
+
+    # Caché de niveles ya resueltos (evita consultar 'logger.level' en cada registro)
+    _levels: dict[str, str | int] = {}
+
+    def __init__(self, sampler: LogSampler | None = None):
+        super().__init__()
+        self.sampler = sampler
+
     def emit(self, record):
         # 1. Determinar a qué módulo de Loguru pertenece
         # Si el nombre del logger es 'uvicorn.access', lo marcamos como 'access'
         # Si es cualquier otro de uvicorn o fastapi, lo marcamos como 'system'
         module = "system"
+        method = None
+        is_error = record.levelno >= logging.WARNING
         if record.name == "uvicorn.access":
             module = "access"
+            # args de uvicorn: (cliente, método, ruta, versión HTTP, código de estado)
+            if len(record.args) == 5:
+                method = record.args[1]
+                is_error = is_error or record.args[4] >= 400
+
+        # 1.1. Muestreo: se descarta antes de construir el mensaje
+        if self.sampler and not self.sampler.should_log(module, is_error, method):
+            return
         
         # 2. Mapear niveles de logging estándar a Loguru
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        level = self._levels.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelname] = level
 
         # 3. Encontrar el origen del mensaje para el traceback
-        frame, depth = logging.currentframe(), 2
-        while frame and frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
+        if record.name in self.FAST_PATH_LOGGERS:
+            depth = 0
+        else:
+            frame, depth = logging.currentframe(), 2
+            while frame and frame.f_code.co_filename == logging.__file__:
+                frame = frame.f_back
+                depth += 1
 
-        if not frame:
-            depth = 2
+            if not frame:
+                depth = 2
 
         # 4. Enviar a Loguru con la etiqueta 'module' para que el sink lo capture
         logger.opt(depth = depth, exception = record.exc_info).bind(module = module).log(level, record.getMessage())
@@ -56,6 +161,9 @@ def setup_logging():
 
     logger.remove() # Limpiar la configuración por defecto
 
+    # Muestreo por módulo (en ambos modos)
+    sampler = LogSampler(conf.get("sampling", {}))
+
 
     # ==========================================
     # MODO PRODUCCIÓN (Infraestructura / Docker)
@@ -63,13 +171,15 @@ def setup_logging():
     if env == "prod":
         # En Prod SOLO queremos JSON a la consola.
         # La infraestructura se encargará de guardar, rotar y buscar.
+        # El sink agrupa las líneas para no hacer un write + flush por cada una
         logger.add(
-            sys.stderr,
-            level = "INFO",
-            serialize = True, # Convierte todo a JSON estructurado
-            enqueue = True,
-            backtrace = True,
-            diagnose = False
+            BatchedStreamSink(sys.stderr, conf["batch"]["max_lines"], conf["batch"]["flush_interval_seconds"]),
+            level = conf["level"],
+            serialize = conf["serialize"], # Convierte todo a JSON estructurado
+            filter = sampler.filter,
+            enqueue = conf["enqueue"],
+            backtrace = conf["backtrace"],
+            diagnose = conf["diagnose"]
         )
         # Nota: Aquí no configuramos ficheros. Docker capturará el stderr
         print("🚀 Logging configurado en modo PRODUCCIÓN (JSON/Stdout)")
@@ -80,23 +190,17 @@ def setup_logging():
     # ==========================================
     else:
 
+        # Los sinks de ficheros solo existen en desarrollo: su código no se importa en producción
+        from app.core.log_rotation import HybridRotation
+
         base_dir = Path(conf["base_path"])
         base_dir.mkdir(exist_ok = True)
 
         # 1. Lógica de rotación híbrida (Tamaño o Tiempo)
-        def hybrid_rotation_logic(message, file):
-            # Tamaño
-            file.seek(0, 2)
-            if file.tell() >= conf["rotation"]["max_size_mb"] * 1024 * 1024:
-                return True
-            
-            # Tiempo
-            creation_time = datetime.fromtimestamp(os.path.getctime(file.name))
-            if datetime.now() - creation_time >= timedelta(hours = conf["rotation"]["max_age_hours"]):
-                return True
-            
-            return False
-        
+        # Cada sink necesita su propia instancia, porque guarda el estado de su fichero
+        def rotation_logic():
+            return HybridRotation(conf["rotation"]["max_size_mb"], conf["rotation"]["max_age_hours"])
+
         # 2. Lógica para inyectar datos dinámicos en cada record
         def patcher(record):
             
@@ -125,7 +229,7 @@ def setup_logging():
         )
 
         def create_filter(module_name):
-            return lambda record: record["extra"].get("module") == module_name
+            return lambda record: record["extra"].get("module") == module_name and sampler.filter(record)
 
         # 4. Configurar un sink (archivo) por cada módulo definido
         for module in conf["modules"]:
@@ -140,7 +244,7 @@ def setup_logging():
                 level = "DEBUG" if settings.ENV_STATE == "dev" else "INFO",
                 format = selected_fmt,
                 filter = create_filter(module),
-                rotation = hybrid_rotation_logic,
+                rotation = rotation_logic(),
                 retention = conf["retention"],
                 compression = "zip",
                 enqueue = conf["enqueue"],
@@ -150,16 +254,16 @@ def setup_logging():
             )
 
         # 5. Sink para consola (opcional para desarrollo)
-        logger.add(sink = sys.stdout, level = "INFO", colorize = True)
+        logger.add(sink = sys.stdout, level = "INFO", colorize = True, enqueue = conf["enqueue"])
         print("🛠️ Logging configurado en modo DESARROLLO (Ficheros locales)")
 
-        # 6. Silenciar los loggers originales y redirigirlos
-        logging.basicConfig(handlers = [InterceptHandler()], level = 0, force = True)
+    # Silenciar los loggers originales y redirigirlos (con muestreo) a Loguru
+    logging.basicConfig(handlers = [InterceptHandler(sampler)], level = 0, force = True)
 
-        for name in ["uvicorn", "uvicorn.error", "uvicorn.access", "fastapi"]:
-            _logger = logging.getLogger(name)
-            _logger.handlers = [InterceptHandler()]
-            _logger.propagate = False
+    for name in ["uvicorn", "uvicorn.error", "uvicorn.access", "fastapi"]:
+        _logger = logging.getLogger(name)
+        _logger.handlers = [InterceptHandler(sampler)]
+        _logger.propagate = False
 
 
 def get_logger(name: str):
@@ -1,22 +1,40 @@
+import hashlib
 import jwt
+import secrets
 
 from app.core.config import settings
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from uuid import UUID
 
-# Configuración con Argon2 (recomendado por OWASP)
-password_hash = PasswordHash.recommended()
+# Configuración con Argon2 (recomendado por OWASP). Los parámetros se calibran para el servidor
+# con 'benchmarks/argon2_calibrate.py'; los hashes con parámetros antiguos se rehacen en el login
+password_hash = PasswordHash((
+    Argon2Hasher(
+        time_cost = settings.PASSWORD_ARGON2_TIME_COST,
+        memory_cost = settings.PASSWORD_ARGON2_MEMORY_KIB,
+        parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+    ),
+))
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica la contraseña usando pwdlib."""
     return password_hash.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifica la contraseña y, si es correcta pero el hash usa parámetros distintos de los
+    actuales, devuelve también el hash nuevo (None si no hace falta cambiarlo).
+    """
+    return password_hash.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Genera el hash Argon2."""
     return password_hash.hash(password)
 
-def create_access_token(subject: str | Any, expires_delta: timedelta | None = None) -> str:
+def create_access_token(subject: str | Any, expires_delta: timedelta | None = None, session_id: UUID | None = None) -> str:
     """Crea el JWT usando PyJWT."""
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -27,6 +45,29 @@ def create_access_token(subject: str | Any, expires_delta: timedelta | None = No
     # PyJWT es estricto con los tipos: 'exp' debe ser numérico (timestamp)
     # Pero si pasas datetime con timezone, él lo gestiona
     to_encode = {"exp": expire, "sub": str(subject)}
+    # Sesión de la que sale el token: al revocarla (logout) el token deja de valer
+    if session_id:
+        to_encode["sid"] = str(session_id)
 
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm = settings.ALGORITHM)
     return encoded_jwt
+
+
+def hash_refresh_secret(secret: str) -> str:
+    """SHA-256 del secreto: tiene 256 bits aleatorios, así que no necesita un hash lento como Argon2."""
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+def create_refresh_token(session_id: UUID) -> tuple[str, str]:
+    """Crea un refresh token opaco '<ID de sesión>.<secreto>'. Devuelve el token y el hash que se guarda."""
+    secret = secrets.token_urlsafe(32)
+    return f"{session_id}.{secret}", hash_refresh_secret(secret)
+
+def parse_refresh_token(token: str) -> tuple[UUID, str] | None:
+    """Separa un refresh token en (ID de sesión, hash del secreto). None si no tiene el formato esperado."""
+    session_part, _, secret = token.partition(".")
+    if not secret:
+        return None
+    try:
+        return UUID(session_part), hash_refresh_secret(secret)
+    except ValueError:
+        return None
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import ClassVar, Optional
+from uuid import UUID
+
+
+@dataclass(frozen = True)
+class DomainEvent:
+    """Hecho de negocio ya ocurrido. Inmutable: los suscriptores no pueden alterarlo."""
+    name: ClassVar[str] # Nombre estable para consumidores externos (outbox)
+    occurred_at: datetime = field(default_factory = lambda: datetime.now(timezone.utc), kw_only = True)
+
+    @property
+    def aggregate_id(self) -> UUID:
+        """Subasta a la que pertenece el evento (clave de orden para los consumidores)."""
+        return self.auction_id
+
+
+@dataclass(frozen = True)
+class BidPlaced(DomainEvent):
+    name: ClassVar[str] = "bid_placed"
+    bid_id: UUID
+    auction_id: UUID
+    bidder_id: UUID
+    amount: Decimal
+    previous_winner_id: Optional[UUID] = None # Líder al que esta puja ha superado
+
+
+@dataclass(frozen = True)
+class BidRetracted(DomainEvent):
+    name: ClassVar[str] = "bid_retracted"
+    bid_id: UUID
+    auction_id: UUID
+    bidder_id: UUID
+    amount: Decimal
+
+
+@dataclass(frozen = True)
+class AuctionCancelled(DomainEvent):
+    name: ClassVar[str] = "auction_cancelled"
+    auction_id: UUID
+    seller_id: UUID
+
+
+@dataclass(frozen = True)
+class AuctionClosed(DomainEvent):
+    name: ClassVar[str] = "auction_closed"
+    auction_id: UUID
+    seller_id: UUID
+    winner_id: Optional[UUID]
+    final_price: Decimal
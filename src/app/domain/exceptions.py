@@ -34,10 +34,22 @@ class UserInactiveError(LicitError):
     """Lanzada cuando se intenta acceder a la aplicación mediante un usuario inactivo."""
     pass
 
+class InvalidRefreshTokenError(LicitError):
+    """Lanzada cuando un refresh token no es válido, ha caducado, está revocado o ya se usó."""
+    pass
+
 class InvalidBidError(LicitError):
     """Lanzada cuando una puja no cumple las reglas (precio bajo, tiempo expirado...)."""
     pass
 
+class ImageTooLargeError(LicitError):
+    """Lanzada cuando una imagen subida supera el tamaño máximo permitido."""
+    pass
+
+class UnsupportedImageError(LicitError):
+    """Lanzada cuando el fichero subido no es una imagen de un formato admitido."""
+    pass
+
 class InfraestructureError(LicitError):
     """Lanzada cuando algo falla en la perisistencia o en servicios externos."""
 
@@ -81,6 +93,18 @@ def setup_exception_handlers(app: FastAPI):
         )
     
 
+    @app.exception_handler(InvalidRefreshTokenError)
+    async def invalid_refresh_token_handler(request: Request, exc: InvalidRefreshTokenError):
+        path = request.url.path
+        logger_contextual = exc_logger(path)
+        logger_contextual.warning(f"Error: {exc}")
+        return JSONResponse(
+            status_code = status.HTTP_401_UNAUTHORIZED,
+            content = {"error_code": "INVALID_REFRESH_TOKEN", "message": exc.message},
+            headers = {"WWW-Authenticate": "Bearer"}
+        )
+
+
     @app.exception_handler(InvalidBidError)
     async def invalid_bid_handler(request: Request, exc: InvalidBidError):
         path = request.url.path
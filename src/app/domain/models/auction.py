@@ -24,6 +24,11 @@ class Auction:
     
     bids: list[Bid] = field(default_factory = list)
 
+    # Estadísticas desnormalizadas (pujas activas), mantenidas al pujar y al retirar
+    bid_count: int = 0
+    bidder_count: int = 0
+    last_bid_at: Optional[datetime] = None
+
     # Auditoría
     created_at: datetime = field(default_factory = lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory = lambda: datetime.now(timezone.utc))
@@ -38,6 +43,10 @@ class Auction:
         if not self.current_price:
             self.current_price = self.starting_price
 
+        # Regla: Si no se indica fecha de inicio, la subasta empieza ya
+        if self.start_time is None:
+            self.start_time = datetime.now(timezone.utc)
+
     @property
     def is_open(self) -> bool:
         """Combina el estado con el tiempo, para decidir si se puede pujar."""
@@ -83,6 +92,20 @@ class Auction:
         return True
 
 
+    def close(self) -> bool:
+        """
+        Finaliza la subasta cuando ha pasado su fecha de fin.
+        Devuelve True si se cerró, False si aún no ha terminado o no estaba activa.
+        """
+        now = datetime.now(timezone.utc)
+        if self.state != AuctionState.ACTIVE or now <= self.end_time:
+            return False
+
+        self.state = AuctionState.COMPLETED
+        self.updated_at = now
+        return True
+
+
     def place_bid(self, amount: Decimal, bidder_id: UUID) -> None:
         """ 
         Método para añadir pujas.
@@ -109,9 +132,51 @@ class Auction:
         )
 
         # 5. Actualizar el estado de la subasta
+        is_new_bidder = not any(b.bidder_id == bidder_id for b in self._active_bids())
         self.bids.append(new_bid)
         self.current_price = amount
         self.winner_id = bidder_id
         self.updated_at = datetime.now(timezone.utc)
 
+        # 6. Actualizar las estadísticas sin recorrer el historial
+        self.bid_count += 1
+        if is_new_bidder:
+            self.bidder_count += 1
+        self.last_bid_at = new_bid.created_at
+
         return new_bid
+
+
+    def retract_bid(self, bid_id: UUID) -> None:
+        """
+        Retira (borrado lógico) una puja de las cargadas en 'bids'.
+        Si era la ganadora, el precio y el ganador pasan a la siguiente puja más alta.
+        """
+        bid = next((b for b in self._active_bids() if b.id == bid_id), None)
+        if not bid:
+            raise ValueError("Puja no encontrada.")
+
+        is_winner = (self.winner_id == bid.bidder_id) and (self.current_price == bid.amount)
+        bid.delete()
+        active_bids = self._active_bids()
+
+        if is_winner:
+            if not active_bids:
+                # Caso A: No quedan pujas. Volvemos al inicio
+                self.current_price = self.starting_price
+                self.winner_id = None
+            else:
+                # Caso B: Hay una segunda puja más alta
+                next_best_bid = max(active_bids, key = lambda b: b.amount)
+                self.current_price = next_best_bid.amount
+                self.winner_id = next_best_bid.bidder_id
+
+        # Las estadísticas se recalculan con las pujas que quedan
+        self.bid_count = len(active_bids)
+        self.bidder_count = len({b.bidder_id for b in active_bids})
+        self.last_bid_at = max((b.created_at for b in active_bids), default = None)
+        self.updated_at = datetime.now(timezone.utc)
+
+
+    def _active_bids(self) -> list[Bid]:
+        return [b for b in self.bids if b.deleted_at is None]
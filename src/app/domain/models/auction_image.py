@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+@dataclass
+class AuctionImage:
+    """
+    Imagen de una subasta. El contenido vive en el almacén de objetos con clave por SHA-256:
+    dos imágenes con el mismo contenido comparten fichero (y miniatura).
+    """
+    auction_id: UUID
+    sha256: str
+    content_type: str
+    size_bytes: int
+    original_key: str
+    id: UUID = field(default_factory = uuid4)
+
+    # Miniatura y dimensiones del original (None si no se pudo generar la miniatura)
+    thumbnail_key: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    # Auditoría
+    created_at: datetime = field(default_factory = lambda: datetime.now(timezone.utc))
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+@dataclass
+class AuthSession:
+    """
+    Sesión de un usuario: nace en el login y se renueva con refresh tokens rotatorios.
+
+    Solo se guarda el hash del refresh token vigente y el del anterior. Cada renovación
+    sustituye el vigente; si alguien presenta el anterior, el token se ha usado dos veces
+    (robado o copiado) y la sesión entera se revoca.
+    """
+    user_id: UUID
+    token_hash: str
+    expires_at: datetime
+    id: UUID = field(default_factory = uuid4)
+    previous_token_hash: Optional[str] = None
+
+    # Auditoría
+    created_at: datetime = field(default_factory = lambda: datetime.now(timezone.utc))
+    revoked_at: Optional[datetime] = None
+
+
+    def is_active(self, now: datetime | None = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        return self.revoked_at is None and self.expires_at > now
+
+
+    def revoke(self) -> None:
+        if self.revoked_at is None:
+            self.revoked_at = datetime.now(timezone.utc)
@@ -0,0 +1,164 @@
+"""
+Límite adaptativo de peticiones concurrentes contra la BD (por proceso).
+
+Cuando MariaDB se ralentiza, las peticiones se acumulan esperando una conexión del pool y la
+latencia de TODAS las rutas sube hasta el 'pool_timeout'. El limitador deja pasar como mucho
+'limit' peticiones a la vez y rechaza el resto al momento (503): mejor fallar rápido unas
+pocas que hacer esperar a todas.
+
+El límite se ajusta solo con la latencia observada (algoritmo de gradiente, como Gradient2 de
+Netflix, más un recorte multiplicativo de AIMD):
+- Latencia reciente ('short', media de la última ventana de muestras) frente a la latencia de
+  referencia ('long', media móvil lenta de las ventanas). Si la reciente supera 'tolerance'
+  veces la de referencia, el gradiente (long * tolerance / short) baja de 1 y el límite se
+  reduce en proporción; si no, el límite crece con un margen de sqrt(limit) peticiones en cola.
+- Cada error de sobrecarga (espera del pool agotada, sentencia cortada por 'max_statement_time')
+  recorta el límite un 10%, como mucho una vez por intervalo de latencia.
+- Si hay menos de la mitad del límite en uso no se aprende nada (la aplicación no está al límite).
+
+Prioridades: cada clase solo puede ocupar una parte del límite. Las peticiones de baja
+prioridad (listados completos, exportaciones) se rechazan antes y dejan sitio a las pujas y
+al detalle de subasta.
+"""
+import math
+import time
+
+from enum import IntEnum
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from typing import Callable
+
+
+class Priority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    CRITICAL = 2
+
+
+# Parte del límite que puede ocupar cada prioridad
+PRIORITY_SHARES = {
+    Priority.LOW: 0.5,
+    Priority.NORMAL: 0.85,
+    Priority.CRITICAL: 1.0,
+}
+
+# Duración mínima de una ventana de muestras (o dos latencias medias, si es mayor)
+MIN_WINDOW_SECONDS = 0.1
+
+# Códigos de error de MariaDB/MySQL por sentencia cortada ('max_statement_time' / 'max_execution_time')
+STATEMENT_TIMEOUT_ERRORS = {1969, 3024}
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Errores que indican que la BD no da abasto (y no un fallo de la petición)."""
+    if isinstance(exc, PoolTimeoutError):
+        return True
+    if isinstance(exc, DBAPIError) and exc.orig is not None and exc.orig.args:
+        return exc.orig.args[0] in STATEMENT_TIMEOUT_ERRORS
+    return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Todo ocurre en el bucle de eventos (sin 'await' dentro): no necesita locks.
+    'try_acquire' no espera nunca; quien recibe False debe rechazar la petición.
+    """
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.clock = clock
+
+        self.inflight = 0
+        self.short_latency: float | None = None # Segundos
+        self.long_latency: float | None = None
+        self._last_backoff = 0.0
+
+        # Ventana de muestras en curso
+        self._window_end = 0.0
+        self._window_sum = 0.0
+        self._window_count = 0
+        self._window_max_inflight = 0
+
+        # Contadores para métricas y logs
+        self.rejected = 0
+        self.overloads = 0
+
+
+    def try_acquire(self, priority: Priority = Priority.NORMAL) -> bool:
+        if self.inflight >= max(1, math.floor(self.limit * PRIORITY_SHARES[priority])):
+            self.rejected += 1
+            return False
+        self.inflight += 1
+        return True
+
+
+    def release(self, latency: float | None = None) -> None:
+        """Libera la plaza. 'latency' (segundos) alimenta el ajuste; None si la muestra no es representativa."""
+        inflight = self.inflight
+        self.inflight -= 1
+        if latency is not None:
+            self._on_sample(latency, inflight)
+
+
+    def on_overload(self) -> None:
+        """Recorte multiplicativo (AIMD) ante un error de sobrecarga."""
+        self.overloads += 1
+        now = self.clock()
+        if now - self._last_backoff < (self.short_latency or 0.0):
+            return # Un solo recorte por "ronda": las peticiones que fallan juntas son un único aviso
+        self._last_backoff = now
+        self.limit = max(self.min_limit, self.limit * 0.9)
+
+
+    def _on_sample(self, latency: float, inflight: int) -> None:
+        # Las muestras se agregan por ventanas: un ajuste por ventana, no por petición (con cientos
+        # de peticiones por segundo el límite crecería antes de que la latencia llegue a reflejarlo)
+        self._window_sum += latency
+        self._window_count += 1
+        self._window_max_inflight = max(self._window_max_inflight, inflight)
+        now = self.clock()
+        if now < self._window_end:
+            return
+
+        average = self._window_sum / self._window_count
+        max_inflight = self._window_max_inflight
+        self._window_sum, self._window_count, self._window_max_inflight = 0.0, 0, 0
+        self._window_end = now + max(MIN_WINDOW_SECONDS, 2 * average)
+
+        self.short_latency = average
+        if self.long_latency is None:
+            self.long_latency = average
+            return
+        self.long_latency += (average - self.long_latency) * 0.05
+        # Recuperación: tras una racha lenta, la referencia baja rápido hacia la latencia actual
+        if self.long_latency > 2 * self.short_latency:
+            self.long_latency *= 0.9
+
+        if max_inflight < self.limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_latency / self.short_latency))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        self.limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, self.limit))
+
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": round(self.limit, 1),
+            "inflight": self.inflight,
+            "short_latency_ms": round((self.short_latency or 0.0) * 1000, 2),
+            "long_latency_ms": round((self.long_latency or 0.0) * 1000, 2),
+            "rejected": self.rejected,
+            "overloads": self.overloads,
+        }
@@ -0,0 +1,42 @@
+"""
+Cierre periódico de subastas: pasa a 'completed' las subastas activas cuya fecha de fin ya pasó
+y deja el evento 'auction_closed' en el outbox, en la misma transacción.
+"""
+import asyncio
+
+from app.application.services.auction_service import AuctionService
+from app.core.logging_setup import get_logger
+from app.infrastructure.db.repositories.sqlalchemy_auction_repository import SQLAlchemyAuctionRepository
+from app.infrastructure.db.repositories.sqlalchemy_outbox_repository import SQLAlchemyOutboxRepository
+from app.infrastructure.db.unit_of_work import SQLAlchemyUnitOfWork
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+async def close_expired_auctions(session_factory: async_sessionmaker[AsyncSession], batch_size: int) -> int:
+    """Cierra lotes de 'batch_size' subastas (una sesión y un commit por lote) hasta que no quede ninguna vencida."""
+    auction_logger = get_logger("auctions")
+    total = 0
+
+    while True:
+        async with session_factory() as session:
+            service = AuctionService(
+                SQLAlchemyAuctionRepository(session),
+                auction_logger,
+                SQLAlchemyUnitOfWork(session),
+                SQLAlchemyOutboxRepository(session)
+            )
+            closed = await service.close_expired_auctions(batch_size)
+        total += closed
+        if closed < batch_size:
+            return total
+
+
+async def run_auction_closer(session_factory: async_sessionmaker[AsyncSession], interval_seconds: float, batch_size: int) -> None:
+    """Tarea en segundo plano: revisa las subastas vencidas cada 'interval_seconds' hasta que se cancele."""
+    auction_logger = get_logger("auctions")
+    while True:
+        try:
+            await close_expired_auctions(session_factory, batch_size)
+        except Exception as e:
+            auction_logger.error("Error cerrando subastas vencidas: {}", e)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,107 @@
+"""
+Reconstrucción de las estadísticas desnormalizadas de las subastas
+(bid_count, bidder_count, last_bid_at) a partir de las pujas activas.
+
+Los contadores se mantienen al pujar y al retirar; este job corrige las desviaciones
+(pujas concurrentes, datos cargados a mano, migraciones) con SQL por conjuntos:
+un único UPDATE con subconsultas correlacionadas por cada lote de subastas.
+
+Las pujas activas de una subasta están todas en 'bids' o todas en 'bids_archive'
+(el archivado mueve subastas completas y solo adelanta las pujas borradas), así que
+sumar los agregados de ambas tablas da el valor correcto.
+
+Uso (desde 'src/'):
+    python -m app.infrastructure.db.jobs.auction_stats --batch-size 1000
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.logging_setup import get_logger
+from app.infrastructure.db.models.auction_orm import AuctionORM
+from app.infrastructure.db.models.bid_archive_orm import BidArchiveORM
+from app.infrastructure.db.models.bid_orm import BidORM
+from sqlalchemy import distinct, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from uuid import UUID
+
+
+stats_logger = get_logger("db")
+
+
+def _active_bids_aggregate(bid_model, aggregate):
+    """Subconsulta escalar correlacionada con 'auctions' sobre las pujas activas de 'bid_model'."""
+    return (
+        select(aggregate)
+        .where(bid_model.auction_id == AuctionORM.id, bid_model.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+
+
+def reconcile_statement(auction_ids: list[UUID]):
+    """UPDATE por conjuntos que recalcula las estadísticas de las subastas indicadas."""
+    return (
+        update(AuctionORM)
+        .where(AuctionORM.id.in_(auction_ids))
+        .values(
+            bid_count =
+                _active_bids_aggregate(BidORM, func.count())
+                + _active_bids_aggregate(BidArchiveORM, func.count()),
+            bidder_count =
+                _active_bids_aggregate(BidORM, func.count(distinct(BidORM.bidder_id)))
+                + _active_bids_aggregate(BidArchiveORM, func.count(distinct(BidArchiveORM.bidder_id))),
+            last_bid_at = func.coalesce(
+                _active_bids_aggregate(BidORM, func.max(BidORM.created_at)),
+                _active_bids_aggregate(BidArchiveORM, func.max(BidArchiveORM.created_at))
+            ),
+            # Se fija explícitamente para que no salte el 'onupdate':
+            # recalcular estadísticas no es una modificación de la subasta
+            updated_at = AuctionORM.updated_at
+        )
+        .execution_options(synchronize_session = False)
+    )
+
+
+async def reconcile_auction_stats(session_factory: async_sessionmaker[AsyncSession], batch_size: int = 1000) -> int:
+    """
+    Recorre las subastas por lotes (paginación por clave, sin OFFSET) y recalcula sus
+    estadísticas con una transacción corta por lote. Devuelve el nº de subastas procesadas.
+    """
+    start = time.perf_counter()
+    processed = 0
+    last_id = None
+
+    while True:
+        async with session_factory() as session:
+            stmt = select(AuctionORM.id).order_by(AuctionORM.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(AuctionORM.id > last_id)
+            auction_ids = (await session.execute(stmt)).scalars().all()
+            if not auction_ids:
+                break
+
+            await session.execute(reconcile_statement(auction_ids))
+            await session.commit()
+
+        processed += len(auction_ids)
+        last_id = auction_ids[-1]
+
+    stats_logger.info("Estadísticas de {} subastas reconstruidas en {:.2f} s", processed, time.perf_counter() - start)
+    return processed
+
+
+async def main(batch_size: int) -> None:
+    from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+    try:
+        processed = await reconcile_auction_stats(AsyncSessionLocal, batch_size)
+    finally:
+        await engine.dispose()
+    print(f"Subastas reconciliadas: {processed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Reconstruye bid_count, bidder_count y last_bid_at de las subastas")
+    parser.add_argument("--batch-size", type = int, default = 1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,37 @@
+"""
+Limpieza periódica de 'auth_sessions': borra las sesiones caducadas para que la tabla solo
+contenga sesiones vivas (o revocadas que aún no han caducado).
+"""
+import asyncio
+
+from app.core.logging_setup import get_logger
+from app.infrastructure.db.repositories.sqlalchemy_auth_session_repository import SQLAlchemyAuthSessionRepository
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+async def delete_expired_sessions(session_factory: async_sessionmaker[AsyncSession], batch_size: int) -> int:
+    """Borra lotes de 'batch_size' sesiones (una transacción corta por lote) hasta que no quede ninguna caducada."""
+    now = datetime.now(timezone.utc)
+    total = 0
+
+    while True:
+        async with session_factory() as session:
+            deleted = await SQLAlchemyAuthSessionRepository(session).delete_expired(now, batch_size)
+            await session.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+async def run_auth_session_cleanup(session_factory: async_sessionmaker[AsyncSession], interval_seconds: float, batch_size: int) -> None:
+    """Tarea en segundo plano: borra las sesiones caducadas cada 'interval_seconds' hasta que se cancele."""
+    auth_logger = get_logger("users")
+    while True:
+        try:
+            deleted = await delete_expired_sessions(session_factory, batch_size)
+            if deleted:
+                auth_logger.info("Sesiones caducadas borradas: {}", deleted)
+        except Exception as e:
+            auth_logger.error("Error borrando sesiones caducadas: {}", e)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,176 @@
+"""
+Archivado de pujas frías: mueve de 'bids' a 'bids_archive', por lotes,
+- todas las pujas de las subastas cerradas (finalizadas o canceladas) hace más de X días,
+- las pujas borradas (soft delete) hace más de X días.
+
+Se puede ejecutar a mano (informa del tamaño de la tabla caliente y de la latencia de
+'get_by_auction_id' antes y después) o dejar como tarea periódica de la aplicación
+(BID_ARCHIVE_INTERVAL_SECONDS > 0).
+
+Uso (desde 'src/'):
+    python -m app.infrastructure.db.jobs.bid_archival --older-than-days 30 --batch-size 500
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.domain.enums import AuctionState
+from app.infrastructure.db.models.auction_orm import AuctionORM
+from app.infrastructure.db.models.bid_archive_orm import BidArchiveORM
+from app.infrastructure.db.models.bid_orm import BidORM
+from app.infrastructure.db.repositories.sqlalchemy_bid_repository import SQLAlchemyBidRepository
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+archive_logger = get_logger("db")
+
+# Columnas que se copian tal cual de 'bids' a 'bids_archive'
+_COLUMNS = ("id", "amount", "created_at", "deleted_at", "auction_id", "bidder_id")
+
+
+class BidArchiver:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], older_than: timedelta, batch_size: int):
+        self.session_factory = session_factory
+        self.older_than = older_than
+        self.batch_size = batch_size
+
+
+    async def _move(self, session: AsyncSession, condition) -> int:
+        """Copia al archivo y borra de la tabla caliente las pujas que cumplen 'condition' (misma transacción)."""
+        now = datetime.now(timezone.utc)
+        source = select(*(getattr(BidORM, c) for c in _COLUMNS), literal(now, BidArchiveORM.archived_at.type)).where(condition)
+        await session.execute(
+            insert(BidArchiveORM).from_select([*_COLUMNS, "archived_at"], source)
+        )
+        result = await session.execute(delete(BidORM).where(condition))
+        return result.rowcount
+
+
+    async def archive_closed_auctions(self) -> int:
+        """
+        Mueve las pujas de subastas cerradas en lotes de hasta 'batch_size' pujas. Cada subasta se
+        archiva completa en una sola transacción ('get_by_auction_id' cuenta con ello): el lote se
+        llena con subastas enteras, y una subasta con más de 'batch_size' pujas va sola en el suyo.
+        """
+        cutoff = datetime.now(timezone.utc) - self.older_than
+        closed = or_(
+            and_(AuctionORM.state == AuctionState.COMPLETED, AuctionORM.end_time < cutoff),
+            and_(AuctionORM.state == AuctionState.CANCELLED, AuctionORM.updated_at < cutoff),
+        )
+        hot_bids = select(BidORM.id).where(BidORM.auction_id == AuctionORM.id)
+        bid_rows = select(func.count()).where(BidORM.auction_id == AuctionORM.id).scalar_subquery()
+        moved = 0
+
+        while True:
+            async with self.session_factory() as session:
+                # Subastas que todavía tienen pujas en caliente (cada una, al menos una: bastan
+                # 'batch_size'), bloqueadas: con varios procesos, cada uno se salta las del otro
+                stmt = (
+                    select(AuctionORM.id, bid_rows)
+                    .where(closed, hot_bids.exists())
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked = True)
+                )
+                candidates = (await session.execute(stmt)).all()
+                if not candidates:
+                    return moved
+
+                auction_ids, batch_rows = [], 0
+                for auction_id, rows in candidates:
+                    if auction_ids and batch_rows + rows > self.batch_size:
+                        break
+                    auction_ids.append(auction_id)
+                    batch_rows += rows
+
+                moved += await self._move(session, BidORM.auction_id.in_(auction_ids))
+                await session.commit()
+
+
+    async def archive_deleted_bids(self) -> int:
+        """Mueve, en lotes de 'batch_size' pujas, las pujas borradas hace más de 'older_than'."""
+        cutoff = datetime.now(timezone.utc) - self.older_than
+        moved = 0
+
+        while True:
+            async with self.session_factory() as session:
+                stmt = (
+                    select(BidORM.id)
+                    .where(BidORM.deleted_at.is_not(None), BidORM.deleted_at < cutoff)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked = True)
+                )
+                bid_ids = (await session.execute(stmt)).scalars().all()
+                if not bid_ids:
+                    return moved
+
+                moved += await self._move(session, BidORM.id.in_(bid_ids))
+                await session.commit()
+
+
+    async def run_once(self) -> int:
+        start = time.perf_counter()
+        moved = await self.archive_closed_auctions() + await self.archive_deleted_bids()
+        archive_logger.info("Archivado de pujas: {} pujas movidas a 'bids_archive' en {:.2f} s", moved, time.perf_counter() - start)
+        return moved
+
+
+    async def run_periodically(self, interval_seconds: float) -> None:
+        """Tarea en segundo plano: archiva cada 'interval_seconds' hasta que se cancele."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                archive_logger.error("Error archivando pujas: {}", e)
+            await asyncio.sleep(interval_seconds)
+
+
+# --- INFORME (antes / después) ---
+async def hot_table_report(session_factory: async_sessionmaker[AsyncSession], sample_size: int = 50) -> dict:
+    """Filas en 'bids' y 'bids_archive' y latencia media de 'get_by_auction_id' sobre subastas activas."""
+    async with session_factory() as session:
+        hot_rows = await session.scalar(select(func.count()).select_from(BidORM))
+        archived_rows = await session.scalar(select(func.count()).select_from(BidArchiveORM))
+        auction_ids = (await session.execute(
+            select(AuctionORM.id).where(AuctionORM.state == AuctionState.ACTIVE).limit(sample_size)
+        )).scalars().all()
+
+        repo = SQLAlchemyBidRepository(session)
+        start = time.perf_counter()
+        for auction_id in auction_ids:
+            await repo.get_by_auction_id(auction_id)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "hot_rows": hot_rows,
+        "archived_rows": archived_rows,
+        "get_by_auction_id_avg_ms": (elapsed / len(auction_ids) * 1000) if auction_ids else 0.0,
+    }
+
+
+async def main(older_than_days: float, batch_size: int) -> None:
+    from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+    try:
+        before = await hot_table_report(AsyncSessionLocal)
+        archiver = BidArchiver(AsyncSessionLocal, timedelta(days = older_than_days), batch_size)
+        moved = await archiver.run_once()
+        after = await hot_table_report(AsyncSessionLocal)
+    finally:
+        await engine.dispose()
+
+    print(f"Pujas movidas: {moved}")
+    print(f"{'':<28} {'antes':>12} {'después':>12}")
+    for key in before:
+        print(f"{key:<28} {before[key]:>12.2f} {after[key]:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Archiva las pujas frías en 'bids_archive'")
+    parser.add_argument("--older-than-days", type = float, default = settings.BID_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type = int, default = settings.BID_ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.older_than_days, args.batch_size))
@@ -0,0 +1,43 @@
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.auction_orm import AuctionORM
+from app.infrastructure.db.models.types import UTCDateTime
+from datetime import datetime, timezone
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+class AuctionImageORM(Base):
+    """
+    Metadatos de las imágenes de una subasta. El contenido está en el almacén de objetos,
+    con clave por SHA-256: varias filas pueden apuntar al mismo fichero.
+    """
+    __tablename__ = "auction_images"
+    __table_args__ = (
+        # Una misma imagen no se repite en una subasta. Sirve también de índice para listar por subasta
+        UniqueConstraint("auction_id", "sha256", name = "uq_auction_images_auction_sha256"),
+        # Deduplicado entre subastas (reutilizar la miniatura ya generada)
+        Index("ix_auction_images_sha256", "sha256"),
+    )
+
+    # No hace falta especificar el tipo GUID aqui, lo hereda del type_annotation_map
+    id: Mapped[UUID] = mapped_column(primary_key = True, default = uuid4)
+
+    sha256: Mapped[str] = mapped_column(String(64), nullable = False)
+    content_type: Mapped[str] = mapped_column(String(50), nullable = False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable = False)
+    original_key: Mapped[str] = mapped_column(String(255), nullable = False)
+
+    thumbnail_key: Mapped[Optional[str]] = mapped_column(String(255), nullable = True)
+    width: Mapped[Optional[int]] = mapped_column(Integer, nullable = True)
+    height: Mapped[Optional[int]] = mapped_column(Integer, nullable = True)
+
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+
+    # CLAVE FORÁNEA
+    auction_id: Mapped[UUID] = mapped_column(ForeignKey("auctions.id"), nullable = False)
+
+    # RELACIONES
+    # Solo en este sentido: así AuctionORM no depende de este modelo (los jobs que no lo importan siguen funcionando)
+    auction: Mapped["AuctionORM"] = relationship(AuctionORM)
@@ -1,8 +1,9 @@
 from app.domain.enums import AuctionState
 from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
 from datetime import datetime, timezone
 from decimal import Decimal
-from sqlalchemy import String, DateTime, Numeric, ForeignKey, Enum, Text
+from sqlalchemy import String, Numeric, ForeignKey, Enum, Text, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
@@ -17,6 +18,12 @@ if TYPE_CHECKING:
 
 class AuctionORM(Base):
     __tablename__ = "auctions"
+    __table_args__ = (
+        # Subastas activas por fecha de fin ("terminan pronto")
+        Index("ix_auctions_state_end_time", "state", "end_time"),
+        # Subastas de un vendedor (exportación). InnoDB ya indexa la FK, SQLite no: así es explícito en ambos
+        Index("ix_auctions_seller_id", "seller_id"),
+    )
 
     # No hace falta especificar el tipo GUID aqui, lo hereda del type_annotation_map
     id: Mapped[UUID] = mapped_column(primary_key = True, default = uuid4)
@@ -29,14 +36,19 @@ class AuctionORM(Base):
     current_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable = False)
 
     # La DB debe ser UTC
-    start_time: Mapped[datetime] = mapped_column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc))
-    end_time: Mapped[datetime] = mapped_column(DateTime(timezone = True), nullable = False)
+    start_time: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+    end_time: Mapped[datetime] = mapped_column(UTCDateTime, nullable = False)
 
     state: Mapped[AuctionState] = mapped_column(Enum(AuctionState), default = AuctionState.ACTIVE, nullable = False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc), onupdate = lambda: datetime.now(timezone.utc))
-    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone = True), nullable = True)
+    # Estadísticas desnormalizadas de las pujas activas (se reconstruyen con 'jobs/auction_stats.py')
+    bid_count: Mapped[int] = mapped_column(Integer, default = 0, server_default = "0", nullable = False)
+    bidder_count: Mapped[int] = mapped_column(Integer, default = 0, server_default = "0", nullable = False)
+    last_bid_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable = True)
+
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc), onupdate = lambda: datetime.now(timezone.utc))
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable = True)
 
     # CLAVE FORÁNEA
     seller_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable = False)
@@ -0,0 +1,35 @@
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
+from datetime import datetime, timezone
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+class AuthSessionORM(Base):
+    """
+    Sesiones de autenticación (una fila por login, se renueva en el sitio).
+
+    El refresh token lleva el ID de la sesión: renovar, revocar y comprobar una sesión
+    son accesos por clave primaria. Del token solo se guarda su SHA-256 (el vigente y el
+    anterior, para detectar reutilizaciones), nunca el token en claro.
+    """
+    __tablename__ = "auth_sessions"
+    __table_args__ = (
+        # Limpieza de sesiones caducadas
+        Index("ix_auth_sessions_expires_at", "expires_at"),
+    )
+
+    # No hace falta especificar el tipo GUID aqui, lo hereda del type_annotation_map
+    id: Mapped[UUID] = mapped_column(primary_key = True, default = uuid4)
+
+    token_hash: Mapped[str] = mapped_column(String(64), nullable = False)
+    previous_token_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable = True)
+
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+    expires_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable = False)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable = True)
+
+    # CLAVE FORÁNEA (con índice: sesiones de un usuario)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index = True, nullable = False)
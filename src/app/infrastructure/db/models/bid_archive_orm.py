@@ -0,0 +1,31 @@
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy import Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from uuid import UUID
+
+
+class BidArchiveORM(Base):
+    """
+    Histórico frío de pujas.
+
+    Guarda las pujas de subastas cerradas hace tiempo y las pujas borradas (soft delete),
+    para que la tabla 'bids' y sus índices solo contengan lo que se consulta a diario.
+    Mismas columnas que 'bids' (más 'archived_at') y sin claves foráneas: el archivo
+    no debe bloquear ni ralentizar las escrituras sobre las tablas calientes.
+    """
+    __tablename__ = "bids_archive"
+
+    id: Mapped[UUID] = mapped_column(primary_key = True)
+
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable = False)
+
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable = False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable = True)
+    archived_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+
+    auction_id: Mapped[UUID] = mapped_column(index = True, nullable = False)
+    bidder_id: Mapped[UUID] = mapped_column(nullable = False)
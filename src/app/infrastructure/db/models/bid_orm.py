@@ -1,7 +1,8 @@
 from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
 from datetime import datetime, timezone
 from decimal import Decimal
-from sqlalchemy import ForeignKey, DateTime, Numeric
+from sqlalchemy import ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
@@ -15,6 +16,12 @@ if TYPE_CHECKING:
 
 class BidORM(Base):
     __tablename__ = "bids"
+    __table_args__ = (
+        # Historial de una subasta, de la puja más alta a la más baja (se recorre el índice al revés)
+        Index("ix_bids_auction_id_amount", "auction_id", "amount"),
+        # Pujas de un usuario, por fecha
+        Index("ix_bids_bidder_id_created_at", "bidder_id", "created_at"),
+    )
 
     # No hace falta especificar el tipo GUID aqui, lo hereda del type_annotation_map
     id: Mapped[UUID] = mapped_column(primary_key = True, default = uuid4)
@@ -22,8 +29,8 @@ class BidORM(Base):
     # Numeric(12, 2) permite hasta 9.999.999.999'99 sin errores de redondeo
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable = False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc))
-    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone = True), nullable = True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable = True)
 
     # CLAVE FORÁNEA
     auction_id: Mapped[UUID] = mapped_column(ForeignKey("auctions.id"), nullable = False)
@@ -0,0 +1,28 @@
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid import UUID
+
+
+class OutboxORM(Base):
+    """
+    Bandeja de salida de eventos (transactional outbox).
+
+    Cada fila se inserta en la misma transacción que el cambio de estado que describe y
+    se borra cuando el relay la ha publicado: la tabla solo contiene lo pendiente.
+    El ID autoincremental da el orden de publicación.
+    """
+    __tablename__ = "outbox"
+    # Los IDs no se reutilizan tras borrar filas (los consumidores deduplican por ID)
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    # En SQLite solo INTEGER PRIMARY KEY es autoincremental
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key = True, autoincrement = True)
+
+    event_type: Mapped[str] = mapped_column(String(50), nullable = False)
+    aggregate_id: Mapped[UUID] = mapped_column(nullable = False)
+    payload: Mapped[str] = mapped_column(Text, nullable = False) # JSON
+
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
@@ -0,0 +1,16 @@
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class ReplicationHeartbeatORM(Base):
+    """
+    Latido de replicación (una sola fila).
+    La aplicación lo escribe en la primaria y lo lee en la réplica: la diferencia con la hora
+    actual es el retraso de la réplica, sin depender de 'SHOW REPLICA STATUS' ni de permisos extra.
+    """
+    __tablename__ = "replication_heartbeat"
+
+    id: Mapped[int] = mapped_column(primary_key = True)
+    beat_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable = False)
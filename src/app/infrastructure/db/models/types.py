@@ -1,6 +1,7 @@
 import uuid
 
-from sqlalchemy.types import TypeDecorator, CHAR
+from datetime import timezone
+from sqlalchemy.types import TypeDecorator, CHAR, DateTime
 
 class GUID(TypeDecorator):
     """
@@ -23,6 +24,30 @@ class GUID(TypeDecorator):
     def process_result_value(self, value, dialect):
         if value is None:
             return value
-        if isinstance(value, uuid.UUID):
+        if not isinstance(value, uuid.UUID):
             return uuid.UUID(value)
         return value
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    Fechas siempre en UTC.
+    MariaDB (DATETIME) y SQLite no guardan la zona horaria: se normaliza a UTC al escribir
+    y se marca como UTC al leer, para que el Dominio compare siempre fechas 'aware'.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo = None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        if value.tzinfo is None:
+            return value.replace(tzinfo = timezone.utc)
+        return value.astimezone(timezone.utc)
@@ -1,6 +1,7 @@
 from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import UTCDateTime
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean, DateTime
+from sqlalchemy import String, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
@@ -25,9 +26,9 @@ class UserORM(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default = True)
     is_superuser: Mapped[bool] = mapped_column(Boolean, default = False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone = True), default = lambda: datetime.now(timezone.utc), onupdate = lambda: datetime.now(timezone.utc))
-    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone = True), nullable = True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, default = lambda: datetime.now(timezone.utc), onupdate = lambda: datetime.now(timezone.utc))
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(UTCDateTime, nullable = True)
 
     # RELACIONES
     # 1. Subastas que realiza este usuario
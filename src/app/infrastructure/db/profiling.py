@@ -0,0 +1,77 @@
+import time
+
+from app.core.logging_setup import request_id_var
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Any, Optional
+
+
+@dataclass
+class QueryStats:
+    """Métricas de SQL acumuladas durante una petición."""
+    request_id: str
+    statements: int = 0
+    commits: int = 0 # Cada commit es un fsync del redo log en MariaDB (con la configuración por defecto)
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    slowest_parameters: Any = None
+    _started: list[float] = field(default_factory = list, repr = False)
+
+    def record(self, statement: str, parameters: Any, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+            self.slowest_parameters = parameters
+
+    def server_timing(self) -> str:
+        """Valor para la cabecera 'Server-Timing' (visible en las DevTools del navegador)."""
+        return f'db;dur={self.total_ms:.2f};desc="{self.statements} queries, {self.commits} commits"'
+
+
+# Registro de peticiones activas, indexado por el request_id de 'request_id_var'
+_active: dict[str, QueryStats] = {}
+
+
+def start_request(request_id: str) -> QueryStats:
+    stats = QueryStats(request_id = request_id)
+    _active[request_id] = stats
+    return stats
+
+
+def finish_request(request_id: str) -> QueryStats | None:
+    return _active.pop(request_id, None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _active.get(request_id_var.get())
+    if stats is not None:
+        stats._started.append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _active.get(request_id_var.get())
+    if stats is not None and stats._started:
+        elapsed_ms = (time.perf_counter() - stats._started.pop()) * 1000
+        stats.record(statement, parameters, elapsed_ms)
+
+
+def _commit(conn):
+    stats = _active.get(request_id_var.get())
+    if stats is not None:
+        stats.commits += 1
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """
+    Engancha los eventos del engine (síncrono) para medir cada sentencia y contar los commits.
+    Las sentencias ejecutadas fuera de una petición (scripts, jobs) se ignoran.
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "commit", _commit)
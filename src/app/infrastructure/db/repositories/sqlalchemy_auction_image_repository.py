@@ -0,0 +1,92 @@
+from app.application.ports.auction_image_repository import AuctionImageRepository
+from app.domain.exceptions import AuctionError
+from app.domain.models.auction_image import AuctionImage
+from app.infrastructure.db.models.auction_image_orm import AuctionImageORM
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from uuid import UUID
+
+
+class SQLAlchemyAuctionImageRepository(AuctionImageRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    # --- MAPPERS ---
+    def _to_orm(self, image: AuctionImage) -> AuctionImageORM:
+        """Dominio (@dataclass) -> BD (ORM)"""
+        return AuctionImageORM(
+            id = image.id,
+            auction_id = image.auction_id,
+            sha256 = image.sha256,
+            content_type = image.content_type,
+            size_bytes = image.size_bytes,
+            original_key = image.original_key,
+            thumbnail_key = image.thumbnail_key,
+            width = image.width,
+            height = image.height,
+            created_at = image.created_at
+        )
+
+
+    def _to_domain(self, image_orm: AuctionImageORM) -> AuctionImage:
+        """BD (ORM) -> Dominio (@dataclass)"""
+        return AuctionImage(
+            id = image_orm.id,
+            auction_id = image_orm.auction_id,
+            sha256 = image_orm.sha256,
+            content_type = image_orm.content_type,
+            size_bytes = image_orm.size_bytes,
+            original_key = image_orm.original_key,
+            thumbnail_key = image_orm.thumbnail_key,
+            width = image_orm.width,
+            height = image_orm.height,
+            created_at = image_orm.created_at
+        )
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, image: AuctionImage) -> AuctionImage:
+        try:
+            # Sin commit: lo confirma la unidad de trabajo del servicio. El flush adelanta los errores de integridad
+            self.session.add(self._to_orm(image))
+            await self.session.flush()
+
+        except IntegrityError:
+            raise AuctionError(f"No se pudo registrar la imagen: la subasta {image.auction_id} no existe o ya tiene esa imagen.")
+
+        return image
+
+
+    async def get_by_id(self, image_id: UUID) -> AuctionImage | None:
+        image_orm = await self.session.get(AuctionImageORM, image_id)
+        return self._to_domain(image_orm) if image_orm else None
+
+
+    async def get_by_auction_id(self, auction_id: UUID) -> list[AuctionImage]:
+        stmt = (
+            select(AuctionImageORM)
+            .where(AuctionImageORM.auction_id == auction_id)
+            .order_by(AuctionImageORM.created_at)
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_domain(i) for i in result.scalars().all()]
+
+
+    async def count_by_auction_id(self, auction_id: UUID) -> int:
+        stmt = select(func.count()).select_from(AuctionImageORM).where(AuctionImageORM.auction_id == auction_id)
+        return (await self.session.execute(stmt)).scalar_one()
+
+
+    async def find_by_sha256(self, sha256: str, auction_id: UUID | None = None) -> AuctionImage | None:
+        stmt = select(AuctionImageORM).where(AuctionImageORM.sha256 == sha256)
+        if auction_id is not None:
+            stmt = stmt.where(AuctionImageORM.auction_id == auction_id)
+        else:
+            # Mejor una que ya tenga miniatura
+            stmt = stmt.order_by(AuctionImageORM.thumbnail_key.is_(None))
+        result = await self.session.execute(stmt.limit(1))
+        image_orm = result.scalar_one_or_none()
+        return self._to_domain(image_orm) if image_orm else None
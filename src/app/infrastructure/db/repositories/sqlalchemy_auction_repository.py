@@ -1,24 +1,36 @@
+from app.domain.enums import AuctionState
 from app.domain.exceptions import AuctionCreationError
 from app.domain.models.auction import Auction, Bid
 from app.infrastructure.db.models.auction_orm import AuctionORM
 from app.infrastructure.db.models.bid_orm import BidORM
 from app.application.ports.auction_repository import AuctionRepository
+from datetime import datetime, timezone
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 
 class SQLAlchemyAuctionRepository(AuctionRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
+        # El identity map de la sesión guarda referencias débiles: sin esta referencia, la subasta leída
+        # se liberaría al pasarla a dominio y 'update' tendría que volver a consultarla
+        self._loaded: dict[UUID, AuctionORM] = {}
     
 
     # --- MAPPERS ---
     def _to_orm(self, auction: Auction) -> AuctionORM:
         """Dominio (@dataclass) -> BD (ORM)"""
-        return AuctionORM(
+        return AuctionORM(**self._to_row(auction))
+
+
+    def _to_row(self, auction: Auction) -> dict:
+        """Dominio (@dataclass) -> columnas, para inserciones en bloque sin pasar por objetos ORM"""
+        return dict(
             id = auction.id,
             title = auction.title,
             description = auction.description,
@@ -27,6 +39,9 @@ class SQLAlchemyAuctionRepository(AuctionRepository):
             start_time = auction.start_time,
             end_time = auction.end_time,
             state = auction.state,
+            bid_count = auction.bid_count,
+            bidder_count = auction.bidder_count,
+            last_bid_at = auction.last_bid_at,
             seller_id = auction.seller_id,
             created_at = auction.created_at,
             updated_at = auction.updated_at,
@@ -53,6 +68,9 @@ class SQLAlchemyAuctionRepository(AuctionRepository):
             seller_id = auction_orm.seller_id,
             winner_id = auction_orm.winner_id,
             bids = domain_bids,
+            bid_count = auction_orm.bid_count,
+            bidder_count = auction_orm.bidder_count,
+            last_bid_at = auction_orm.last_bid_at,
             created_at = auction_orm.created_at,
             updated_at = auction_orm.updated_at,
             deleted_at = auction_orm.deleted_at
@@ -66,7 +84,8 @@ class SQLAlchemyAuctionRepository(AuctionRepository):
             amount = bid_orm.amount,
             bidder_id = bid_orm.bidder_id,
             auction_id = bid_orm.auction_id,
-            created_at = bid_orm.created_at
+            created_at = bid_orm.created_at,
+            deleted_at = bid_orm.deleted_at
         )
     
     def _update_orm_from_domain(self, auction_orm: AuctionORM, auction: Auction) -> None:
@@ -77,6 +96,9 @@ class SQLAlchemyAuctionRepository(AuctionRepository):
         auction_orm.current_price = auction.current_price
         auction_orm.winner_id = auction.winner_id
         auction_orm.state = auction.state
+        auction_orm.bid_count = auction.bid_count
+        auction_orm.bidder_count = auction.bidder_count
+        auction_orm.last_bid_at = auction.last_bid_at
         auction_orm.updated_at = auction.updated_at
         auction_orm.deleted_at = auction.deleted_at
         # La lista 'bids' no la actualizamos aquí directamente para evitar complejidad excesiva con SQLAlchemy.
@@ -87,14 +109,42 @@ class SQLAlchemyAuctionRepository(AuctionRepository):
     async def create(self, auction: Auction) -> Auction:
         auction_orm = self._to_orm(auction)
         try:
+            # Sin commit: lo confirma la unidad de trabajo del servicio. El flush adelanta los errores de integridad
             self.session.add(auction_orm)
-            await self.session.commit()
+            await self.session.flush()
 
         except IntegrityError as e:
-            await self.session.rollback()
             raise AuctionCreationError(f"No se pudo crear la subasta. Verifica que el vendedor {auction.seller_id} exista.")
         
         return auction
+
+
+    async def create_many(self, auctions: list[Auction]) -> list[Auction]:
+        if not auctions:
+            return []
+        try:
+            # INSERT en bloque del ORM: una sentencia 'executemany', sin objetos en el identity map
+            await self.session.execute(insert(AuctionORM), [self._to_row(auction) for auction in auctions])
+
+        except IntegrityError as e:
+            raise AuctionCreationError("No se pudieron crear las subastas. Verifica que el vendedor exista y que no falten campos obligatorios.")
+
+        return auctions
+
+
+    async def stream(self, seller_id: Optional[UUID] = None, batch_size: int = 500) -> AsyncIterator[Auction]:
+        # Sin 'max_statement_time': la consulta sigue abierta mientras el cliente descarga la exportación
+        stmt = select(AuctionORM).execution_options(yield_per = batch_size, statement_timeout = 0)
+        if seller_id:
+            stmt = stmt.where(AuctionORM.seller_id == seller_id)
+
+        # 'stream' usa un cursor del servidor (SSCursor en MariaDB): las filas llegan por lotes
+        result = await self.session.stream_scalars(stmt)
+        try:
+            async for auction_orm in result:
+                yield self._to_domain(auction_orm)
+        finally:
+            await result.close()
     
 
     async def get_all(self) -> list[Auction]:
@@ -115,21 +165,81 @@ class SQLAlchemyAuctionRepository(AuctionRepository):
         )
         result = await self.session.execute(stmt)
         auction_orm = result.scalar_one_or_none()
-        return self._to_domain(auction_orm) if auction_orm else None
+        if not auction_orm:
+            return None
+        self._loaded[auction_orm.id] = auction_orm
+        return self._to_domain(auction_orm)
 
 
-    async def update(self, auction: Auction) -> Auction:
+    async def get_by_id_for_update(self, auction_id: UUID) -> Auction | None:
+        # El mismo SELECT ... FOR UPDATE que 'get_many_for_update', para una sola subasta
+        auctions = await self.get_many_for_update([auction_id])
+        return auctions[0] if auctions else None
+
+
+    async def get_by_ids(self, auction_ids: list[UUID]) -> list[Auction]:
+        if not auction_ids:
+            return []
         stmt = (
             select(AuctionORM)
-            .where(AuctionORM.id == auction.id)
+            .where(AuctionORM.id.in_(auction_ids))
         )
         result = await self.session.execute(stmt)
-        auction_orm = result.scalar_one_or_none()
+        return [self._to_domain(auction) for auction in result.scalars().all()]
+
+
+    async def get_many_for_update(self, auction_ids: list[UUID]) -> list[Auction]:
+        if not auction_ids:
+            return []
+        # Una consulta para las subastas (bloqueadas en orden de ID) y otra para todas sus pujas
+        stmt = (
+            select(AuctionORM)
+            .where(AuctionORM.id.in_(auction_ids))
+            .order_by(AuctionORM.id)
+            .options(selectinload(AuctionORM.bids))
+            .with_for_update()
+        )
+        result = await self.session.execute(stmt)
+        auctions_orm = result.scalars().all()
+        self._loaded.update((a.id, a) for a in auctions_orm)
+        return [self._to_domain(auction) for auction in auctions_orm]
+
+
+    async def get_ending_soon(self, limit: int) -> list[Auction]:
+        # Resuelto con el índice (state, end_time): lectura de 'limit' filas, sin ordenar la tabla
+        stmt = (
+            select(AuctionORM)
+            .where(AuctionORM.state == AuctionState.ACTIVE, AuctionORM.end_time > datetime.now(timezone.utc))
+            .order_by(AuctionORM.end_time)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [self._to_domain(auction) for auction in result.scalars().all()]
+
+
+    async def get_expired(self, limit: int) -> list[Auction]:
+        # Mismo índice (state, end_time), recorrido desde las más antiguas. Se bloquean para cerrarlas:
+        # con varios workers, cada uno se salta las filas que otro ya está cerrando (como el relay del outbox)
+        stmt = (
+            select(AuctionORM)
+            .where(AuctionORM.state == AuctionState.ACTIVE, AuctionORM.end_time <= datetime.now(timezone.utc))
+            .order_by(AuctionORM.end_time)
+            .limit(limit)
+            .with_for_update(skip_locked = True)
+        )
+        result = await self.session.execute(stmt)
+        auctions_orm = result.scalars().all()
+        self._loaded.update((a.id, a) for a in auctions_orm) # Se leen para cerrarlas
+        return [self._to_domain(auction) for auction in auctions_orm]
+
+
+    async def update(self, auction: Auction) -> Auction:
+        # La subasta casi siempre se ha leído antes en este repositorio: 'get' la toma del identity map sin consultar
+        auction_orm = await self.session.get(AuctionORM, auction.id)
 
         if not auction_orm:
             raise ValueError(f"Subasta {auction.id} no encontrada para actualizar.")
 
+        # Sin commit: el UPDATE se envía al confirmar la unidad de trabajo
         self._update_orm_from_domain(auction_orm, auction)
-
-        await self.session.commit()
         return auction
@@ -0,0 +1,106 @@
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.domain.models.auth_session import AuthSession
+from app.infrastructure.db.models.auth_session_orm import AuthSessionORM
+from datetime import datetime, timezone
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from uuid import UUID
+
+
+class SQLAlchemyAuthSessionRepository(AuthSessionRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    # --- MAPPERS ---
+    def _to_orm(self, auth_session: AuthSession) -> AuthSessionORM:
+        """Dominio (@dataclass) -> BD (ORM)"""
+        return AuthSessionORM(
+            id = auth_session.id,
+            user_id = auth_session.user_id,
+            token_hash = auth_session.token_hash,
+            previous_token_hash = auth_session.previous_token_hash,
+            created_at = auth_session.created_at,
+            expires_at = auth_session.expires_at,
+            revoked_at = auth_session.revoked_at
+        )
+
+
+    def _to_domain(self, session_orm: AuthSessionORM) -> AuthSession:
+        """BD (ORM) -> Dominio (@dataclass)"""
+        return AuthSession(
+            id = session_orm.id,
+            user_id = session_orm.user_id,
+            token_hash = session_orm.token_hash,
+            previous_token_hash = session_orm.previous_token_hash,
+            created_at = session_orm.created_at,
+            expires_at = session_orm.expires_at,
+            revoked_at = session_orm.revoked_at
+        )
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, auth_session: AuthSession) -> AuthSession:
+        # Sin commit: lo confirma la unidad de trabajo del servicio
+        self.session.add(self._to_orm(auth_session))
+        return auth_session
+
+
+    async def get_by_id(self, session_id: UUID) -> AuthSession | None:
+        session_orm = await self.session.get(AuthSessionORM, session_id)
+        return self._to_domain(session_orm) if session_orm else None
+
+
+    async def rotate(self, session_id: UUID, current_hash: str, new_hash: str) -> bool:
+        # UPDATE condicional sin leer antes la fila: el número de filas afectadas dice quién ha ganado
+        stmt = (
+            update(AuthSessionORM)
+            .where(
+                AuthSessionORM.id == session_id,
+                AuthSessionORM.token_hash == current_hash,
+                AuthSessionORM.revoked_at.is_(None)
+            )
+            .values(token_hash = new_hash, previous_token_hash = current_hash)
+            .execution_options(synchronize_session = False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount == 1
+
+
+    async def revoke(self, session_id: UUID) -> None:
+        stmt = (
+            update(AuthSessionORM)
+            .where(AuthSessionORM.id == session_id, AuthSessionORM.revoked_at.is_(None))
+            .values(revoked_at = datetime.now(timezone.utc))
+            .execution_options(synchronize_session = False)
+        )
+        await self.session.execute(stmt)
+
+
+    async def revoke_all_for_user(self, user_id: UUID) -> list[UUID]:
+        # Los IDs son para la caché de sesiones; el UPDATE va por 'user_id' y revoca también
+        # cualquier sesión creada entre las dos sentencias
+        ids = (await self.session.execute(
+            select(AuthSessionORM.id).where(AuthSessionORM.user_id == user_id, AuthSessionORM.revoked_at.is_(None))
+        )).scalars().all()
+        await self.session.execute(
+            update(AuthSessionORM)
+            .where(AuthSessionORM.user_id == user_id, AuthSessionORM.revoked_at.is_(None))
+            .values(revoked_at = datetime.now(timezone.utc))
+            .execution_options(synchronize_session = False)
+        )
+        return list(ids)
+
+
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        # Por lotes de IDs (MariaDB no admite LIMIT en un DELETE con subconsulta sobre la misma tabla)
+        ids = (await self.session.execute(
+            select(AuthSessionORM.id).where(AuthSessionORM.expires_at < before).limit(limit)
+        )).scalars().all()
+        if not ids:
+            return 0
+        await self.session.execute(
+            delete(AuthSessionORM).where(AuthSessionORM.id.in_(ids)).execution_options(synchronize_session = False)
+        )
+        return len(ids)
@@ -1,6 +1,7 @@
 from app.application.ports.bid_repository import BidRepository
 from app.domain.exceptions import AuctionError
 from app.domain.models.bid import Bid
+from app.infrastructure.db.models.bid_archive_orm import BidArchiveORM
 from app.infrastructure.db.models.bid_orm import BidORM
 from datetime import datetime, timezone
 from sqlalchemy.exc import IntegrityError
@@ -12,6 +13,8 @@ from uuid import UUID
 class SQLAlchemyBidRepository(BidRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
+        # Referencias fuertes a lo leído (el identity map de la sesión es débil), para que 'delete' no vuelva a consultar
+        self._loaded: dict[UUID, BidORM] = {}
     
 
     # --- MAPPERS ---
@@ -27,8 +30,8 @@ class SQLAlchemyBidRepository(BidRepository):
         )
     
 
-    def _to_domain(self, bid_orm: BidORM) -> Bid:
-        """BD (ORM) -> Dominio (@dataclass)"""
+    def _to_domain(self, bid_orm: BidORM | BidArchiveORM) -> Bid:
+        """BD (ORM, tabla caliente o archivo) -> Dominio (@dataclass)"""
         return Bid(
             id = bid_orm.id,
             amount = bid_orm.amount,
@@ -43,14 +46,28 @@ class SQLAlchemyBidRepository(BidRepository):
     async def create(self, bid: Bid) -> Bid:
         bid_orm = self._to_orm(bid)
         try:
+            # Sin commit: lo confirma la unidad de trabajo del servicio. El flush adelanta los errores de integridad
             self.session.add(bid_orm)
-            await self.session.commit()
+            await self.session.flush()
 
         except IntegrityError as e:
-            await self.session.rollback()
             raise AuctionError(f"No se pudo crear la puja. Verifica que la subasta {bid.auction_id} y el usuario {bid.bidder_id} existan.")
         
         return bid
+
+
+    async def create_many(self, bids: list[Bid]) -> list[Bid]:
+        if not bids:
+            return []
+        try:
+            # Un único flush: SQLAlchemy agrupa los INSERT en una sentencia 'executemany'
+            self.session.add_all([self._to_orm(bid) for bid in bids])
+            await self.session.flush()
+
+        except IntegrityError as e:
+            raise AuctionError("No se pudieron crear las pujas. Verifica que las subastas y el usuario existan.")
+
+        return bids
     
 
     async def get_by_id(self, bid_id: UUID) -> Bid | None:
@@ -60,6 +77,13 @@ class SQLAlchemyBidRepository(BidRepository):
         )
         result = await self.session.execute(stmt)
         bid_orm = result.scalar_one_or_none()
+        if bid_orm:
+            self._loaded[bid_orm.id] = bid_orm
+
+        # Si no está en la tabla caliente, puede haber sido archivada
+        if not bid_orm:
+            bid_orm = await self.session.get(BidArchiveORM, bid_id)
+
         return self._to_domain(bid_orm) if bid_orm else None
     
 
@@ -72,21 +96,25 @@ class SQLAlchemyBidRepository(BidRepository):
         result = await self.session.execute(stmt)
         bids_orm = result.scalars().all()
 
+        # Las subastas se archivan completas: si no quedan pujas en caliente, se leen del archivo
+        if not bids_orm:
+            stmt = (
+                select(BidArchiveORM)
+                .where(BidArchiveORM.auction_id == auction_id)
+                .order_by(BidArchiveORM.amount.desc())
+            )
+            result = await self.session.execute(stmt)
+            bids_orm = result.scalars().all()
+
         return [self._to_domain(b) for b in bids_orm]
 
 
     async def delete(self, bid_id: UUID) -> bool:
-        stmt = (
-            select(BidORM)
-            .where(BidORM.id == bid_id)
-        )
-        result = await self.session.execute(stmt)
-        bid_orm = result.scalar_one_or_none()
+        # Si la puja ya se leyó en esta sesión (p. ej. con su subasta), 'get' no consulta la BD
+        bid_orm = await self.session.get(BidORM, bid_id)
 
         if not bid_orm:
             return False
         
         bid_orm.deleted_at = datetime.now(timezone.utc)
-        
-        await self.session.commit()
         return True
@@ -0,0 +1,36 @@
+import dataclasses
+import json
+
+from app.application.ports.outbox_repository import OutboxRepository
+from app.domain.events import DomainEvent
+from app.infrastructure.db.models.outbox_orm import OutboxORM
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _json_default(value):
+    """UUID y Decimal como texto; fechas en ISO 8601."""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class SQLAlchemyOutboxRepository(OutboxRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    # --- MAPPERS ---
+    def _to_orm(self, event: DomainEvent) -> OutboxORM:
+        """Dominio (evento) -> BD (ORM). El payload es el evento completo en JSON."""
+        payload = dataclasses.asdict(event)
+        return OutboxORM(
+            event_type = event.name,
+            aggregate_id = event.aggregate_id,
+            payload = json.dumps(payload, default = _json_default),
+            created_at = event.occurred_at
+        )
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def add(self, event: DomainEvent) -> None:
+        # Sin commit: se confirma en la unidad de trabajo, junto con el cambio de estado que describe
+        self.session.add(self._to_orm(event))
@@ -12,6 +12,8 @@ from uuid import UUID
 class SQLAlchemyUserRepository(UserRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
+        # Referencias fuertes a lo leído (el identity map de la sesión es débil), para que 'update' no vuelva a consultar
+        self._loaded: dict[UUID, UserORM] = {}
 
 
     # --- MAPPERS ---
@@ -63,11 +65,11 @@ class SQLAlchemyUserRepository(UserRepository):
     async def create(self, user: User) -> User:
         user_orm = self._to_orm(user)
         try:
+            # Sin commit: lo confirma la unidad de trabajo del servicio. El flush adelanta los errores de integridad
             self.session.add(user_orm)
-            await self.session.commit()
+            await self.session.flush()
 
         except IntegrityError as e:
-            await self.session.rollback()
             raise UserAlreadyExistsError(f"El usuario introducido ya existe.")
         
         return user
@@ -80,7 +82,10 @@ class SQLAlchemyUserRepository(UserRepository):
         )
         result = await self.session.execute(stmt)
         user_orm = result.scalar_one_or_none()
-        return self._to_domain(user_orm) if user_orm else None
+        if not user_orm:
+            return None
+        self._loaded[user_orm.id] = user_orm
+        return self._to_domain(user_orm)
     
 
     async def get_by_email(self, email: str) -> User | None:
@@ -109,17 +114,11 @@ class SQLAlchemyUserRepository(UserRepository):
         
 
     async def update(self, user: User) -> User:
-        """Busca el usuario en la BD, actualiza sus campos y guarda."""
-        stmt = (
-            select(UserORM)
-            .where(UserORM.id == user.id)
-        )
-        result = await self.session.execute(stmt)
-        user_orm = result.scalar_one_or_none()
+        """Busca el usuario (en el identity map si ya se leyó en esta sesión) y actualiza sus campos, sin confirmar."""
+        user_orm = await self.session.get(UserORM, user.id)
 
         if not user_orm:
             raise ValueError(f"Usuario {user.id} no encontrado para actualizar.")
         
         self._update_orm_from_domain(user_orm, user)
-        await self.session.commit()
         return user
@@ -0,0 +1,158 @@
+"""
+Enrutado de lecturas entre la BD primaria y la réplica.
+
+Una lectura va a la réplica solo si:
+1. Hay réplica configurada ('DB_READ_URL').
+2. Su retraso medido es menor que 'DB_REPLICA_MAX_LAG_SECONDS'.
+3. El cliente no ha escrito en los últimos 'DB_READ_YOUR_WRITES_SECONDS' (read-your-writes:
+   quien acaba de pujar ve su puja aunque la réplica aún no la tenga).
+
+Las escrituras van siempre a la primaria. La marca de "acaba de escribir" no vive en el proceso
+sino en el cliente (cookie firmada): cualquier worker de 'serve.py' la reconoce, aunque la
+escritura la atendiera otro.
+"""
+import asyncio
+import hashlib
+import hmac
+import time
+
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.db.models.replication_heartbeat_orm import ReplicationHeartbeatORM
+from app.infrastructure.db.session import AsyncReadSessionLocal, AsyncSessionLocal
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Callable, Optional
+
+
+class ReadYourWritesMarker:
+    """
+    Marca "ha escrito hace poco" que guarda el cliente: '<caducidad>.<HMAC>', con la caducidad en
+    segundos Unix (reloj de pared, común a todos los workers). La firma impide fabricarla o alargarla.
+    """
+    def __init__(self, secret_key: str, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._key = hashlib.sha256(b"read-your-writes:" + secret_key.encode()).digest()
+
+
+    def _sign(self, expires: str) -> str:
+        return hmac.new(self._key, expires.encode(), hashlib.sha256).hexdigest()
+
+
+    def issue(self) -> str:
+        expires = str(int(self.clock() + self.ttl_seconds) + 1) # Redondeo hacia arriba: nunca antes de tiempo
+        return f"{expires}.{self._sign(expires)}"
+
+
+    def is_sticky(self, marker: Optional[str]) -> bool:
+        if not marker:
+            return False
+        expires, _, signature = marker.partition(".")
+        if not expires.isdigit() or not hmac.compare_digest(signature, self._sign(expires)):
+            return False
+        return int(expires) > self.clock()
+
+
+class ReplicaLagMonitor:
+    """
+    Mide periódicamente el retraso de la réplica con un latido: escribe la hora en la primaria
+    y la lee en la réplica. Si la réplica no responde, el retraso se considera infinito.
+    """
+    def __init__(
+        self,
+        primary_factory: async_sessionmaker[AsyncSession],
+        replica_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: float
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.interval_seconds = interval_seconds
+        self.lag_seconds: float = float("inf") # Hasta la primera medición no se usa la réplica
+        self.logger = get_logger("db")
+
+
+    async def beat(self) -> None:
+        async with self.primary_factory() as session:
+            await session.merge(ReplicationHeartbeatORM(id = 1, beat_at = datetime.now(timezone.utc)))
+            await session.commit()
+
+
+    async def measure(self) -> float:
+        try:
+            async with self.replica_factory() as session:
+                heartbeat = await session.get(ReplicationHeartbeatORM, 1)
+            lag = (datetime.now(timezone.utc) - heartbeat.beat_at).total_seconds() if heartbeat else float("inf")
+        except Exception as e:
+            self.logger.warning("No se pudo medir el retraso de la réplica: {}", e)
+            lag = float("inf")
+
+        self.lag_seconds = max(0.0, lag)
+        return self.lag_seconds
+
+
+    async def run(self) -> None:
+        """Tarea en segundo plano: latido + medición cada 'interval_seconds'."""
+        while True:
+            try:
+                await self.beat()
+            except Exception as e:
+                self.logger.error("Error escribiendo el latido de replicación: {}", e)
+            await self.measure()
+            await asyncio.sleep(self.interval_seconds)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary_factory: async_sessionmaker[AsyncSession],
+        replica_factory: async_sessionmaker[AsyncSession],
+        max_lag_seconds: float,
+        read_your_writes_seconds: float,
+        lag_check_seconds: float,
+        secret_key: str
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.has_replica = replica_factory is not primary_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.write_marker = ReadYourWritesMarker(secret_key, read_your_writes_seconds)
+        self.monitor = ReplicaLagMonitor(primary_factory, replica_factory, lag_check_seconds) if self.has_replica else None
+        self.stats = {"primary": 0, "replica": 0}
+
+
+    def mark_write(self) -> Optional[str]:
+        """Marca que debe guardar el cliente tras una escritura (None si no hay réplica)."""
+        return self.write_marker.issue() if self.has_replica else None
+
+
+    def use_replica(self, marker: Optional[str]) -> bool:
+        if not self.has_replica:
+            return False
+        if self.write_marker.is_sticky(marker):
+            return False
+        return self.monitor.lag_seconds <= self.max_lag_seconds
+
+
+    def route(self, marker: Optional[str]) -> bool:
+        """Decide el destino de una lectura (True = réplica) según la marca del cliente, y lo contabiliza."""
+        use_replica = self.use_replica(marker)
+        self.stats["replica" if use_replica else "primary"] += 1
+        return use_replica
+
+
+def build_replica_router() -> ReplicaRouter:
+    # Sin réplica, ambas factorías son la misma y todo va a la primaria
+    replica_factory = AsyncReadSessionLocal if settings.DB_READ_URL else AsyncSessionLocal
+    return ReplicaRouter(
+        AsyncSessionLocal,
+        replica_factory,
+        max_lag_seconds = settings.DB_REPLICA_MAX_LAG_SECONDS,
+        read_your_writes_seconds = settings.DB_READ_YOUR_WRITES_SECONDS,
+        lag_check_seconds = settings.DB_REPLICA_LAG_CHECK_SECONDS,
+        secret_key = settings.SECRET_KEY
+    )
+
+
+# Instancia única por proceso
+replica_router = build_replica_router()
@@ -1,14 +1,55 @@
 from app.core.config import settings
+from app.infrastructure.db.profiling import install_query_profiler
+from app.infrastructure.db.statement_timeout import install_statement_timeout
+from app.infrastructure.observability.tracing import install_sql_tracing
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from typing import AsyncGenerator
 
 
+def pool_options(url: str) -> dict:
+    """
+    Tamaño del pool de cada proceso: el presupuesto total de conexiones entre el nº de workers,
+    para que N workers no abran N veces 'DB_POOL_SIZE' conexiones contra MariaDB.
+    SQLite (benchmarks) usa su pool por defecto.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE_PER_WORKER,
+        "max_overflow": settings.DB_MAX_OVERFLOW_PER_WORKER,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS
+    }
+
+
 engine = create_async_engine(
     settings.DATABASE_URL, 
-    echo = False
+    echo = False,
+    **pool_options(settings.DATABASE_URL)
 )
 
+# Réplica de solo lectura: si no está configurada, las lecturas usan el engine principal
+read_engine = create_async_engine(settings.DB_READ_URL, echo = False, **pool_options(settings.DB_READ_URL)) if settings.DB_READ_URL else engine
+
+# Tiempo máximo por sentencia (solo MariaDB): una consulta atascada no retiene su conexión indefinidamente
+if settings.DB_STATEMENT_TIMEOUT_SECONDS > 0:
+    install_statement_timeout(engine.sync_engine, settings.DB_STATEMENT_TIMEOUT_SECONDS)
+    if read_engine is not engine:
+        install_statement_timeout(read_engine.sync_engine, settings.DB_STATEMENT_TIMEOUT_SECONDS)
+
+# Perfilado de SQL por petición (solo si se activa en la configuración)
+if settings.DB_PROFILING:
+    install_query_profiler(engine.sync_engine)
+    if read_engine is not engine:
+        install_query_profiler(read_engine.sync_engine)
+
+# Un span por sentencia en las peticiones muestreadas (solo si las trazas están activas)
+if settings.TRACING_ENABLED:
+    install_sql_tracing(engine.sync_engine)
+    if read_engine is not engine:
+        install_sql_tracing(read_engine.sync_engine)
+
 AsyncSessionLocal = async_sessionmaker(bind = engine, class_ = AsyncSession, expire_on_commit = False)
+AsyncReadSessionLocal = async_sessionmaker(bind = read_engine, class_ = AsyncSession, expire_on_commit = False)
 
 
 async def get_db() -> AsyncGenerator[AsyncGenerator, None]:
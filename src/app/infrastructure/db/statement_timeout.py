@@ -0,0 +1,41 @@
+"""
+Tiempo máximo por sentencia en MariaDB ('max_statement_time').
+
+Se fija en la sesión al abrir cada conexión del pool (una vez por conexión, no por consulta):
+una sentencia que supera el tiempo se corta en el servidor con el error 1969 y su conexión
+vuelve al pool, en lugar de quedarse ocupada mientras las peticiones esperan detrás.
+
+Una sentencia concreta puede pedir otro límite con la opción de ejecución 'statement_timeout'
+(segundos, 0 = sin límite), p. ej. la exportación en streaming, cuya consulta dura lo que
+tarda el cliente en descargar el fichero:
+
+    select(...).execution_options(statement_timeout = 0)
+
+En MySQL se usa 'max_execution_time' (solo afecta a los SELECT) y no hay límite por sentencia.
+En otros motores (SQLite) no hace nada.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def install_statement_timeout(engine: Engine, seconds: float) -> None:
+    if engine.dialect.name not in ("mysql", "mariadb"):
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_session_timeout(dbapi_connection, connection_record):
+        # 'first_connect' (que detecta si es MariaDB) ya se ha ejecutado al llegar aquí
+        if engine.dialect.is_mariadb:
+            statement = f"SET SESSION max_statement_time = {seconds:g}"
+        else:
+            statement = f"SET SESSION max_execution_time = {int(seconds * 1000)}"
+        cursor = dbapi_connection.cursor()
+        cursor.execute(statement)
+        cursor.close()
+
+    @event.listens_for(engine, "before_cursor_execute", retval = True)
+    def override_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+        timeout = context.execution_options.get("statement_timeout") if context is not None else None
+        if timeout is not None and engine.dialect.is_mariadb:
+            statement = f"SET STATEMENT max_statement_time = {timeout:g} FOR {statement}"
+        return statement, parameters
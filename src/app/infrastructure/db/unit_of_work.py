@@ -0,0 +1,20 @@
+from app.application.ports.unit_of_work import UnitOfWork
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """
+    Transacción sobre la sesión de la petición, la misma que usan todos sus repositorios.
+    Los repositorios hacen como mucho 'flush' (para detectar errores de integridad en el momento);
+    el único 'commit' lo hace el servicio al final del caso de uso.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -0,0 +1,46 @@
+import inspect
+
+from app.application.ports.event_publisher import EventPublisher
+from app.core.logging_setup import get_logger
+from app.domain.events import DomainEvent
+from typing import Awaitable, Callable
+
+
+Handler = Callable[[DomainEvent], None | Awaitable[None]]
+
+
+class InProcessEventBus(EventPublisher):
+    """
+    Bus de eventos en memoria (un proceso, sin persistencia).
+
+    Los suscriptores se ejecutan en la misma tarea que publica, así que deben ser baratos
+    (contadores, encolar trabajo). Un fallo en un suscriptor se registra y no se propaga:
+    cuando se publica, la operación de negocio ya está persistida.
+    """
+    def __init__(self):
+        self._handlers: dict[type[DomainEvent], list[Handler]] = {}
+        self.logger = get_logger("system")
+
+
+    def subscribe(self, event_type: type[DomainEvent], handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+
+    def unsubscribe(self, event_type: type[DomainEvent], handler: Handler) -> None:
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+
+    async def publish(self, event: DomainEvent) -> None:
+        for handler in self._handlers.get(type(event), ()):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.logger.error("Error en el suscriptor {} de {}: {}", handler, type(event).__name__, e)
+
+
+# Instancia única por proceso
+event_bus = InProcessEventBus()
@@ -0,0 +1,42 @@
+import asyncio
+import json
+import os
+
+from app.application.ports.event_sink import EventSink
+from pathlib import Path
+from typing import Any
+
+
+class NdjsonFileSink(EventSink):
+    """
+    Destino local por defecto: un mensaje JSON por línea, en modo 'append'.
+
+    Con 'fsync' activado el lote está en disco antes de que el relay lo borre del outbox,
+    así que una caída nunca pierde eventos (como mucho los duplica).
+    La escritura se hace en un hilo para no bloquear el event loop.
+    """
+    def __init__(self, path: str | Path, fsync: bool = True):
+        self.path = Path(path)
+        self.fsync = fsync
+        self._file = None
+
+
+    def _write(self, lines: str) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents = True, exist_ok = True)
+            self._file = open(self.path, "a", encoding = "utf-8")
+        self._file.write(lines)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+
+    async def publish(self, messages: list[dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(m, default = str) + "\n" for m in messages)
+        await asyncio.to_thread(self._write, lines)
+
+
+    async def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
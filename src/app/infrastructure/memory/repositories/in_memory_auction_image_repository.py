@@ -0,0 +1,53 @@
+import copy
+
+from app.application.ports.auction_image_repository import AuctionImageRepository
+from app.domain.exceptions import AuctionError
+from app.domain.models.auction_image import AuctionImage
+from app.infrastructure.memory.store import InMemoryStore
+from uuid import UUID
+
+
+class InMemoryAuctionImageRepository(AuctionImageRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, image: AuctionImage) -> AuctionImage:
+        with self.store.lock:
+            # Equivalente a la clave foránea y a la restricción única (auction_id, sha256)
+            images = self.store.images_by_auction.get(image.auction_id, [])
+            if image.auction_id not in self.store.auctions or any(i.sha256 == image.sha256 for i in images):
+                raise AuctionError(f"No se pudo registrar la imagen: la subasta {image.auction_id} no existe o ya tiene esa imagen.")
+
+            image_copy = copy.copy(image)
+            self.store.images[image.id] = image_copy
+            self.store.images_by_auction.setdefault(image.auction_id, []).append(image_copy)
+        return image
+
+
+    async def get_by_id(self, image_id: UUID) -> AuctionImage | None:
+        with self.store.lock:
+            image = self.store.images.get(image_id)
+            return copy.copy(image) if image else None
+
+
+    async def get_by_auction_id(self, auction_id: UUID) -> list[AuctionImage]:
+        with self.store.lock:
+            return [copy.copy(i) for i in self.store.images_by_auction.get(auction_id, [])]
+
+
+    async def count_by_auction_id(self, auction_id: UUID) -> int:
+        with self.store.lock:
+            return len(self.store.images_by_auction.get(auction_id, []))
+
+
+    async def find_by_sha256(self, sha256: str, auction_id: UUID | None = None) -> AuctionImage | None:
+        with self.store.lock:
+            if auction_id is not None:
+                candidates = self.store.images_by_auction.get(auction_id, [])
+            else:
+                candidates = self.store.images.values()
+            matches = [i for i in candidates if i.sha256 == sha256]
+            matches.sort(key = lambda i: i.thumbnail_key is None)
+            return copy.copy(matches[0]) if matches else None
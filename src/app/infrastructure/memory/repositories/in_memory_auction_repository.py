@@ -0,0 +1,104 @@
+import heapq
+
+from app.application.ports.auction_repository import AuctionRepository
+from app.domain.enums import AuctionState
+from app.domain.exceptions import AuctionCreationError
+from app.domain.models.auction import Auction
+from app.infrastructure.memory.store import InMemoryStore
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+
+class InMemoryAuctionRepository(AuctionRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, auction: Auction) -> Auction:
+        with self.store.lock:
+            # Equivalente a la clave foránea seller_id -> users.id
+            if auction.seller_id not in self.store.users:
+                raise AuctionCreationError(f"No se pudo crear la subasta. Verifica que el vendedor {auction.seller_id} exista.")
+            self.store.auctions[auction.id] = self.store.copy_auction(auction)
+        return auction
+
+
+    async def create_many(self, auctions: list[Auction]) -> list[Auction]:
+        with self.store.lock:
+            # Todas o ninguna, como el INSERT en bloque
+            if any(a.seller_id not in self.store.users for a in auctions):
+                raise AuctionCreationError("No se pudieron crear las subastas. Verifica que el vendedor exista.")
+            for auction in auctions:
+                self.store.auctions[auction.id] = self.store.copy_auction(auction)
+        return auctions
+
+
+    async def stream(self, seller_id: Optional[UUID] = None, batch_size: int = 500) -> AsyncIterator[Auction]:
+        # Solo se copian los IDs de golpe; las subastas se copian por lotes (como un cursor)
+        with self.store.lock:
+            auction_ids = list(self.store.auctions)
+
+        for start in range(0, len(auction_ids), batch_size):
+            with self.store.lock:
+                batch = [self.store.auctions.get(i) for i in auction_ids[start:start + batch_size]]
+                batch = [self.store.copy_auction(a) for a in batch if a and (not seller_id or a.seller_id == seller_id)]
+            for auction in batch:
+                yield auction
+
+
+    async def get_all(self) -> list[Auction]:
+        with self.store.lock:
+            return [self.store.copy_auction(a) for a in self.store.auctions.values()]
+
+
+    async def get_by_id(self, auction_id: UUID) -> Auction | None:
+        # Como 'selectinload': la subasta se devuelve con sus pujas cargadas
+        with self.store.lock:
+            auction = self.store.auctions.get(auction_id)
+            if not auction:
+                return None
+            return self.store.copy_auction(auction, self.store.bids_by_auction.get(auction_id, []))
+
+
+    async def get_by_id_for_update(self, auction_id: UUID) -> Auction | None:
+        # Sin bloqueo de filas, como 'get_many_for_update'
+        return await self.get_by_id(auction_id)
+
+
+    async def get_by_ids(self, auction_ids: list[UUID]) -> list[Auction]:
+        with self.store.lock:
+            return [self.store.copy_auction(self.store.auctions[i]) for i in auction_ids if i in self.store.auctions]
+
+
+    async def get_many_for_update(self, auction_ids: list[UUID]) -> list[Auction]:
+        # Sin bloqueo de filas: cada operación del almacén ya es una sección crítica
+        with self.store.lock:
+            return [
+                self.store.copy_auction(self.store.auctions[i], self.store.bids_by_auction.get(i, []))
+                for i in sorted(auction_ids) if i in self.store.auctions
+            ]
+
+
+    async def get_ending_soon(self, limit: int) -> list[Auction]:
+        now = datetime.now(timezone.utc)
+        with self.store.lock:
+            active = (a for a in self.store.auctions.values() if a.state == AuctionState.ACTIVE and a.end_time > now)
+            return [self.store.copy_auction(a) for a in heapq.nsmallest(limit, active, key = lambda a: a.end_time)]
+
+
+    async def get_expired(self, limit: int) -> list[Auction]:
+        now = datetime.now(timezone.utc)
+        with self.store.lock:
+            expired = (a for a in self.store.auctions.values() if a.state == AuctionState.ACTIVE and a.end_time <= now)
+            return [self.store.copy_auction(a) for a in heapq.nsmallest(limit, expired, key = lambda a: a.end_time)]
+
+
+    async def update(self, auction: Auction) -> Auction:
+        with self.store.lock:
+            if auction.id not in self.store.auctions:
+                raise ValueError(f"Subasta {auction.id} no encontrada para actualizar.")
+            # Las pujas se persisten a través de BidRepository, igual que con SQLAlchemy
+            self.store.auctions[auction.id] = self.store.copy_auction(auction)
+        return auction
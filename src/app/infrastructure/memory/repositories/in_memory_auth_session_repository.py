@@ -0,0 +1,58 @@
+import copy
+
+from app.application.ports.auth_session_repository import AuthSessionRepository
+from app.domain.models.auth_session import AuthSession
+from app.infrastructure.memory.store import InMemoryStore
+from datetime import datetime
+from uuid import UUID
+
+
+class InMemoryAuthSessionRepository(AuthSessionRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, auth_session: AuthSession) -> AuthSession:
+        with self.store.lock:
+            self.store.auth_sessions[auth_session.id] = copy.copy(auth_session)
+        return auth_session
+
+
+    async def get_by_id(self, session_id: UUID) -> AuthSession | None:
+        with self.store.lock:
+            auth_session = self.store.auth_sessions.get(session_id)
+            return copy.copy(auth_session) if auth_session else None
+
+
+    async def rotate(self, session_id: UUID, current_hash: str, new_hash: str) -> bool:
+        with self.store.lock:
+            auth_session = self.store.auth_sessions.get(session_id)
+            if not auth_session or auth_session.revoked_at is not None or auth_session.token_hash != current_hash:
+                return False
+            auth_session.previous_token_hash = current_hash
+            auth_session.token_hash = new_hash
+            return True
+
+
+    async def revoke(self, session_id: UUID) -> None:
+        with self.store.lock:
+            auth_session = self.store.auth_sessions.get(session_id)
+            if auth_session:
+                auth_session.revoke()
+
+
+    async def revoke_all_for_user(self, user_id: UUID) -> list[UUID]:
+        with self.store.lock:
+            revoked = [s for s in self.store.auth_sessions.values() if s.user_id == user_id and s.revoked_at is None]
+            for auth_session in revoked:
+                auth_session.revoke()
+            return [s.id for s in revoked]
+
+
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        with self.store.lock:
+            expired = [s.id for s in self.store.auth_sessions.values() if s.expires_at < before][:limit]
+            for session_id in expired:
+                del self.store.auth_sessions[session_id]
+            return len(expired)
@@ -0,0 +1,60 @@
+from app.application.ports.bid_repository import BidRepository
+from app.domain.exceptions import AuctionError
+from app.domain.models.bid import Bid
+from app.infrastructure.memory.store import InMemoryStore
+from datetime import datetime, timezone
+from uuid import UUID
+
+
+class InMemoryBidRepository(BidRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, bid: Bid) -> Bid:
+        with self.store.lock:
+            # Equivalente a las claves foráneas auction_id y bidder_id
+            if bid.auction_id not in self.store.auctions or bid.bidder_id not in self.store.users:
+                raise AuctionError(f"No se pudo crear la puja. Verifica que la subasta {bid.auction_id} y el usuario {bid.bidder_id} existan.")
+
+            bid_copy = self.store.copy_bid(bid)
+            bid_copy.deleted_at = None # Las pujas nuevas nacen vivas
+            self.store.bids[bid.id] = bid_copy
+            self.store.index_bid(bid_copy)
+        return bid
+
+
+    async def create_many(self, bids: list[Bid]) -> list[Bid]:
+        with self.store.lock:
+            # Todas o ninguna, como el flush de SQLAlchemy
+            if any(b.auction_id not in self.store.auctions or b.bidder_id not in self.store.users for b in bids):
+                raise AuctionError("No se pudieron crear las pujas. Verifica que las subastas y el usuario existan.")
+
+            for bid in bids:
+                bid_copy = self.store.copy_bid(bid)
+                bid_copy.deleted_at = None
+                self.store.bids[bid.id] = bid_copy
+                self.store.index_bid(bid_copy)
+        return bids
+
+
+    async def get_by_id(self, bid_id: UUID) -> Bid | None:
+        with self.store.lock:
+            bid = self.store.bids.get(bid_id)
+            return self.store.copy_bid(bid) if bid else None
+
+
+    async def get_by_auction_id(self, auction_id: UUID) -> list[Bid]:
+        with self.store.lock:
+            return [self.store.copy_bid(b) for b in self.store.auction_bids_desc(auction_id)]
+
+
+    async def delete(self, bid_id: UUID) -> bool:
+        with self.store.lock:
+            bid = self.store.bids.get(bid_id)
+            if not bid:
+                return False
+            # El objeto indexado es el mismo: el borrado lógico se ve también desde la subasta
+            bid.deleted_at = datetime.now(timezone.utc)
+        return True
@@ -0,0 +1,15 @@
+from app.application.ports.outbox_repository import OutboxRepository
+from app.domain.events import DomainEvent
+from app.infrastructure.memory.store import InMemoryStore
+
+
+class InMemoryOutboxRepository(OutboxRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def add(self, event: DomainEvent) -> None:
+        # Sin relay: los eventos se conservan (acotados) solo para inspección en pruebas y benchmarks
+        with self.store.lock:
+            self.store.outbox.append(event)
@@ -0,0 +1,64 @@
+from app.application.ports.user_repository import UserRepository
+from app.domain.exceptions import UserAlreadyExistsError
+from app.domain.models.user import User
+from app.infrastructure.memory.store import InMemoryStore
+from uuid import UUID
+
+
+class InMemoryUserRepository(UserRepository):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+
+    def _get(self, user_id: UUID | None) -> User | None:
+        user = self.store.users.get(user_id) if user_id else None
+        return self.store.copy_user(user) if user else None
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def create(self, user: User) -> User:
+        with self.store.lock:
+            # Equivalente a los índices únicos de email y username
+            if user.email in self.store.user_ids_by_email or user.username in self.store.user_ids_by_username:
+                raise UserAlreadyExistsError("El usuario introducido ya existe.")
+
+            self.store.users[user.id] = self.store.copy_user(user)
+            self.store.user_ids_by_email[user.email] = user.id
+            self.store.user_ids_by_username[user.username] = user.id
+        return user
+
+
+    async def get_by_id(self, user_id: UUID) -> User | None:
+        with self.store.lock:
+            return self._get(user_id)
+
+
+    async def get_by_email(self, email: str) -> User | None:
+        with self.store.lock:
+            return self._get(self.store.user_ids_by_email.get(email))
+
+
+    async def get_by_identifier(self, identifier: str) -> User | None:
+        with self.store.lock:
+            user_id = self.store.user_ids_by_email.get(identifier) or self.store.user_ids_by_username.get(identifier)
+            return self._get(user_id)
+
+
+    async def update(self, user: User) -> User:
+        with self.store.lock:
+            current = self.store.users.get(user.id)
+            if not current:
+                raise ValueError(f"Usuario {user.id} no encontrado para actualizar.")
+
+            # Mantener los índices secundarios si cambian email o username
+            taken_email = self.store.user_ids_by_email.get(user.email, user.id) != user.id
+            taken_username = self.store.user_ids_by_username.get(user.username, user.id) != user.id
+            if taken_email or taken_username:
+                raise UserAlreadyExistsError("El usuario introducido ya existe.")
+
+            del self.store.user_ids_by_email[current.email]
+            del self.store.user_ids_by_username[current.username]
+            self.store.user_ids_by_email[user.email] = user.id
+            self.store.user_ids_by_username[user.username] = user.id
+            self.store.users[user.id] = self.store.copy_user(user)
+        return user
@@ -0,0 +1,97 @@
+import bisect
+import copy
+import threading
+
+from app.domain.events import DomainEvent
+from app.domain.models.auction import Auction
+from app.domain.models.auction_image import AuctionImage
+from app.domain.models.auth_session import AuthSession
+from app.domain.models.bid import Bid
+from app.domain.models.user import User
+from collections import deque
+from uuid import UUID
+
+
+OUTBOX_MAX_EVENTS = 10_000
+
+
+class InMemoryStore:
+    """
+    Almacén en memoria compartido por los repositorios 'InMemory*'.
+
+    Sustituye a la base de datos en benchmarks y pruebas rápidas. Mantiene índices equivalentes
+    a los de MariaDB:
+    - Diccionarios por ID para usuarios, subastas y pujas.
+    - Mapas secundarios email -> ID y username -> ID (únicos, como en UserORM).
+    - Lista de pujas por subasta ordenada por importe (lo que devuelve 'get_by_auction_id').
+    - Metadatos de imágenes por ID y por subasta, en orden de subida.
+    - Bandeja de salida de eventos, acotada a los 'OUTBOX_MAX_EVENTS' más recientes.
+    - Sesiones de autenticación por ID (como la clave primaria de 'auth_sessions').
+
+    Todas las operaciones son secciones críticas cortas (sin 'await' dentro), protegidas por un
+    RLock: son seguras tanto entre tareas asyncio como entre hilos.
+    Los objetos se copian al entrar y al salir, igual que al pasar por el ORM, para que una
+    entidad modificada en el servicio no cambie el almacén hasta que se llame a 'update'.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+
+        self.users: dict[UUID, User] = {}
+        self.user_ids_by_email: dict[str, UUID] = {}
+        self.user_ids_by_username: dict[str, UUID] = {}
+
+        self.auctions: dict[UUID, Auction] = {}
+
+        self.bids: dict[UUID, Bid] = {}
+        self.bids_by_auction: dict[UUID, list[Bid]] = {} # Orden ascendente por importe
+
+        self.images: dict[UUID, AuctionImage] = {}
+        self.images_by_auction: dict[UUID, list[AuctionImage]] = {}
+
+        self.outbox: deque[DomainEvent] = deque(maxlen = OUTBOX_MAX_EVENTS)
+
+        self.auth_sessions: dict[UUID, AuthSession] = {}
+
+
+    # --- COPIAS ---
+    @staticmethod
+    def copy_user(user: User) -> User:
+        return copy.copy(user)
+
+    @staticmethod
+    def copy_bid(bid: Bid) -> Bid:
+        return copy.copy(bid)
+
+    @staticmethod
+    def copy_auction(auction: Auction, with_bids: list[Bid] | None = None) -> Auction:
+        auction_copy = copy.copy(auction)
+        auction_copy.bids = [copy.copy(b) for b in with_bids] if with_bids is not None else []
+        return auction_copy
+
+
+    # --- ÍNDICE DE PUJAS ---
+    def index_bid(self, bid: Bid) -> None:
+        bids = self.bids_by_auction.setdefault(bid.auction_id, [])
+        bisect.insort(bids, bid, key = lambda b: b.amount)
+
+    def auction_bids_desc(self, auction_id: UUID) -> list[Bid]:
+        """Pujas de una subasta, la más alta primero (como 'ORDER BY amount DESC')."""
+        return self.bids_by_auction.get(auction_id, [])[::-1]
+
+
+    def clear(self) -> None:
+        with self.lock:
+            self.users.clear()
+            self.user_ids_by_email.clear()
+            self.user_ids_by_username.clear()
+            self.auctions.clear()
+            self.bids.clear()
+            self.bids_by_auction.clear()
+            self.images.clear()
+            self.images_by_auction.clear()
+            self.outbox.clear()
+            self.auth_sessions.clear()
+
+
+# Instancia única por proceso (equivalente al 'engine' de la BD)
+memory_store = InMemoryStore()
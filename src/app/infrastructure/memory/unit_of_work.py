@@ -0,0 +1,17 @@
+from app.application.ports.unit_of_work import UnitOfWork
+
+
+class InMemoryUnitOfWork(UnitOfWork):
+    """
+    Transacción de los repositorios en memoria: cada escritura se aplica al almacén en el momento,
+    así que no hay nada que confirmar ni que deshacer. Los servicios validan antes de escribir,
+    por lo que un caso de uso que falla no llega a dejar cambios a medias.
+    """
+
+
+    async def commit(self) -> None:
+        pass
+
+
+    async def rollback(self) -> None:
+        pass
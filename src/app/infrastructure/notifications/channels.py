@@ -0,0 +1,71 @@
+import asyncio
+import dataclasses
+import json
+import random
+
+from app.application.ports.notification_channel import NotificationChannel, OutbidNotification
+from datetime import datetime
+from pathlib import Path
+
+
+class LogNotificationChannel(NotificationChannel):
+    """Escribe cada aviso en el log del módulo 'notifications' (sustituto local del email/push)."""
+    def __init__(self, logger):
+        self.logger = logger
+
+
+    async def send(self, notification: OutbidNotification) -> None:
+        self.logger.info(
+            "Aviso a {}: superado {} vez/veces en la subasta {} (precio actual {})",
+            notification.user_id, notification.times_outbid, notification.auction_id, notification.current_price
+        )
+
+
+class FileNotificationChannel(NotificationChannel):
+    """Añade cada aviso como una línea JSON a un fichero (la escritura va en un hilo)."""
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = None
+
+
+    def _write(self, line: str) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents = True, exist_ok = True)
+            self._file = open(self.path, "a", encoding = "utf-8")
+        self._file.write(line)
+        self._file.flush()
+
+
+    async def send(self, notification: OutbidNotification) -> None:
+        line = json.dumps(
+            dataclasses.asdict(notification),
+            default = lambda v: v.isoformat() if isinstance(v, datetime) else str(v)
+        ) + "\n"
+        await asyncio.to_thread(self._write, line)
+
+
+    async def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MockWebhookChannel(NotificationChannel):
+    """
+    Simula un webhook externo: latencia configurable y una tasa de fallos opcional.
+    Guarda los últimos avisos "recibidos" para inspección en pruebas y benchmarks.
+    """
+    def __init__(self, latency_ms: float = 50.0, failure_rate: float = 0.0, keep_last: int = 1000):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.received: list[OutbidNotification] = []
+        self.keep_last = keep_last
+
+
+    async def send(self, notification: OutbidNotification) -> None:
+        await asyncio.sleep(self.latency_ms / 1000)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError("Webhook simulado: error 503")
+        self.received.append(notification)
+        if len(self.received) > self.keep_last:
+            del self.received[:len(self.received) - self.keep_last]
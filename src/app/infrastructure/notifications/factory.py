@@ -0,0 +1,31 @@
+from app.application.ports.notification_channel import NotificationChannel
+from app.application.services.notification_service import OutbidNotifier
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.notifications.channels import FileNotificationChannel, LogNotificationChannel, MockWebhookChannel
+
+
+def build_channels(names: str) -> list[NotificationChannel]:
+    """Crea los canales a partir de 'NOTIFICATION_CHANNELS' (p. ej. "log,file")."""
+    factories = {
+        "log": lambda: LogNotificationChannel(get_logger("notifications")),
+        "file": lambda: FileNotificationChannel(settings.NOTIFICATION_FILE_PATH),
+        "webhook": lambda: MockWebhookChannel(settings.NOTIFICATION_WEBHOOK_LATENCY_MS),
+    }
+    channels = []
+    for name in (n.strip() for n in names.split(",") if n.strip()):
+        if name not in factories:
+            raise ValueError(f"Canal de notificación desconocido: '{name}' (disponibles: {', '.join(factories)})")
+        channels.append(factories[name]())
+    return channels
+
+
+def build_outbid_notifier() -> OutbidNotifier:
+    return OutbidNotifier(
+        channels = build_channels(settings.NOTIFICATION_CHANNELS),
+        logger = get_logger("notifications"),
+        queue_size = settings.NOTIFICATION_QUEUE_SIZE,
+        coalesce_seconds = settings.NOTIFICATION_COALESCE_SECONDS,
+        max_windows = settings.NOTIFICATION_MAX_WINDOWS,
+        max_in_flight = settings.NOTIFICATION_MAX_IN_FLIGHT
+    )
@@ -0,0 +1,176 @@
+"""
+Monitor del bucle de eventos: retraso de planificación y bloqueos con su pila.
+
+Dos piezas, baratas para dejarlas siempre activas en producción:
+1. Una tarea asyncio que duerme 'interval' segundos y mide cuánto tarda de más en despertar
+   (lag). Si el bucle está ocupado con trabajo síncrono, ninguna otra petición avanza y el lag
+   lo refleja. Se guardan las muestras de la última ventana para p50/p99/máximo.
+2. Un hilo vigilante ('watchdog') que comprueba el latido de esa tarea. Si el bucle lleva más
+   de 'block_threshold' sin latir, captura la pila del hilo del bucle (qué código lo bloquea) y
+   el request_id y la ruta de la petición en curso (leídos del 'scope' ASGI de la pila). Cuando
+   el bucle se recupera, el evento se completa con su duración y se registra en el log.
+
+Limitación: si el código que bloquea es C que no suelta el GIL (p. ej. un 'json.dumps' enorme),
+el vigilante no puede ejecutarse hasta que termina: el bloqueo se registra igual (por el lag),
+pero sin pila.
+"""
+import asyncio
+import statistics
+import sys
+import threading
+import time
+import traceback
+
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable
+
+
+MAX_STACK_FRAMES = 30
+
+
+class BlockingEvent:
+    """Un bloqueo del bucle: cuándo, cuánto y (si el vigilante llegó a verlo) dónde."""
+    __slots__ = ("detected_at", "duration_ms", "stack", "request_id", "route")
+
+    def __init__(self, stack: list[str] | None = None, request_id: str | None = None, route: str | None = None):
+        self.detected_at = datetime.now(timezone.utc)
+        self.duration_ms: float | None = None
+        self.stack = stack
+        self.request_id = request_id
+        self.route = route
+
+
+    def to_dict(self) -> dict:
+        return {
+            "detected_at": self.detected_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "request_id": self.request_id,
+            "route": self.route,
+            "stack": self.stack,
+        }
+
+
+def _request_from_frames(frame) -> tuple[str | None, str | None]:
+    """
+    Busca hacia fuera en la pila un 'scope' ASGI (todas las capas de Starlette/FastAPI lo tienen
+    como variable local). El request_id está en 'scope["state"]': es el mismo de 'request_id_var', que no
+    se puede leer desde otro hilo (los contextvars son del hilo y de la tarea).
+    """
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and scope.get("type") == "http":
+            request_id = scope.get("state", {}).get("request_id")
+            return request_id, f"{scope.get('method')} {scope.get('path')}"
+        frame = frame.f_back
+    return None, None
+
+
+class EventLoopMonitor:
+    def __init__(
+        self,
+        interval_seconds: float,
+        block_threshold_seconds: float,
+        window_seconds: float,
+        max_events: int,
+        logger,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.interval = interval_seconds
+        self.block_threshold = block_threshold_seconds
+        self.logger = logger
+        self.clock = clock
+
+        self._lags: deque[float] = deque(maxlen = max(1, int(window_seconds / interval_seconds))) # Segundos
+        self.events: deque[BlockingEvent] = deque(maxlen = max_events)
+        self.blocked_count = 0
+        self.blocked_seconds = 0.0
+
+        self._heartbeat = clock()
+        self._pending: BlockingEvent | None = None # Detectado por el vigilante, aún sin duración
+        self._loop_thread_id: int | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+
+    # --- TAREA EN EL BUCLE ---
+    async def run(self) -> None:
+        """Mide el lag hasta que se cancele. Arranca el vigilante y lo para al terminar."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = self.clock()
+        if self.block_threshold > 0:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target = self._watch, name = "loop-watchdog", daemon = True)
+            self._watchdog.start()
+        try:
+            while True:
+                expected = self.clock() + self.interval
+                await asyncio.sleep(self.interval)
+                now = self.clock()
+                self._heartbeat = now
+                self._record(max(0.0, now - expected))
+        finally:
+            self._stop.set()
+
+
+    def _record(self, lag: float) -> None:
+        self._lags.append(lag)
+        pending, self._pending = self._pending, None
+        if self.block_threshold <= 0 or lag < self.block_threshold:
+            return
+
+        # El vigilante pudo ver el bloqueo (con pila); si fue más corto que su intervalo, solo se sabe la duración
+        event = pending or BlockingEvent()
+        event.duration_ms = lag * 1000
+        self.events.append(event)
+        self.blocked_count += 1
+        self.blocked_seconds += lag
+
+        self.logger.bind(
+            loop_lag_ms = round(event.duration_ms, 1),
+            blocked_request_id = event.request_id,
+            blocked_route = event.route,
+            blocked_stack = event.stack
+        ).warning(
+            "Bucle de eventos bloqueado {:.0f} ms (umbral {:.0f} ms) en {}",
+            event.duration_ms, self.block_threshold * 1000, event.route or "una tarea fuera de las peticiones"
+        )
+
+
+    # --- HILO VIGILANTE ---
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stop.wait(self.interval / 2):
+            heartbeat = self._heartbeat
+            # Sin latido durante más del intervalo más el umbral: el bucle está bloqueado ahora mismo
+            if heartbeat == reported_heartbeat or self.clock() - heartbeat < self.interval + self.block_threshold:
+                continue
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_list(traceback.extract_stack(frame, limit = MAX_STACK_FRAMES))
+            request_id, route = _request_from_frames(frame)
+            self._pending = BlockingEvent([line.rstrip() for line in stack], request_id, route)
+
+
+    # --- MÉTRICAS ---
+    def snapshot(self, with_events: bool = True) -> dict:
+        lags = sorted(self._lags)
+        to_ms = lambda seconds: round(seconds * 1000, 2)
+        result = {
+            "interval_ms": to_ms(self.interval),
+            "block_threshold_ms": to_ms(self.block_threshold),
+            "samples": len(lags),
+            "lag_ms": {
+                "last": to_ms(self._lags[-1]) if lags else 0.0,
+                "p50": to_ms(statistics.median(lags)) if lags else 0.0,
+                "p99": to_ms(lags[min(len(lags) - 1, int(len(lags) * 0.99))]) if lags else 0.0,
+                "max": to_ms(lags[-1]) if lags else 0.0,
+            },
+            "blocked_count": self.blocked_count,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+        if with_events:
+            result["recent_blocks"] = [event.to_dict() for event in reversed(self.events)]
+        return result
@@ -0,0 +1,222 @@
+"""
+Perfilado bajo demanda de un worker en marcha: muestreo de pilas y asignaciones de memoria.
+
+- 'SamplingProfiler': un hilo aparte lee cada 'interval' las pilas de todos los hilos del
+  proceso ('sys._current_frames()', sin instrumentar nada) y cuenta cuántas veces aparece
+  cada una. El resultado es el formato "collapsed" de flamegraph.pl / speedscope:
+  'hilo;marco;marco;... N'. El coste lo paga el hilo muestreador (unas decenas de µs por
+  muestra con el GIL) y solo mientras dura el perfil: el bucle de eventos no se detiene.
+- 'MemoryProfiler': los mayores puntos de asignación según 'tracemalloc'. Si no se activó al
+  arrancar, se activa solo durante la ventana pedida y se mide lo asignado (y aún vivo) en
+  ella; después se para y libera sus trazas. Con 'tracemalloc' activo cada asignación de
+  Python es más lenta (del orden de x2), de ahí la ventana corta.
+
+Solo uno de cada tipo a la vez por proceso ('ProfilerBusyError').
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from collections import Counter
+from types import CodeType, FrameType
+
+
+# Hoja de la pila de un hilo que está esperando (no trabajando): se omiten salvo que se pidan
+IDLE_FUNCTIONS = {
+    ("selectors.py", "EpollSelector.select"),
+    ("selectors.py", "KqueueSelector.select"),
+    ("selectors.py", "PollSelector.select"),
+    ("selectors.py", "SelectSelector.select"),
+    ("runners.py", "Runner.run"), # uvloop: el bucle es código C, sin marcos de Python mientras espera
+    ("threading.py", "Condition.wait"),
+    ("threading.py", "Event.wait"),
+    ("threading.py", "Thread._wait_for_tstate_lock"),
+    ("queue.py", "Queue.get"),
+    ("thread.py", "_worker"), # Hilos de 'asyncio.to_thread' esperando trabajo
+    ("connection.py", "Connection._recv"), # Hilo que escribe los logs de la cola de loguru ('enqueue')
+    ("core.py", "_connection_worker_thread"), # Hilo de cada conexión de aiosqlite (benchmarks)
+}
+
+# Ficheros propios de tracemalloc y del sistema de importación: ruido en las estadísticas
+TRACEMALLOC_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ProfilerBusyError(Exception):
+    """Ya hay un perfil en curso en este proceso."""
+    pass
+
+
+class SamplingProfiler:
+    def __init__(self, interval_seconds: float, max_depth: int = 128):
+        self.interval = interval_seconds
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._labels: dict[CodeType, str] = {}
+        self._idle_codes: dict[CodeType, bool] = {}
+        self._path_prefixes = sorted((p for p in sys.path if p), key = len, reverse = True)
+
+
+    def profile(self, seconds: float, include_idle: bool = False) -> dict:
+        """Muestrea durante 'seconds' (bloquea el hilo que lo llama: usar con 'asyncio.to_thread')."""
+        if not self._lock.acquire(blocking = False):
+            raise ProfilerBusyError("Ya hay un perfil de CPU en curso")
+        try:
+            return self._sample(seconds, include_idle)
+        finally:
+            # Las etiquetas retienen los objetos de código: no se guardan entre perfiles
+            self._labels.clear()
+            self._idle_codes.clear()
+            self._lock.release()
+
+
+    def _sample(self, seconds: float, include_idle: bool) -> dict:
+        own_thread = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        samples = idle = 0
+        sampling_seconds = 0.0
+        start = time.perf_counter()
+        end = start + seconds
+
+        while True:
+            now = time.perf_counter()
+            if now >= end:
+                break
+            time.sleep(min(self.interval, end - now))
+
+            sample_start = time.perf_counter()
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                if not include_idle and self._is_idle(frame.f_code):
+                    idle += 1
+                    continue
+                thread_name = thread_names.get(thread_id, str(thread_id)).replace(" ", "_")
+                stacks[f"{thread_name};{self._collapse(frame)}"] += 1
+            samples += 1
+            sampling_seconds += time.perf_counter() - sample_start
+
+        elapsed = time.perf_counter() - start
+        return {
+            "seconds": round(elapsed, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": samples,
+            "idle_samples_skipped": idle,
+            "sampler_cpu_pct": round(sampling_seconds / elapsed * 100, 2) if elapsed else 0.0,
+            "stacks": stacks,
+        }
+
+
+    def _collapse(self, frame: FrameType) -> str:
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse() # Raíz primero, como espera flamegraph.pl
+        return ";".join(labels)
+
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in self._path_prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix):].lstrip(os.sep)
+                    break
+            label = f"{filename}:{code.co_qualname}".replace(" ", "_").replace(";", ",")
+            self._labels[code] = label
+        return label
+
+
+    def _is_idle(self, code: CodeType) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            idle = (os.path.basename(code.co_filename), code.co_qualname) in IDLE_FUNCTIONS
+            self._idle_codes[code] = idle
+        return idle
+
+
+    @staticmethod
+    def collapsed(stacks: Counter) -> str:
+        """Texto para flamegraph.pl / speedscope: una pila por línea con su nº de muestras."""
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class MemoryProfiler:
+    def __init__(self, traceback_frames: int):
+        self.traceback_frames = traceback_frames
+        self._busy = False
+        self._baseline: tracemalloc.Snapshot | None = None # Solo con tracemalloc activo desde el arranque
+
+
+    def start_at_startup(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+
+
+    async def top_allocations(self, seconds: float, limit: int, group_by: str) -> dict:
+        """
+        Con tracemalloc activo desde el arranque: memoria viva por punto de asignación y lo que
+        ha crecido desde la llamada anterior. Si no: lo asignado durante 'seconds' y aún vivo.
+        """
+        if self._busy:
+            raise ProfilerBusyError("Ya hay un perfil de memoria en curso")
+        self._busy = True
+        window = not tracemalloc.is_tracing()
+        try:
+            if window:
+                tracemalloc.start(self.traceback_frames)
+                await asyncio.sleep(seconds)
+            # 'take_snapshot' y las estadísticas recorren todas las trazas: en un hilo
+            snapshot = await asyncio.to_thread(tracemalloc.take_snapshot)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if window:
+                tracemalloc.stop()
+            self._busy = False
+
+        snapshot = snapshot.filter_traces(TRACEMALLOC_NOISE)
+        statistics = await asyncio.to_thread(snapshot.statistics, group_by)
+        result = {
+            "mode": "window" if window else "since_startup",
+            "window_seconds": seconds if window else None,
+            "traced_memory_kib": {"current": round(current / 1024, 1), "peak": round(peak / 1024, 1)},
+            "top": [self._stat_to_dict(stat, group_by) for stat in statistics[:limit]],
+        }
+
+        if not window:
+            if self._baseline is not None:
+                growth = await asyncio.to_thread(snapshot.compare_to, self._baseline, group_by)
+                result["growth_since_last_call"] = [self._diff_to_dict(diff, group_by) for diff in growth[:limit]]
+            self._baseline = snapshot
+        return result
+
+
+    @staticmethod
+    def _location(traceback: tracemalloc.Traceback, group_by: str) -> str | list[str]:
+        if group_by == "traceback":
+            return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+        frame = traceback[0]
+        return frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}"
+
+
+    def _stat_to_dict(self, stat: tracemalloc.Statistic, group_by: str) -> dict:
+        return {"location": self._location(stat.traceback, group_by), "size_kib": round(stat.size / 1024, 1), "count": stat.count}
+
+
+    def _diff_to_dict(self, diff: tracemalloc.StatisticDiff, group_by: str) -> dict:
+        return {
+            "location": self._location(diff.traceback, group_by),
+            "size_kib": round(diff.size / 1024, 1),
+            "size_diff_kib": round(diff.size_diff / 1024, 1),
+            "count_diff": diff.count_diff,
+        }
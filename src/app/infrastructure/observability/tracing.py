@@ -0,0 +1,293 @@
+"""
+Trazas ligeras por petición: span de la ruta, de cada método de servicio y de repositorio y de
+cada sentencia SQL, exportadas a un fichero NDJSON (funciona sin red ni colector).
+
+- Muestreo en la cabecera: se decide al empezar la petición ('TRACING_SAMPLE_RATE', o lo que
+  diga la cabecera 'traceparent' del llamante, formato W3C). En una petición no muestreada
+  cada método instrumentado solo hace una lectura de contextvar de más.
+- Los servicios y repositorios no saben nada de trazas: las dependencias de FastAPI los
+  envuelven con 'traced' (un proxy que mide sus métodos 'async'). Con las trazas desactivadas
+  'traced' devuelve el objeto tal cual: coste cero.
+- Las sentencias SQL se miden con los eventos del engine ('install_sql_tracing'), como el
+  perfilado de 'app.infrastructure.db.profiling'.
+- Al terminar la petición la traza se encola; una tarea en segundo plano la escribe por lotes
+  en un hilo. Si el fichero no da abasto, se descartan las más antiguas (nunca se bloquea).
+
+Cada línea del fichero es un span:
+    {"trace_id", "span_id", "parent_id", "name", "kind", "start", "duration_ms", "status", "attributes"}
+"""
+import asyncio
+import functools
+import inspect
+import random
+import re
+import time
+
+from app.application.ports.event_sink import EventSink
+from app.core.config import settings
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Any, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans", "max_spans", "dropped_spans")
+
+    def __init__(self, trace_id: str, max_spans: int):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.max_spans = max_spans
+        self.dropped_spans = 0 # Por encima de 'max_spans' (p. ej. una importación con miles de INSERT)
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "started_at", "_start", "duration_ms", "status", "attributes")
+
+    def __init__(self, trace: Trace, name: str, kind: str, parent_id: Optional[str] = None, attributes: Optional[dict] = None):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.status = "ok"
+        self.attributes = attributes if attributes is not None else {}
+
+
+    def child(self, name: str, kind: str, attributes: Optional[dict] = None) -> "Span":
+        return Span(self.trace, name, kind, self.span_id, attributes)
+
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if error is not None:
+            self.status = "error"
+            self.attributes["error.type"] = type(error).__name__
+        trace = self.trace
+        if len(trace.spans) < trace.max_spans:
+            trace.spans.append(self)
+        else:
+            trace.dropped_spans += 1
+
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# Span activo de la tarea en curso (None = petición no muestreada o fuera de una petición)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default = None)
+
+
+def parse_traceparent(header: str) -> tuple[str, str, bool] | None:
+    """(trace_id, span_id del llamante, muestreada) de una cabecera 'traceparent' W3C; None si no es válida."""
+    match = TRACEPARENT.match(header.strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+class Tracer:
+    """Decide el muestreo, abre las trazas y guarda las terminadas hasta que se exportan."""
+    def __init__(
+        self,
+        sample_rate: float,
+        max_spans_per_trace: int,
+        max_queued_spans: int,
+        rng: Callable[[], float] = random.random
+    ):
+        self.sample_rate = sample_rate
+        self.max_spans_per_trace = max_spans_per_trace
+        self.rng = rng
+        self._queue: deque[Span] = deque(maxlen = max_queued_spans)
+
+        # Contadores para métricas
+        self.sampled = 0
+        self.exported = 0
+        self.dropped = 0
+
+
+    def start_trace(self, name: str, kind: str = "server", traceparent: Optional[str] = None, attributes: Optional[dict] = None) -> Span | None:
+        """Span raíz de una traza nueva, o None si no se muestrea (la decisión del llamante manda)."""
+        parent = parse_traceparent(traceparent) if traceparent else None
+        if parent:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id, sampled = None, None, self.rng() < self.sample_rate
+        if not sampled:
+            return None
+
+        self.sampled += 1
+        trace = Trace(trace_id or f"{random.getrandbits(128):032x}", self.max_spans_per_trace)
+        return Span(trace, name, kind, parent_id, attributes)
+
+
+    def end_trace(self, root: Span, error: BaseException | None = None) -> None:
+        root.finish(error)
+        spans = root.trace.spans
+        if root.trace.dropped_spans:
+            root.attributes["dropped_spans"] = root.trace.dropped_spans
+        # La cola descarta por la izquierda (las más antiguas) al llenarse
+        overflow = len(self._queue) + len(spans) - self._queue.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._queue.extend(spans)
+
+
+    async def flush(self, sink: EventSink) -> int:
+        """Escribe los spans encolados (el 'sink' serializa y escribe en un hilo)."""
+        if not self._queue:
+            return 0
+        batch = [span.to_dict() for span in self._queue]
+        self._queue.clear()
+        await sink.publish(batch)
+        self.exported += len(batch)
+        return len(batch)
+
+
+    async def run_exporter(self, sink: EventSink, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.flush(sink)
+
+
+    def snapshot(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "sampled_traces": self.sampled,
+            "queued_spans": len(self._queue),
+            "exported_spans": self.exported,
+            "dropped_spans": self.dropped,
+        }
+
+
+tracer = Tracer(
+    sample_rate = settings.TRACING_SAMPLE_RATE,
+    max_spans_per_trace = settings.TRACING_MAX_SPANS_PER_TRACE,
+    max_queued_spans = settings.TRACING_MAX_QUEUED_SPANS
+)
+
+
+# --- INSTRUMENTACIÓN DE SERVICIOS Y REPOSITORIOS ---
+def _traced_method(method, name: str, kind: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        parent = current_span.get()
+        if parent is None:
+            return await method(*args, **kwargs)
+
+        span = parent.child(name, kind)
+        token = current_span.set(span)
+        try:
+            result = await method(*args, **kwargs)
+        except BaseException as exc:
+            span.finish(exc)
+            raise
+        finally:
+            current_span.reset(token)
+        span.finish()
+        return result
+
+    return wrapper
+
+
+class TracedProxy:
+    """
+    Envuelve un objeto y abre un span '<Clase>.<método>' en cada llamada a sus métodos 'async'
+    públicos. El resto de atributos (y los generadores asíncronos, como 'stream') pasan tal cual.
+    """
+    def __init__(self, target: Any, kind: str):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_kind", kind)
+        object.__setattr__(self, "_prefix", type(target).__name__)
+
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            return attr
+        wrapper = _traced_method(attr, f"{self._prefix}.{name}", self._kind)
+        object.__setattr__(self, name, wrapper) # Las siguientes llamadas no pasan por '__getattr__'
+        return wrapper
+
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+
+    # La unidad de trabajo se usa como 'async with uow:' (los métodos especiales no pasan por '__getattr__')
+    async def __aenter__(self):
+        return await self._target.__aenter__()
+
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self._target.__aexit__(exc_type, exc, tb)
+
+
+    def __repr__(self) -> str:
+        return f"TracedProxy({self._target!r})"
+
+
+def traced(target: T, kind: str) -> T:
+    """'target' instrumentado si las trazas están activas; si no, el mismo objeto."""
+    if not settings.TRACING_ENABLED:
+        return target
+    return TracedProxy(target, kind)
+
+
+# --- SENTENCIAS SQL ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is None:
+        return
+    span = parent.child("sql", "db", {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:settings.TRACING_SQL_MAX_CHARS],
+    })
+    if executemany:
+        span.attributes["db.executemany"] = len(parameters)
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        span = spans.pop()
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.attributes["db.rows"] = cursor.rowcount
+        span.finish()
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if spans:
+        spans.pop().finish(exception_context.original_exception)
+
+
+def install_sql_tracing(engine: Engine) -> None:
+    """Un span hijo del span activo por cada sentencia (las de fuera de una petición muestreada se ignoran)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
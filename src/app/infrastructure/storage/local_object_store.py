@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import os
+
+from app.application.ports.object_store import ObjectStore, StoredObject
+from pathlib import Path
+from typing import AsyncIterable, BinaryIO
+from uuid import uuid4
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Almacén de objetos en disco local, sustituto de S3/MinIO con la misma semántica de claves.
+
+    1. El flujo se escribe en un temporal dentro de la raíz (misma partición: el rename es atómico),
+       calculando el SHA-256 por el camino.
+    2. Al terminar, el temporal se renombra a su clave por contenido, '<prefix>/<sha[:2]>/<sha>'.
+       Si ya existía, se descarta el temporal (deduplicado).
+
+    La escritura y el hash van a un hilo ('asyncio.to_thread') en bloques de 'write_buffer' bytes,
+    para no bloquear el event loop: en memoria solo hay un bloque por subida en curso.
+    """
+    def __init__(self, root: str | Path, write_buffer: int = 256 * 1024, fsync: bool = True):
+        self.root = Path(root)
+        self.write_buffer = write_buffer
+        self.fsync = fsync
+
+
+    @staticmethod
+    def key_for(prefix: str, sha256: str) -> str:
+        return f"{prefix}/{sha256[:2]}/{sha256}"
+
+
+    # --- OPERACIONES DE DISCO (en un hilo) ---
+    def _open_temp(self) -> tuple[Path, BinaryIO]:
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents = True, exist_ok = True)
+        tmp_path = tmp_dir / uuid4().hex
+        return tmp_path, open(tmp_path, "wb")
+
+
+    @staticmethod
+    def _write(file: BinaryIO, hasher, data: bytearray) -> None:
+        hasher.update(data)
+        file.write(data)
+
+
+    def _close(self, file: BinaryIO) -> None:
+        file.flush()
+        if self.fsync:
+            # En disco antes de registrar la imagen en la BD: una caída no deja filas sin fichero
+            os.fsync(file.fileno())
+        file.close()
+
+
+    def _commit(self, tmp_path: Path, key: str) -> bool:
+        target = self.root / key
+        if target.exists():
+            tmp_path.unlink()
+            return False
+        target.parent.mkdir(parents = True, exist_ok = True)
+        os.replace(tmp_path, target)
+        return True
+
+
+    @staticmethod
+    def _discard(tmp_path: Path, file: BinaryIO) -> None:
+        file.close()
+        tmp_path.unlink(missing_ok = True)
+
+
+    # --- IMPLEMENTACIÓN DE LA INTERFAZ ---
+    async def put_stream(self, prefix: str, chunks: AsyncIterable[bytes]) -> StoredObject:
+        tmp_path, file = await asyncio.to_thread(self._open_temp)
+        hasher = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) >= self.write_buffer:
+                    data, buffer = buffer, bytearray()
+                    await asyncio.to_thread(self._write, file, hasher, data)
+            if buffer:
+                await asyncio.to_thread(self._write, file, hasher, buffer)
+            await asyncio.to_thread(self._close, file)
+
+        except BaseException:
+            # También si se cancela la petición (el cliente corta la subida)
+            await asyncio.shield(asyncio.to_thread(self._discard, tmp_path, file))
+            raise
+
+        sha256 = hasher.hexdigest()
+        key = self.key_for(prefix, sha256)
+        created = await asyncio.to_thread(self._commit, tmp_path, key)
+        return StoredObject(key = key, sha256 = sha256, size = size, created = created)
+
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread((self.root / key).exists)
+
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread((self.root / key).unlink, missing_ok = True)
+
+
+    def local_path(self, key: str) -> Path | None:
+        return self.root / key
@@ -0,0 +1,109 @@
+import asyncio
+import importlib.util
+import os
+
+from app.application.ports.thumbnailer import Thumbnail, Thumbnailer
+from concurrent.futures import BrokenExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+# Orientaciones EXIF que giran la imagen 90º (el ancho y el alto visibles se intercambian)
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def make_thumbnail(source: str, target: str, max_side: int) -> tuple[int, int]:
+    """
+    Se ejecuta en un proceso del pool: decodifica la imagen, la reduce a 'max_side' píxeles
+    por el lado mayor y la guarda en JPEG. Devuelve las dimensiones (ya orientadas) del original.
+    """
+    # Pillow es opcional: solo se importa en los procesos del pool
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(source) as image:
+            width, height = image.size
+            if image.getexif().get(0x0112) in _ROTATED_ORIENTATIONS:
+                width, height = height, width
+
+            # En JPEG decodifica directamente a 1/2, 1/4 u 1/8 del tamaño: mucho menos trabajo y memoria
+            image.draft("RGB", (max_side, max_side))
+            thumbnail = ImageOps.exif_transpose(image)
+            thumbnail.thumbnail((max_side, max_side))
+            if thumbnail.mode != "RGB":
+                thumbnail = thumbnail.convert("RGB")
+
+            Path(target).parent.mkdir(parents = True, exist_ok = True)
+            tmp_target = f"{target}.{os.getpid()}.tmp"
+            thumbnail.save(tmp_target, "JPEG", quality = 85, optimize = True)
+            os.replace(tmp_target, target)
+
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        # Pillow lanza OSError (o UnidentifiedImageError, que hereda de él) con ficheros corruptos
+        raise ValueError(f"No se pudo decodificar la imagen ({type(e).__name__}).") from None
+
+    return width, height
+
+
+class ProcessPoolThumbnailer(Thumbnailer):
+    """
+    Miniaturas en un pool de procesos (Pillow libera poco el GIL: con hilos competiría con el event loop).
+
+    - El pool se crea en la primera subida, con 'spawn' (no se hereda el estado de los hilos del proceso).
+    - Solo viajan rutas entre procesos, nunca el contenido de las imágenes.
+    - Si el almacén no es local o Pillow no está instalado, no se generan miniaturas (avisando una vez).
+    """
+    def __init__(self, store, max_side: int, workers: int, logger):
+        self.store = store
+        self.max_side = max_side
+        self.workers = workers
+        self.logger = logger
+        self._pool: "ProcessPoolExecutor | None" = None
+        self._available: bool | None = None
+
+
+    def _is_available(self) -> bool:
+        if self._available is None:
+            self._available = self.workers > 0
+            if self._available and importlib.util.find_spec("PIL") is None:
+                self.logger.warning("Pillow no está instalado: las imágenes se guardan sin miniatura")
+                self._available = False
+        return self._available
+
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        if self._pool is None:
+            # 'multiprocessing' y el executor de procesos solo se importan en la primera subida (no al arrancar)
+            import multiprocessing
+
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers = self.workers, mp_context = multiprocessing.get_context("spawn"))
+        return self._pool
+
+
+    async def create(self, source_key: str) -> Thumbnail | None:
+        source = self.store.local_path(source_key)
+        if not self._is_available() or source is None:
+            return None
+
+        key = f"thumbnails/{self.max_side}/{source_key.split('/', 1)[-1]}.jpg"
+        target = self.store.local_path(key)
+        loop = asyncio.get_running_loop()
+        try:
+            width, height = await loop.run_in_executor(self._get_pool(), make_thumbnail, str(source), str(target), self.max_side)
+        except BrokenExecutor: # BrokenProcessPool
+            # Un proceso ha muerto (p. ej. sin memoria con una imagen maliciosa): se recrea el pool en la siguiente
+            self._pool = None
+            raise ValueError("No se pudo procesar la imagen.")
+        return Thumbnail(key = key, width = width, height = height)
+
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, wait = True, cancel_futures = True)
@@ -0,0 +1,121 @@
+"""
+Calibración de Argon2 para este servidor: qué parámetros dan la latencia objetivo de verificación.
+
+Para cada memoria candidata (hasta '--max-memory-mib') sube las iteraciones ('time_cost')
+mientras la mediana de una verificación no supere '--target-ms', y propone la combinación con
+más trabajo total (memoria x iteraciones) dentro del objetivo. Antes mide los parámetros
+actuales de la configuración, como referencia.
+
+La latencia de una verificación es también el CPU de un login: con N núcleos dedicados, la
+API aguanta como mucho N * 1000 / latencia logins por segundo. El objetivo decide ese reparto
+entre coste de CPU y resistencia a ataques de fuerza bruta. 'parallelism' reparte un hash en
+varios hilos: solo reduce la latencia si hay núcleos libres (no bajo carga).
+
+Los hashes existentes no se invalidan al cambiar los parámetros: se rehacen solos en el
+siguiente login de cada usuario ('UserService.authenticate').
+
+Uso (desde 'src/'):
+    python -m benchmarks.argon2_calibrate --target-ms 250
+    python -m benchmarks.argon2_calibrate --target-ms 100 --max-memory-mib 64 --parallelism 1 --save
+"""
+import argparse
+import statistics
+import time
+
+from app.core.config import settings
+from benchmarks.common import save_results
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+
+PASSWORD = "correct horse battery staple"
+MIN_MEMORY_MIB = 19 # Mínimo de OWASP (19 MiB con 2 iteraciones)
+MAX_TIME_COST = 20
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Calibración de los parámetros de Argon2")
+    parser.add_argument("--target-ms", type = float, default = 250.0, help = "Latencia máxima de una verificación (mediana)")
+    parser.add_argument("--max-memory-mib", type = int, default = 256, help = "Memoria máxima por hash")
+    parser.add_argument("--parallelism", type = int, default = settings.PASSWORD_ARGON2_PARALLELISM)
+    parser.add_argument("--repeat", type = int, default = 5, help = "Verificaciones por combinación")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+def measure(time_cost: int, memory_kib: int, parallelism: int, repeat: int) -> float:
+    """Mediana (ms) de 'repeat' verificaciones correctas con esos parámetros."""
+    hasher = Argon2Hasher(time_cost = time_cost, memory_cost = memory_kib, parallelism = parallelism)
+    stored = hasher.hash(PASSWORD)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hasher.verify(PASSWORD, stored)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def memory_candidates(max_memory_mib: int) -> list[int]:
+    """Memorias a probar (MiB): el mínimo de OWASP y potencias de 2 hasta el máximo."""
+    candidates = [MIN_MEMORY_MIB]
+    memory = 32
+    while memory <= max_memory_mib:
+        candidates.append(memory)
+        memory *= 2
+    return [m for m in candidates if m <= max_memory_mib]
+
+
+def calibrate(memory_mib: int, parallelism: int, target_ms: float, repeat: int) -> dict | None:
+    """Máximo de iteraciones que cabe en el objetivo con esa memoria (None si ni una cabe)."""
+    best = None
+    for time_cost in range(1, MAX_TIME_COST + 1):
+        latency_ms = measure(time_cost, memory_mib * 1024, parallelism, repeat)
+        if latency_ms > target_ms:
+            break
+        best = {"memory_mib": memory_mib, "time_cost": time_cost, "parallelism": parallelism, "verify_ms": latency_ms}
+    return best
+
+
+def main():
+    args = parse_args()
+
+    current = {
+        "memory_mib": settings.PASSWORD_ARGON2_MEMORY_KIB / 1024,
+        "time_cost": settings.PASSWORD_ARGON2_TIME_COST,
+        "parallelism": settings.PASSWORD_ARGON2_PARALLELISM,
+    }
+    current["verify_ms"] = measure(
+        settings.PASSWORD_ARGON2_TIME_COST, settings.PASSWORD_ARGON2_MEMORY_KIB, settings.PASSWORD_ARGON2_PARALLELISM, args.repeat
+    )
+
+    candidates = []
+    for memory_mib in memory_candidates(args.max_memory_mib):
+        result = calibrate(memory_mib, args.parallelism, args.target_ms, args.repeat)
+        if result is None:
+            break # Con más memoria tampoco cabrá
+        candidates.append(result)
+
+    print(f"{'':<10} {'memoria MiB':>11} {'iteraciones':>11} {'hilos':>6} {'verificar ms':>13} {'logins/s':>10}")
+    rows = [("actual", current)] + [("candidato", c) for c in candidates]
+    for label, row in rows:
+        print(
+            f"{label:<10} {row['memory_mib']:>11.0f} {row['time_cost']:>11} {row['parallelism']:>6} "
+            f"{row['verify_ms']:>13.1f} {1000 / row['verify_ms']:>10.1f}"
+        )
+
+    # La recomendación: el mayor trabajo total (memoria x iteraciones) dentro del objetivo
+    recommended = max(candidates, key = lambda c: c["memory_mib"] * c["time_cost"], default = None)
+    if recommended is None:
+        print(f"\nNinguna combinación baja de {args.target_ms:.0f} ms: subir el objetivo o reducir '--parallelism'.")
+    else:
+        print(f"\nRecomendado para {args.target_ms:.0f} ms por verificación:")
+        print(f"PASSWORD_ARGON2_TIME_COST={recommended['time_cost']}")
+        print(f"PASSWORD_ARGON2_MEMORY_KIB={recommended['memory_mib'] * 1024}")
+        print(f"PASSWORD_ARGON2_PARALLELISM={recommended['parallelism']}")
+
+    if args.save:
+        path = save_results("argon2_calibrate", vars(args), {"current": current, "candidates": candidates, "recommended": recommended})
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Importación y exportación masivas de subastas: throughput y memoria.
+
+Importa '--rows' subastas con 'POST /auctions/import' (el cuerpo se genera y envía por fragmentos,
+sin construirlo entero) y las vuelve a leer con 'GET /auctions/export', consumiendo la respuesta
+en streaming. Para cada dirección mide filas/s y el pico de memoria de Python (tracemalloc), que
+no debería crecer con el nº de filas. Como referencia, mide también la creación una a una con
+'POST /auctions/' sobre una muestra.
+
+Uso (desde 'src/'):
+    python -m benchmarks.bulk_io --rows 50000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+PASSWORD = "bulk-io-password"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Importación y exportación masivas de subastas")
+    parser.add_argument("--db-url", default = None, help = "URL de la BD (por defecto, SQLite temporal)")
+    parser.add_argument("--rows", type = int, default = 20_000)
+    parser.add_argument("--format", choices = ["csv", "ndjson"], default = "csv")
+    parser.add_argument("--single-sample", type = int, default = 200, help = "Subastas creadas una a una como referencia")
+    return parser.parse_args()
+
+
+async def generate_body(rows: int, format: str, rows_per_chunk: int = 500):
+    """Cuerpo del fichero a importar, por fragmentos."""
+    if format == "csv":
+        yield b"title,description,starting_price,end_time\n"
+    for start in range(0, rows, rows_per_chunk):
+        lines = []
+        for i in range(start, min(rows, start + rows_per_chunk)):
+            if format == "csv":
+                lines.append(f"Subasta importada {i},Descripcion {i},{10 + i % 100},2099-01-01T00:00:00Z\n")
+            else:
+                lines.append(
+                    f'{{"title": "Subasta importada {i}", "description": "Descripcion {i}", '
+                    f'"starting_price": "{10 + i % 100}", "end_time": "2099-01-01T00:00:00Z"}}\n'
+                )
+        yield "".join(lines).encode()
+
+
+async def count_streamed_lines(app, path: str, query_string: str) -> int:
+    """Hace un GET a la aplicación ASGI y cuenta las líneas del cuerpo sin guardarlo."""
+    lines = 0
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query_string.encode(), "root_path": "",
+        "headers": [(b"host", b"bulk")], "client": ("127.0.0.1", 0), "server": ("bulk", 80),
+    }
+
+    requested = False
+
+    async def receive():
+        # Primero la petición (sin cuerpo); después, como un cliente que sigue conectado, nada más
+        nonlocal requested
+        if requested:
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal lines
+        if message["type"] == "http.response.body":
+            lines += message.get("body", b"").count(b"\n")
+
+    await app(scope, receive, send)
+    return lines
+
+
+async def run(args) -> dict:
+    import httpx
+
+    from app.api.v1.bulk import FORMATS
+    from app.core.config import settings
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db.session import engine
+    from main import create_application
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    app = create_application()
+    api = settings.API_V1_STR
+    transport = httpx.ASGITransport(app = app)
+    results = {}
+
+    try:
+        async with httpx.AsyncClient(transport = transport, base_url = "http://bulk", timeout = None) as client:
+            await client.post(f"{api}/users/", json = {"username": "bulkseller", "email": "bulk@example.com", "password": PASSWORD})
+            response = await client.post(f"{api}/auth/login", data = {"username": "bulkseller", "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            # 1. Referencia: una petición (y un commit) por subasta
+            start = time.perf_counter()
+            for i in range(args.single_sample):
+                await client.post(
+                    f"{api}/auctions/",
+                    json = {"title": f"Subasta suelta {i}", "description": "-", "starting_price": "10", "end_time": "2099-01-01T00:00:00Z"},
+                    headers = headers
+                )
+            elapsed = time.perf_counter() - start
+            results["single_post"] = {"rows": args.single_sample, "rows_per_s": args.single_sample / elapsed}
+
+            # 2. Importación en streaming
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = await client.post(
+                f"{api}/auctions/import",
+                content = generate_body(args.rows, args.format),
+                headers = {**headers, "Content-Type": FORMATS[args.format]}
+            )
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report = response.json()
+            results["import"] = {
+                "rows": report["imported"],
+                "failed": report["failed"],
+                "rows_per_s": report["imported"] / elapsed,
+                "peak_mib": peak / 2**20,
+            }
+
+        # 3. Exportación en streaming. El cliente ASGI de httpx acumula la respuesta entera en memoria,
+        # así que se llama a la aplicación directamente y se cuentan las líneas según llegan
+        tracemalloc.start()
+        start = time.perf_counter()
+        exported = await count_streamed_lines(app, f"{api}/auctions/export", f"format={args.format}")
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        exported -= 1 if args.format == "csv" else 0 # Cabecera
+        results["export"] = {"rows": exported, "rows_per_s": exported / elapsed, "peak_mib": peak / 2**20}
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main():
+    args = parse_args()
+
+    # La configuración debe fijarse antes de importar la aplicación (Settings se instancia al importar)
+    tmp_dir = None
+    if args.db_url is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        args.db_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir.name, 'bulk.db')}"
+    os.environ["DB_URL"] = args.db_url
+    os.environ["REPOSITORY_BACKEND"] = "sqlalchemy"
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+    print(f"{'operación':<12} {'filas':>8} {'filas/s':>10} {'pico MiB':>9}")
+    for name, stats in results.items():
+        peak = f"{stats['peak_mib']:.1f}" if "peak_mib" in stats else "-"
+        print(f"{name:<12} {stats['rows']:>8} {stats['rows_per_s']:>10.0f} {peak:>9}")
+
+
+if __name__ == "__main__":
+    main()
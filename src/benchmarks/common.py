@@ -0,0 +1,98 @@
+"""
+Utilidades compartidas por los benchmarks: estadísticas de latencia y guardado de
+resultados en JSON (uno por ejecución, etiquetado con el commit) para comparar entre commits.
+"""
+import json
+import platform
+import subprocess
+import time
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentil por el método del rango más cercano (suficiente para benchmarks)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies_ms: list[float], elapsed_s: float, errors: int = 0) -> dict:
+    """Resumen estándar de un escenario: throughput, p50, p99 y errores."""
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "throughput_rps": len(latencies_ms) / elapsed_s if elapsed_s else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p99_ms": percentile(latencies_ms, 99),
+        "max_ms": max(latencies_ms, default = 0.0),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output = True, text = True, check = True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(name: str, config: dict, results: dict, output_dir: Path = RESULTS_DIR) -> Path:
+    """Guarda una ejecución como '<name>-<fecha>-<commit>.json'."""
+    output_dir.mkdir(parents = True, exist_ok = True)
+    revision = git_revision()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = output_dir / f"{name}-{stamp}-{revision}.json"
+
+    payload = {
+        "benchmark": name,
+        "revision": revision,
+        "timestamp": stamp,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config,
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent = 2, default = str))
+    return path
+
+
+def latest_results(name: str, exclude: Path | None = None, output_dir: Path = RESULTS_DIR) -> dict | None:
+    """Última ejecución guardada de un benchmark (para comparar con la actual)."""
+    candidates = sorted(p for p in output_dir.glob(f"{name}-*.json") if p != exclude)
+    if not candidates:
+        return None
+    return json.loads(candidates[-1].read_text())
+
+
+def print_comparison(current: dict, previous: dict | None) -> None:
+    """Tabla por escenario con la variación respecto a la ejecución anterior."""
+    print(f"{'escenario':<16} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8}   vs anterior")
+    for scenario, stats in current.items():
+        delta = ""
+        if previous and scenario in previous["results"]:
+            before = previous["results"][scenario]
+            if before["throughput_rps"]:
+                change = (stats["throughput_rps"] / before["throughput_rps"] - 1) * 100
+                delta = f"{change:+.1f}% req/s ({previous['revision']})"
+        print(
+            f"{scenario:<16} {stats['throughput_rps']:>10.1f} {stats['p50_ms']:>9.2f} "
+            f"{stats['p99_ms']:>9.2f} {stats['errors']:>8}   {delta}"
+        )
+
+
+class Timer:
+    """Cronómetro sencillo para medir un bloque con 'with'."""
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,259 @@
+"""
+Subidas concurrentes de imágenes de subastas: throughput, latencia y bloqueo del event loop.
+
+Lanza '--uploads' subidas a 'POST /auctions/{id}/images' con '--concurrency' clientes a la vez.
+El cuerpo se envía por fragmentos (como un cliente real), en crudo o como multipart. Una parte
+('--duplicate-ratio') repite imágenes ya subidas, para medir el deduplicado por contenido.
+
+Mide, para cada forma de generar miniaturas:
+- 'pool': la de la aplicación (pool de procesos, fuera del event loop).
+- 'inline': referencia con Pillow en el propio event loop (lo que se quiere evitar).
+El "lag" es el retraso máximo de un temporizador de 5 ms durante las subidas: lo que esperaría
+cualquier otra petición del proceso. También mide el pico de memoria de Python (tracemalloc)
+y lecturas con 'Range' frente a descargas completas.
+
+Las miniaturas requieren Pillow (opcional). Sin él, las imágenes son sintéticas y se mide solo la subida.
+
+Uso (desde 'src/'):
+    python -m benchmarks.image_uploads --uploads 200 --concurrency 16
+"""
+import argparse
+import asyncio
+import importlib.util
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import percentile, summarize
+
+
+PASSWORD = "image-uploads-password"
+BASE_IMAGES = 4 # Imágenes base; el resto se hacen distintas añadiendo bytes tras el final del JPEG
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Subidas concurrentes de imágenes")
+    parser.add_argument("--db-url", default = None, help = "URL de la BD (por defecto, SQLite temporal)")
+    parser.add_argument("--uploads", type = int, default = 200)
+    parser.add_argument("--concurrency", type = int, default = 16)
+    parser.add_argument("--width", type = int, default = 2400)
+    parser.add_argument("--height", type = int, default = 1800)
+    parser.add_argument("--duplicate-ratio", type = float, default = 0.25)
+    parser.add_argument("--mode", choices = ["raw", "multipart"], default = "multipart")
+    parser.add_argument("--chunk-kib", type = int, default = 64, help = "Tamaño de los fragmentos enviados")
+    parser.add_argument("--range-requests", type = int, default = 500)
+    return parser.parse_args()
+
+
+def make_base_images(args) -> list[bytes]:
+    if importlib.util.find_spec("PIL") is None:
+        # Sin Pillow: cabecera JPEG y relleno (no se generan miniaturas)
+        return [b"\xff\xd8\xff\xe0" + os.urandom(args.width * args.height // 4) for _ in range(BASE_IMAGES)]
+
+    from PIL import Image
+
+    images = []
+    for i in range(BASE_IMAGES):
+        # Ruido: no se comprime bien, el tamaño es parecido al de una foto real
+        image = Image.merge("RGB", [Image.effect_noise((args.width, args.height), 40 + 10 * i)] * 3)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality = 85)
+        images.append(buffer.getvalue())
+    return images
+
+
+def upload_body(image: bytes, trailer: bytes, mode: str, chunk_size: int) -> tuple[dict, object]:
+    """
+    Cabeceras y cuerpo (generador asíncrono por fragmentos) de una subida de 'image' + 'trailer'.
+    El contenido no se construye entero: el pico de memoria medido es el del servidor.
+    """
+    if mode == "raw":
+        head, tail, content_type = b"", b"", "image/jpeg"
+    else:
+        boundary = "licitbenchboundary"
+        head = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"photo.jpg\"\r\n"
+            f"Content-Type: image/jpeg\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        content_type = f"multipart/form-data; boundary={boundary}"
+
+    async def body():
+        yield head
+        for start in range(0, len(image), chunk_size):
+            yield image[start:start + chunk_size]
+        yield trailer + tail
+
+    return {"Content-Type": content_type}, body()
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.005) -> list[float]:
+    """Retrasos (ms) de un temporizador periódico hasta que se active 'stop'."""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+    return samples
+
+
+async def run_uploads(client, api, headers, auction_ids, images, args, salt: bytes) -> tuple[dict, list]:
+    """Sube 'args.uploads' imágenes; las duplicadas repiten el contenido de una subida anterior."""
+    distinct = max(1, round(args.uploads * (1 - args.duplicate_ratio)))
+    per_auction = max(1, -(-distinct // len(auction_ids)))
+    latencies, created, errors = [], [], 0
+
+    def content(i: int) -> tuple[bytes, bytes]:
+        n = i % distinct # Las subidas >= 'distinct' repiten contenido (y subasta)
+        return images[n % len(images)], salt + n.to_bytes(4, "big")
+
+    async def worker(w: int):
+        nonlocal errors
+        for i in range(w, args.uploads, args.concurrency):
+            auction_id = auction_ids[(i % distinct) // per_auction]
+            extra_headers, body = upload_body(*content(i), args.mode, args.chunk_kib * 1024)
+            start = time.perf_counter()
+            response = await client.post(f"{api}/auctions/{auction_id}/images", content = body, headers = {**headers, **extra_headers})
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            elif response.status_code == 201:
+                created.append(response.json())
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(stop))
+    tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stop.set()
+
+    stats = summarize(latencies, elapsed, errors)
+    stats["created"] = len(created)
+    stats["deduplicated"] = args.uploads - len(created) - errors
+    lag = await lag_task
+    stats["p99_loop_lag_ms"] = percentile(lag, 99)
+    stats["max_loop_lag_ms"] = max(lag, default = 0.0)
+    stats["peak_mib"] = peak / 2**20
+    stats["mib_per_s"] = sum(len(images[i % distinct % len(images)]) for i in range(args.uploads)) / elapsed / 2**20
+    return stats, created
+
+
+async def run(args) -> dict:
+    import httpx
+
+    from app.api.dependencies import images as image_dependencies
+    from app.core.config import settings
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db.session import engine
+    from app.infrastructure.storage.thumbnailer import ProcessPoolThumbnailer, make_thumbnail
+    from app.application.ports.thumbnailer import Thumbnail
+    from main import create_application
+
+    class InlineThumbnailer(ProcessPoolThumbnailer):
+        """Referencia: la misma miniatura, pero en el event loop."""
+        async def create(self, source_key):
+            if not self._is_available():
+                return None
+            key = f"thumbnails/{self.max_side}/{source_key.split('/', 1)[-1]}.jpg"
+            width, height = make_thumbnail(str(self.store.local_path(source_key)), str(self.store.local_path(key)), self.max_side)
+            return Thumbnail(key = key, width = width, height = height)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    images = make_base_images(args)
+    print(f"Imagen de {len(images[0]) / 2**20:.1f} MiB ({args.width}x{args.height}), modo {args.mode}")
+
+    app = create_application()
+    api = settings.API_V1_STR
+    transport = httpx.ASGITransport(app = app)
+    pool_thumbnailer = image_dependencies.image_thumbnailer
+    results = {}
+
+    try:
+        async with app.router.lifespan_context(app), httpx.AsyncClient(transport = transport, base_url = "http://images", timeout = None) as client:
+            await client.post(f"{api}/users/", json = {"username": "imageseller", "email": "images@example.com", "password": PASSWORD})
+            response = await client.post(f"{api}/auth/login", data = {"username": "imageseller", "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            async def new_auctions(count: int) -> list[str]:
+                ids = []
+                for i in range(count):
+                    response = await client.post(
+                        f"{api}/auctions/",
+                        json = {"title": f"Subasta con fotos {i}", "description": "-", "starting_price": "10", "end_time": "2099-01-01T00:00:00Z"},
+                        headers = headers
+                    )
+                    ids.append(response.json()["id"])
+                return ids
+
+            auctions_needed = -(-args.uploads // settings.IMAGE_MAX_PER_AUCTION)
+
+            # Calentamiento: arranca los procesos del pool (no se mide)
+            extra_headers, body = upload_body(images[0], b"warmup", args.mode, args.chunk_kib * 1024)
+            await client.post(f"{api}/auctions/{(await new_auctions(1))[0]}/images", content = body, headers = {**headers, **extra_headers})
+
+            created = []
+            for name, thumbnailer in (("pool", pool_thumbnailer), ("inline", InlineThumbnailer(pool_thumbnailer.store, pool_thumbnailer.max_side, 1, pool_thumbnailer.logger))):
+                image_dependencies.image_thumbnailer = thumbnailer
+                results[name], uploaded = await run_uploads(client, api, headers, await new_auctions(auctions_needed), images, args, name.encode())
+                created = created or uploaded
+            image_dependencies.image_thumbnailer = pool_thumbnailer
+
+            # Lecturas: descargas completas frente a trozos con 'Range'
+            urls = [image["url"] for image in created]
+            for name, range_header in (("get_full", None), ("get_range_64k", "bytes=65536-131071")):
+                latencies, received = [], 0
+                start = time.perf_counter()
+                for i in range(args.range_requests):
+                    t0 = time.perf_counter()
+                    response = await client.get(urls[i % len(urls)], headers = {"Range": range_header} if range_header else {})
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    received += len(response.content)
+                results[name] = summarize(latencies, time.perf_counter() - start)
+                results[name]["mib_per_request"] = received / args.range_requests / 2**20
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main():
+    args = parse_args()
+
+    # La configuración debe fijarse antes de importar la aplicación (Settings se instancia al importar)
+    tmp_dir = tempfile.TemporaryDirectory()
+    if args.db_url is None:
+        args.db_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir.name, 'images.db')}"
+    os.environ["DB_URL"] = args.db_url
+    os.environ["REPOSITORY_BACKEND"] = "sqlalchemy"
+    os.environ["IMAGE_STORAGE_PATH"] = os.path.join(tmp_dir.name, "media")
+    os.environ["NOTIFICATIONS_ENABLED"] = "false"
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        tmp_dir.cleanup()
+
+    cpus = os.cpu_count() or 1
+    print(f"CPUs: {cpus}" + (" (con una sola CPU el pool compite con el event loop: no se espera mejora)" if cpus == 1 else ""))
+    print(f"{'miniaturas':<10} {'subidas/s':>10} {'MiB/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'lag p99':>8} {'lag máx':>8} {'pico MiB':>9} {'nuevas':>7} {'dedup':>6} {'errores':>8}")
+    for name in ("pool", "inline"):
+        s = results[name]
+        print(
+            f"{name:<10} {s['throughput_rps']:>10.1f} {s['mib_per_s']:>8.1f} {s['p50_ms']:>8.1f} {s['p99_ms']:>8.1f} "
+            f"{s['p99_loop_lag_ms']:>8.1f} {s['max_loop_lag_ms']:>8.1f} {s['peak_mib']:>9.1f} {s['created']:>7} {s['deduplicated']:>6} {s['errors']:>8}"
+        )
+    print()
+    print(f"{'lectura':<14} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'MiB/req':>8}")
+    for name in ("get_full", "get_range_64k"):
+        s = results[name]
+        print(f"{name:<14} {s['throughput_rps']:>8.0f} {s['p50_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['mib_per_request']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
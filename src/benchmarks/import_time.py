@@ -0,0 +1,159 @@
+"""
+Tiempo de arranque de la aplicación: cuánto tarda 'import main' y en qué se va.
+
+Lanza '--repeat' procesos 'python -X importtime -c "import main"' y resume su salida:
+- Tiempo total de la importación (mediana) y del proceso completo (intérprete incluido).
+- Los módulos más caros (tiempo acumulado y propio) y el tiempo propio por paquete.
+- Con '--cold', lo mismo sin bytecode precompilado (cada módulo se compila desde el fuente),
+  que es lo que pasa al arrancar un contenedor sin la etapa de 'compileall' del Dockerfile.
+
+También sirve como comprobación en CI (termina con código 1 si falla):
+- '--budget-ms': la mediana de la importación no puede superar el presupuesto.
+- '--forbid': módulos que NO deben importarse al arrancar (se cargan de forma perezosa).
+
+La configuración se toma del entorno (como la aplicación) y se fuerza LICIT_ENV=prod: el
+arranque que importa es el de los contenedores.
+
+Uso (desde 'src/'):
+    python -m benchmarks.import_time --repeat 5 --cold
+    python -m benchmarks.import_time --repeat 5 --budget-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import save_results
+from collections import defaultdict
+from pathlib import Path
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+# Solo se usan en algunas peticiones o en desarrollo: importarlos al arrancar es una regresión
+DEFAULT_FORBIDDEN = "PIL,concurrent.futures.process,app.core.log_rotation"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Tiempo de importación de la aplicación")
+    parser.add_argument("--module", default = "main", help = "Módulo a importar")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--top", type = int, default = 15, help = "Módulos a mostrar en cada ranking")
+    parser.add_argument("--cold", action = "store_true", help = "Medir también sin bytecode precompilado")
+    parser.add_argument("--budget-ms", type = float, default = None, help = "Máximo permitido (mediana, con bytecode)")
+    parser.add_argument("--forbid", default = DEFAULT_FORBIDDEN, help = "Módulos prohibidos al arrancar, separados por comas")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Líneas de '-X importtime' como (módulo, propio µs, acumulado µs), en el orden en que terminan."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue # Cabecera
+        modules.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return modules
+
+
+def run_once(module: str, cold: bool) -> dict:
+    env = {**os.environ, "LICIT_ENV": "prod"}
+    with tempfile.TemporaryDirectory() as empty_cache:
+        if cold:
+            # Caché de bytecode vacía y sin escritura: todos los módulos se compilan en cada proceso
+            env["PYTHONPYCACHEPREFIX"] = empty_cache
+            env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd = SRC_DIR, env = env, capture_output = True, text = True
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+
+    if process.returncode != 0:
+        raise RuntimeError(f"'import {module}' ha fallado:\n{process.stderr[-2000:]}")
+
+    modules = parse_importtime(process.stderr)
+    target = next((cumulative for name, _, cumulative in modules if name == module), 0)
+    return {"import_ms": target / 1000, "wall_ms": wall_ms, "modules": modules}
+
+
+def measure(module: str, repeat: int, cold: bool) -> dict:
+    runs = [run_once(module, cold) for _ in range(repeat)]
+    # El desglose es el de la ejecución mediana (la primera puede pagar la caché de disco)
+    runs.sort(key = lambda run: run["import_ms"])
+    median = runs[len(runs) // 2]
+    return {
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "import_min_ms": runs[0]["import_ms"],
+        "wall_ms": statistics.median(run["wall_ms"] for run in runs),
+        "module_count": len(median["modules"]),
+        "modules": median["modules"],
+    }
+
+
+def print_breakdown(modules: list[tuple[str, int, int]], top: int) -> None:
+    print(f"\n{'acumulado ms':>12}  módulo")
+    for name, _, cumulative in sorted(modules, key = lambda m: m[2], reverse = True)[:top]:
+        print(f"{cumulative / 1000:>12.1f}  {name}")
+
+    print(f"\n{'propio ms':>12}  módulo")
+    for name, own, _ in sorted(modules, key = lambda m: m[1], reverse = True)[:top]:
+        print(f"{own / 1000:>12.1f}  {name}")
+
+    # Tiempo propio por paquete de primer nivel: dónde se va el arranque (framework o aplicación)
+    packages = defaultdict(int)
+    for name, own, _ in modules:
+        packages[name.split(".")[0]] += own
+    print(f"\n{'propio ms':>12}  paquete")
+    for package, own in sorted(packages.items(), key = lambda p: p[1], reverse = True)[:top]:
+        print(f"{own / 1000:>12.1f}  {package}")
+
+
+def main():
+    args = parse_args()
+    results = {"precompiled": measure(args.module, args.repeat, cold = False)}
+    if args.cold:
+        results["cold"] = measure(args.module, args.repeat, cold = True)
+
+    print_breakdown(results["precompiled"]["modules"], args.top)
+
+    print(f"\n{'bytecode':<12} {'import ms':>10} {'mín ms':>8} {'proceso ms':>11} {'módulos':>8}")
+    for name, stats in results.items():
+        print(f"{name:<12} {stats['import_ms']:>10.1f} {stats['import_min_ms']:>8.1f} {stats['wall_ms']:>11.1f} {stats['module_count']:>8}")
+    if args.cold:
+        saved = results["cold"]["import_ms"] - results["precompiled"]["import_ms"]
+        print(f"El bytecode precompilado ahorra {saved:.0f} ms por proceso (arranque del contenedor y de cada worker)")
+    print("(Los tiempos con '-X importtime' incluyen su propio coste de medida: compárense entre sí)")
+
+    # Comprobaciones (CI)
+    failures = []
+    imported = {name for name, _, _ in results["precompiled"]["modules"]}
+    for module in filter(None, (m.strip() for m in args.forbid.split(","))):
+        if module in imported:
+            failures.append(f"'{module}' se importa al arrancar y debería cargarse de forma perezosa")
+    if args.budget_ms is not None and results["precompiled"]["import_ms"] > args.budget_ms:
+        failures.append(f"La importación tarda {results['precompiled']['import_ms']:.0f} ms (presupuesto: {args.budget_ms:.0f} ms)")
+
+    if args.save:
+        for stats in results.values():
+            stats.pop("modules")
+        path = save_results("import_time", vars(args), results)
+        print(f"Resultados guardados en {path}")
+
+    if failures:
+        print("\n" + "\n".join(f"FALLO: {failure}" for failure in failures))
+        sys.exit(1)
+    if args.budget_ms is not None:
+        print(f"\nOK: dentro del presupuesto de {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
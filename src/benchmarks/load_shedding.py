@@ -0,0 +1,138 @@
+"""
+Simulación del control de admisión: qué pasa cuando la BD se ralentiza, con y sin limitador.
+
+No necesita MariaDB: la BD es un pool de '--pool' conexiones (un semáforo con 'pool_timeout')
+y cada consulta tarda '--service-ms'. A mitad de la prueba la BD se vuelve '--slowdown' veces
+más lenta durante un tercio del tiempo. Las peticiones llegan a ritmo constante ('--rps', bucle
+abierto: como usuarios reales, no esperan a la respuesta anterior) con una mezcla de
+prioridades: pujas y detalle (CRITICAL), resto (NORMAL) y listados completos (LOW, que
+tardan '--low-cost' veces más).
+
+Para cada prioridad se comparan: latencia p50/p99 de las que terminan bien, rechazos rápidos
+(503) y esperas del pool agotadas (timeouts, que el cliente sufre como 'pool_timeout' segundos
+de espera). Sin limitador todas las rutas acaban esperando el pool; con limitador se rechazan
+pronto las LOW y las CRITICAL mantienen su latencia.
+
+Uso (desde 'src/'):
+    python -m benchmarks.load_shedding
+    python -m benchmarks.load_shedding --rps 400 --slowdown 8 --duration 12 --save
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.infrastructure.db.concurrency_limiter import AdaptiveConcurrencyLimiter, Priority
+from benchmarks.common import percentile, save_results
+
+
+PRIORITY_MIX = [(Priority.CRITICAL, 0.4), (Priority.NORMAL, 0.4), (Priority.LOW, 0.2)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Simulación del limitador adaptativo de concurrencia")
+    parser.add_argument("--rps", type = float, default = 300)
+    parser.add_argument("--duration", type = float, default = 9.0, help = "Segundos de prueba por escenario")
+    parser.add_argument("--pool", type = int, default = 10, help = "Conexiones del pool (por worker)")
+    parser.add_argument("--pool-timeout", type = float, default = 2.0)
+    parser.add_argument("--service-ms", type = float, default = 5.0, help = "Duración de una consulta con la BD sana")
+    parser.add_argument("--low-cost", type = float, default = 4.0, help = "Coste relativo de un listado completo")
+    parser.add_argument("--slowdown", type = float, default = 6.0, help = "Factor de lentitud durante la degradación")
+    parser.add_argument("--seed", type = int, default = 1)
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+class SimulatedDatabase:
+    def __init__(self, pool_size: int, pool_timeout: float, service_s: float, slowdown: float, degraded: tuple[float, float]):
+        self.pool = asyncio.Semaphore(pool_size)
+        self.pool_timeout = pool_timeout
+        self.service_s = service_s
+        self.slowdown = slowdown
+        self.degraded = degraded # (inicio, fin) en segundos desde el arranque
+        self.started = time.perf_counter()
+
+
+    async def query(self, cost: float) -> None:
+        """Espera una conexión (o TimeoutError, como el 'pool_timeout' de SQLAlchemy) y ejecuta la consulta."""
+        await asyncio.wait_for(self.pool.acquire(), self.pool_timeout)
+        try:
+            elapsed = time.perf_counter() - self.started
+            factor = self.slowdown if self.degraded[0] <= elapsed < self.degraded[1] else 1.0
+            await asyncio.sleep(self.service_s * cost * factor)
+        finally:
+            self.pool.release()
+
+
+async def run_scenario(args, limiter: AdaptiveConcurrencyLimiter | None) -> dict:
+    rng = random.Random(args.seed)
+    db = SimulatedDatabase(
+        args.pool, args.pool_timeout, args.service_ms / 1000, args.slowdown,
+        degraded = (args.duration / 3, 2 * args.duration / 3)
+    )
+    stats = {p: {"latencies_ms": [], "shed": 0, "timeouts": 0} for p, _ in PRIORITY_MIX}
+    priorities, weights = zip(*PRIORITY_MIX)
+
+    async def request(priority: Priority) -> None:
+        start = time.perf_counter()
+        if limiter and not limiter.try_acquire(priority):
+            stats[priority]["shed"] += 1
+            return
+        latency = None
+        try:
+            await db.query(args.low_cost if priority == Priority.LOW else 1.0)
+            latency = time.perf_counter() - start
+            stats[priority]["latencies_ms"].append(latency * 1000)
+        except asyncio.TimeoutError:
+            stats[priority]["timeouts"] += 1
+            if limiter:
+                limiter.on_overload()
+        finally:
+            if limiter:
+                limiter.release(latency)
+
+    tasks = []
+    interval = 1 / args.rps
+    next_at = time.perf_counter()
+    end = next_at + args.duration
+    while next_at < end:
+        tasks.append(asyncio.create_task(request(rng.choices(priorities, weights)[0])))
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    await asyncio.gather(*tasks)
+
+    return {
+        priority.name: {
+            "ok": len(s["latencies_ms"]),
+            "shed": s["shed"],
+            "timeouts": s["timeouts"],
+            "p50_ms": percentile(s["latencies_ms"], 50),
+            "p99_ms": percentile(s["latencies_ms"], 99),
+        }
+        for priority, s in stats.items()
+    }
+
+
+def main():
+    args = parse_args()
+    results = {"sin_limitador": asyncio.run(run_scenario(args, None))}
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit = args.pool, min_limit = 2, max_limit = 500)
+    results["con_limitador"] = asyncio.run(run_scenario(args, limiter))
+    results["con_limitador"]["final_state"] = limiter.snapshot()
+
+    print(f"{'escenario':<15} {'prioridad':<9} {'ok':>6} {'503':>6} {'timeout':>8} {'p50 ms':>8} {'p99 ms':>9}")
+    for scenario, by_priority in results.items():
+        for priority, s in by_priority.items():
+            if priority == "final_state":
+                continue
+            print(f"{scenario:<15} {priority:<9} {s['ok']:>6} {s['shed']:>6} {s['timeouts']:>8} {s['p50_ms']:>8.1f} {s['p99_ms']:>9.1f}")
+    print(f"Estado final del limitador: {results['con_limitador']['final_state']}")
+
+    if args.save:
+        path = save_results("load_shedding", vars(args), results)
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark de rendimiento del logging (líneas/segundo).
+
+Compara la implementación anterior (stat del fichero en cada línea, recorrido de la pila
+en cada registro de la librería estándar y write + flush por línea en JSON) con la actual
+de 'app.core.logging_setup'.
+
+Uso (desde 'src/'):
+    python -m benchmarks.logging_throughput --lines 50000
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from app.core.log_rotation import HybridRotation
+from app.core.logging_setup import BatchedStreamSink, InterceptHandler
+from datetime import datetime, timedelta
+from loguru import logger
+
+
+MAX_SIZE_MB = 10
+MAX_AGE_HOURS = 24
+
+
+# --- IMPLEMENTACIONES ANTERIORES (referencia) ---
+def legacy_rotation_logic(message, file):
+    # Tamaño
+    file.seek(0, 2)
+    if file.tell() >= MAX_SIZE_MB * 1024 * 1024:
+        return True
+
+    # Tiempo
+    creation_time = datetime.fromtimestamp(os.path.getctime(file.name))
+    if datetime.now() - creation_time >= timedelta(hours = MAX_AGE_HOURS):
+        return True
+
+    return False
+
+
+class LegacyInterceptHandler(logging.Handler):
+    def emit(self, record):
+        module = "system"
+        if record.name == "uvicorn.access":
+            module = "access"
+
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        frame, depth = logging.currentframe(), 2
+        while frame and frame.f_code.co_filename == logging.__file__:
+            frame = frame.f_back
+            depth += 1
+
+        if not frame:
+            depth = 2
+
+        logger.opt(depth = depth, exception = record.exc_info).bind(module = module).log(level, record.getMessage())
+
+
+# --- ESCENARIOS ---
+def bench_file_sink(rotation, lines: int) -> float:
+    """Líneas/segundo escritas en un fichero con la rotación indicada."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logger.remove()
+        logger.add(os.path.join(tmp, "bench.log"), format = "{message}", rotation = rotation, enqueue = False)
+
+        start = time.perf_counter()
+        for i in range(lines):
+            logger.info("Se va a obtener la subasta con ID {}", i)
+        elapsed = time.perf_counter() - start
+
+        logger.remove()
+    return lines / elapsed
+
+
+def bench_intercept(handler: logging.Handler, logger_name: str, lines: int) -> float:
+    """Líneas/segundo de registros de la librería estándar redirigidos a Loguru."""
+    logger.remove()
+    logger.add(lambda message: None, format = "{message}")
+
+    std_logger = logging.getLogger(logger_name)
+    std_logger.handlers = [handler]
+    std_logger.propagate = False
+    std_logger.setLevel(logging.INFO)
+
+    start = time.perf_counter()
+    for i in range(lines):
+        std_logger.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1:5000", "GET", f"/api/v1/auctions/{i}", "1.1", 200)
+    elapsed = time.perf_counter() - start
+
+    logger.remove()
+    return lines / elapsed
+
+
+def bench_serialized_sink(batched: bool, lines: int) -> float:
+    """Líneas/segundo en JSON hacia una tubería (como el 'stderr' que lee Docker)."""
+    read_fd, write_fd = os.pipe()
+
+    def drain():
+        while os.read(read_fd, 65536):
+            pass
+
+    reader = threading.Thread(target = drain, daemon = True)
+    reader.start()
+    stream = io.TextIOWrapper(io.FileIO(write_fd, "w"), line_buffering = True)
+
+    logger.remove()
+    sink = BatchedStreamSink(stream) if batched else stream
+    logger.add(sink, serialize = True, enqueue = False)
+
+    start = time.perf_counter()
+    for i in range(lines):
+        logger.info("Se va a obtener la subasta con ID {}", i)
+    logger.remove() # Vacía el buffer pendiente
+    elapsed = time.perf_counter() - start
+
+    stream.close()
+    reader.join()
+    os.close(read_fd)
+    return lines / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark de throughput del logging")
+    parser.add_argument("--lines", type = int, default = 50_000)
+    args = parser.parse_args()
+
+    results = {
+        "file_sink": {
+            "before": bench_file_sink(legacy_rotation_logic, args.lines),
+            "after": bench_file_sink(HybridRotation(MAX_SIZE_MB, MAX_AGE_HOURS), args.lines),
+        },
+        "serialized_stderr": {
+            "before": bench_serialized_sink(False, args.lines),
+            "after": bench_serialized_sink(True, args.lines),
+        },
+        "intercept_uvicorn_access": {
+            "before": bench_intercept(LegacyInterceptHandler(), "uvicorn.access", args.lines),
+            "after": bench_intercept(InterceptHandler(), "uvicorn.access", args.lines),
+        },
+        "intercept_uvicorn_error": {
+            "before": bench_intercept(LegacyInterceptHandler(), "uvicorn.error", args.lines),
+            "after": bench_intercept(InterceptHandler(), "uvicorn.error", args.lines),
+        },
+    }
+
+    for name, result in results.items():
+        result["speedup"] = result["after"] / result["before"]
+        print(f"{name:<28} antes: {result['before']:>10,.0f} líneas/s | después: {result['after']:>10,.0f} líneas/s | x{result['speedup']:.2f}")
+
+    print(json.dumps(results, indent = 2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Coste del monitor del bucle de eventos: cuánto trabajo del bucle se pierde por tenerlo activo.
+
+Mide cuántas "peticiones" simuladas (corrutinas con un poco de CPU y un 'await') completa el
+bucle en '--duration' segundos, sin monitor y con él (con el intervalo configurado y con uno
+más agresivo). El monitor despierta una vez por intervalo y el vigilante es un hilo que casi
+siempre duerme: la diferencia debería quedar dentro del ruido de la medida.
+
+Uso (desde 'src/'):
+    python -m benchmarks.loop_monitor
+    python -m benchmarks.loop_monitor --duration 10 --save
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.logging_setup import get_logger
+from app.infrastructure.observability.loop_monitor import EventLoopMonitor
+from benchmarks.common import save_results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Coste del monitor del bucle de eventos")
+    parser.add_argument("--duration", type = float, default = 3.0, help = "Segundos por escenario")
+    parser.add_argument("--concurrency", type = int, default = 50)
+    parser.add_argument("--work", type = int, default = 200, help = "Iteraciones de CPU por petición simulada")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+async def run_scenario(args, interval: float | None) -> dict:
+    monitor_task = None
+    monitor = None
+    if interval is not None:
+        monitor = EventLoopMonitor(
+            interval_seconds = interval,
+            block_threshold_seconds = settings.LOOP_MONITOR_BLOCK_THRESHOLD_MS / 1000,
+            window_seconds = settings.LOOP_MONITOR_WINDOW_SECONDS,
+            max_events = settings.LOOP_MONITOR_MAX_EVENTS,
+            logger = get_logger("runtime")
+        )
+        monitor_task = asyncio.create_task(monitor.run())
+
+    completed = 0
+    end = time.perf_counter() + args.duration
+
+    async def worker():
+        nonlocal completed
+        while time.perf_counter() < end:
+            sum(i * i for i in range(args.work))
+            await asyncio.sleep(0)
+            completed += 1
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    if monitor_task:
+        monitor_task.cancel()
+        await asyncio.gather(monitor_task, return_exceptions = True)
+    return {
+        "requests_per_second": completed / args.duration,
+        "lag_ms": monitor.snapshot(with_events = False)["lag_ms"] if monitor else None,
+    }
+
+
+def main():
+    args = parse_args()
+    scenarios = {
+        "sin_monitor": None,
+        f"intervalo_{settings.LOOP_MONITOR_INTERVAL_SECONDS * 1000:.0f}ms": settings.LOOP_MONITOR_INTERVAL_SECONDS,
+        "intervalo_10ms": 0.01,
+    }
+    results = {name: asyncio.run(run_scenario(args, interval)) for name, interval in scenarios.items()}
+
+    baseline = results["sin_monitor"]["requests_per_second"]
+    print(f"{'escenario':<18} {'peticiones/s':>13} {'coste':>8}")
+    for name, result in results.items():
+        overhead = (1 - result["requests_per_second"] / baseline) * 100
+        result["overhead_pct"] = round(overhead, 2)
+        print(f"{name:<18} {result['requests_per_second']:>13.0f} {overhead:>7.2f}%")
+
+    if args.save:
+        path = save_results("loop_monitor", vars(args), results)
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
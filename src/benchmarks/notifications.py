@@ -0,0 +1,109 @@
+"""
+Benchmark del pipeline de avisos de outbid ('OutbidNotifier').
+
+Simula una ráfaga de pujas en muchas subastas (cada puja supera al líder anterior) contra un
+webhook simulado con latencia, y mide:
+- El coste que paga la petición HTTP por evento (encolar), en microsegundos.
+- Cuántos eventos se agrupan (coalesced), cuántos avisos salen y cuántos se descartan
+  cuando la cola se llena (backpressure).
+
+Uso (desde 'src/'):
+    python -m benchmarks.notifications --events 100000 --auctions 1000 --queue-size 10000 --latency-ms 20
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.application.services.notification_service import OutbidNotifier
+from app.domain.events import BidPlaced
+from app.infrastructure.notifications.channels import MockWebhookChannel
+from benchmarks.common import percentile, save_results
+from decimal import Decimal
+from loguru import logger
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Benchmark de avisos de outbid")
+    parser.add_argument("--events", type = int, default = 100_000)
+    parser.add_argument("--auctions", type = int, default = 1_000)
+    parser.add_argument("--users", type = int, default = 5_000)
+    parser.add_argument("--rate", type = int, default = 20_000, help = "Eventos por segundo que se inyectan")
+    parser.add_argument("--queue-size", type = int, default = 10_000)
+    parser.add_argument("--coalesce-seconds", type = float, default = 1.0)
+    parser.add_argument("--max-in-flight", type = int, default = 100)
+    parser.add_argument("--latency-ms", type = float, default = 20.0)
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+async def run(args) -> dict:
+    logger.remove() # Se mide el pipeline, no la escritura de logs
+    webhook = MockWebhookChannel(latency_ms = args.latency_ms)
+    notifier = OutbidNotifier(
+        channels = [webhook],
+        logger = logger,
+        queue_size = args.queue_size,
+        coalesce_seconds = args.coalesce_seconds,
+        max_in_flight = args.max_in_flight
+    )
+    notifier.start()
+
+    users = [uuid.uuid4() for _ in range(args.users)]
+    auctions = [uuid.uuid4() for _ in range(args.auctions)]
+    leaders: dict[uuid.UUID, uuid.UUID] = {}
+
+    # Eventos generados de antemano: solo se mide la llamada del suscriptor
+    events = []
+    for i in range(args.events):
+        auction_id = auctions[i % len(auctions)]
+        bidder_id = users[(i * 7919) % len(users)]
+        events.append(BidPlaced(
+            bid_id = uuid.uuid4(), auction_id = auction_id, bidder_id = bidder_id,
+            amount = Decimal(i), previous_winner_id = leaders.get(auction_id)
+        ))
+        leaders[auction_id] = bidder_id
+
+    # Inyección por tandas de 1 ms para respetar el ritmo pedido y ceder el loop al worker
+    samples = []
+    per_tick = max(1, args.rate // 1000)
+    start = time.perf_counter()
+    for offset in range(0, len(events), per_tick):
+        for event in events[offset:offset + per_tick]:
+            t0 = time.perf_counter()
+            notifier.on_bid_placed(event)
+            samples.append((time.perf_counter() - t0) * 1_000_000)
+        await asyncio.sleep(0.001)
+    inject_s = time.perf_counter() - start
+
+    await notifier.stop()
+    total_s = time.perf_counter() - start
+
+    return {
+        "events": args.events,
+        "inject_s": inject_s,
+        "total_s": total_s,
+        "enqueue_p50_us": percentile(samples, 50),
+        "enqueue_p99_us": percentile(samples, 99),
+        **notifier.stats,
+    }
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    print(f"Eventos: {results['events']} en {results['inject_s']:.2f} s (vaciado completo en {results['total_s']:.2f} s)")
+    print(f"Coste por evento en la petición: p50 {results['enqueue_p50_us']:.2f} µs, p99 {results['enqueue_p99_us']:.2f} µs")
+    print(
+        f"Recibidos {results['received']}, agrupados {results['coalesced']}, enviados {results['sent']}, "
+        f"fallidos {results['failed']}, descartados por cola llena {results['dropped']}"
+    )
+
+    if args.save:
+        path = save_results("notifications", vars(args), {"outbid": results})
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark del outbox de eventos y comprobación de la entrega "al menos una vez".
+
+1. Throughput: inserta N eventos en el outbox y mide cuánto tarda el relay en vaciarlo
+   hacia un NdjsonFileSink, para varios tamaños de lote (con y sin fsync).
+2. Entrega al menos una vez: repite el vaciado con un destino que falla a propósito
+   (antes de escribir y después de escribir pero antes del borrado, como una caída del proceso)
+   y con dos relays concurrentes. Verifica que todos los eventos llegan y cuenta los duplicados.
+   (SQLite ignora 'FOR UPDATE SKIP LOCKED': ahí los dos relays leen los mismos lotes y duplican;
+   en MariaDB se reparten las filas.)
+
+Por defecto usa un SQLite temporal (requiere 'aiosqlite'); '--db-url' para MariaDB.
+
+Uso (desde 'src/'):
+    python -m benchmarks.outbox_relay --events 20000 --batch-sizes 50,500,2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from benchmarks.common import save_results
+from decimal import Decimal
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Benchmark del relay del outbox")
+    parser.add_argument("--db-url", default = None, help = "URL de la BD (por defecto, SQLite temporal)")
+    parser.add_argument("--events", type = int, default = 10_000)
+    parser.add_argument("--batch-sizes", default = "50,500,2000")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+async def seed_outbox(session_factory, events: int) -> float:
+    """Inserta 'events' eventos BidPlaced con el repositorio real. Devuelve eventos/s."""
+    from app.domain.events import BidPlaced
+    from app.infrastructure.db.repositories.sqlalchemy_outbox_repository import SQLAlchemyOutboxRepository
+
+    start = time.perf_counter()
+    async with session_factory() as session:
+        repo = SQLAlchemyOutboxRepository(session)
+        for i in range(events):
+            await repo.add(BidPlaced(bid_id = uuid.uuid4(), auction_id = uuid.uuid4(), bidder_id = uuid.uuid4(), amount = Decimal(i)))
+            if i % 1000 == 999:
+                await session.flush()
+        await session.commit()
+    return events / (time.perf_counter() - start)
+
+
+async def outbox_ids(session_factory) -> set[int]:
+    from app.infrastructure.db.models.outbox_orm import OutboxORM
+    from sqlalchemy import select
+
+    async with session_factory() as session:
+        return set((await session.execute(select(OutboxORM.id))).scalars().all())
+
+
+def delivered_ids(path: Path) -> list[int]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+async def drain(relay) -> None:
+    """Vacía el outbox como lo haría 'OutboxRelay.run', reintentando los lotes fallidos."""
+    while True:
+        try:
+            if await relay.relay_once() == 0:
+                return
+        except RuntimeError:
+            pass # Fallo provocado: el lote se reintenta
+
+
+# --- THROUGHPUT ---
+async def throughput(session_factory, workdir: Path, args) -> dict:
+    from app.infrastructure.events.outbox_relay import OutboxRelay
+    from app.infrastructure.events.sinks import NdjsonFileSink
+
+    results = {}
+    for fsync in (False, True):
+        for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+            insert_rate = await seed_outbox(session_factory, args.events)
+            path = workdir / f"throughput-{batch_size}-{fsync}.ndjson"
+            sink = NdjsonFileSink(path, fsync = fsync)
+            relay = OutboxRelay(session_factory, sink, batch_size = batch_size)
+
+            start = time.perf_counter()
+            await drain(relay)
+            elapsed = time.perf_counter() - start
+            await sink.close()
+
+            assert len(delivered_ids(path)) == args.events, "El relay no ha publicado todos los eventos"
+            results[f"batch_{batch_size}{'_fsync' if fsync else ''}"] = {
+                "events": args.events,
+                "insert_events_per_s": insert_rate,
+                "relay_events_per_s": args.events / elapsed,
+            }
+    return results
+
+
+# --- ENTREGA AL MENOS UNA VEZ ---
+async def at_least_once(session_factory, workdir: Path, events: int) -> dict:
+    from app.application.ports.event_sink import EventSink
+    from app.infrastructure.events.outbox_relay import OutboxRelay
+    from app.infrastructure.events.sinks import NdjsonFileSink
+
+    class FlakySink(EventSink):
+        """Falla 1 de cada 3 lotes antes de escribir y 1 de cada 3 después (simula una caída antes del borrado)."""
+        def __init__(self, inner: EventSink):
+            self.inner = inner
+            self.calls = 0
+
+        async def publish(self, messages):
+            self.calls += 1
+            if self.calls % 3 == 1:
+                raise RuntimeError("Fallo antes de publicar")
+            await self.inner.publish(messages)
+            if self.calls % 3 == 2:
+                raise RuntimeError("Caída después de publicar")
+
+        async def close(self):
+            await self.inner.close()
+
+    checks = {}
+    for name, relays in (("flaky_sink", 1), ("two_relays", 2)):
+        await seed_outbox(session_factory, events)
+        expected = await outbox_ids(session_factory)
+        path = workdir / f"{name}.ndjson"
+        sinks = [NdjsonFileSink(path, fsync = False) for _ in range(relays)]
+        if name == "flaky_sink":
+            sinks = [FlakySink(s) for s in sinks]
+
+        await asyncio.gather(*(drain(OutboxRelay(session_factory, sink, batch_size = 100)) for sink in sinks))
+        for sink in sinks:
+            await sink.close()
+
+        delivered = delivered_ids(path)
+        lost = expected - set(delivered)
+        checks[name] = {
+            "events": len(expected),
+            "delivered": len(delivered),
+            "lost": len(lost),
+            "duplicates": len(delivered) - len(set(delivered)),
+            "pending_in_outbox": len(await outbox_ids(session_factory)),
+            "ok": not lost and not await outbox_ids(session_factory),
+        }
+    return checks
+
+
+async def run(args, workdir: Path) -> dict:
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db.models.outbox_orm import OutboxORM # noqa: F401 (registra la tabla)
+    from app.infrastructure.db.session import AsyncSessionLocal, engine
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        results = await throughput(AsyncSessionLocal, workdir, args)
+        results["at_least_once"] = await at_least_once(AsyncSessionLocal, workdir, min(args.events, 2_000))
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main():
+    args = parse_args()
+
+    # La URL debe fijarse antes de importar la aplicación (Settings se instancia al importar)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["DB_URL"] = args.db_url or f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        results = asyncio.run(run(args, Path(tmp_dir)))
+
+    checks = results.pop("at_least_once")
+    print(f"{'escenario':<18} {'inserción ev/s':>15} {'relay ev/s':>12}")
+    for scenario, stats in results.items():
+        print(f"{scenario:<18} {stats['insert_events_per_s']:>15.0f} {stats['relay_events_per_s']:>12.0f}")
+
+    print("\nEntrega al menos una vez:")
+    for name, check in checks.items():
+        status = "OK" if check["ok"] else "FALLO"
+        print(
+            f"  {name:<12} {status}: {check['events']} eventos, {check['delivered']} entregas, "
+            f"{check['lost']} perdidos, {check['duplicates']} duplicados"
+        )
+
+    if args.save:
+        results["at_least_once"] = checks
+        path = save_results("outbox_relay", {k: v for k, v in vars(args).items() if k != "db_url"}, results)
+        print(f"Resultados guardados en {path}")
+
+    if not all(check["ok"] for check in checks.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
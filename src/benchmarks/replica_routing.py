@@ -0,0 +1,143 @@
+"""
+Comprobación del enrutado de lecturas primaria/réplica con dos BD locales.
+
+Levanta la aplicación con dos SQLite (o dos MariaDB con '--db-url' y '--read-url') y simula
+la replicación copiando la primaria sobre la réplica en momentos concretos. Comprueba que:
+1. Una lectura anónima va a la réplica (y ve los datos de la última "replicación").
+2. Quien acaba de pujar lee de la primaria y ve su puja (read-your-writes).
+3. Cuando el retraso de la réplica supera el máximo, todas las lecturas van a la primaria.
+
+Con MariaDB, la replicación debe estar configurada de verdad: el paso de copia se omite y
+los casos 1 y 3 dependen del retraso real.
+
+Uso (desde 'src/'):
+    python -m benchmarks.replica_routing
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+
+PASSWORD = "replica-password"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Comprobación del enrutado a la réplica")
+    parser.add_argument("--db-url", default = None, help = "URL de la primaria (por defecto, SQLite temporal)")
+    parser.add_argument("--read-url", default = None, help = "URL de la réplica (por defecto, SQLite temporal)")
+    parser.add_argument("--max-lag", type = float, default = 2.0)
+    return parser.parse_args()
+
+
+async def run(args, primary_path: str | None, replica_path: str | None) -> dict:
+    import httpx
+
+    from app.core.config import settings
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db.routing import replica_router
+    from app.infrastructure.db.session import engine, read_engine
+    from main import create_application
+
+    for target in (engine, read_engine):
+        async with target.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def replicate():
+        """Simula la replicación: la réplica pasa a ser una copia exacta de la primaria."""
+        if primary_path:
+            await read_engine.dispose() # Las conexiones abiertas verían el fichero antiguo
+            shutil.copyfile(primary_path, replica_path)
+        await replica_router.monitor.measure()
+
+    app = create_application()
+    api = settings.API_V1_STR
+    transport = httpx.ASGITransport(app = app)
+    checks = {}
+
+    try:
+        async with app.router.lifespan_context(app), httpx.AsyncClient(transport = transport, base_url = "http://replica") as client:
+            # Datos de partida en la primaria
+            tokens = {}
+            for name in ("seller", "bidder"):
+                await client.post(f"{api}/users/", json = {"username": name, "email": f"{name}@example.com", "password": PASSWORD})
+                response = await client.post(f"{api}/auth/login", data = {"username": name, "password": PASSWORD})
+                tokens[name] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            response = await client.post(
+                f"{api}/auctions/",
+                json = {"title": "Subasta replicada", "description": "-", "starting_price": "10", "end_time": "2099-01-01T00:00:00Z"},
+                headers = tokens["seller"]
+            )
+            auction_id = response.json()["id"]
+            await replicate()
+
+            # 1. Lectura anónima -> réplica. Una subasta creada después de replicar no se ve
+            await client.post(
+                f"{api}/auctions/",
+                json = {"title": "Sin replicar", "description": "-", "starting_price": "10", "end_time": "2099-01-01T00:00:00Z"},
+                headers = tokens["seller"]
+            )
+            before = dict(replica_router.stats)
+            titles = [a["title"] for a in (await client.get(f"{api}/auctions/")).json()]
+            checks["anonymous_read_uses_replica"] = replica_router.stats["replica"] == before["replica"] + 1 and "Sin replicar" not in titles
+
+            # 2. Quien acaba de pujar lee de la primaria y ve su puja; un anónimo (réplica) todavía no
+            await client.post(f"{api}/bids/", json = {"amount": "25", "auction_id": auction_id}, headers = tokens["bidder"])
+            own = (await client.get(f"{api}/bids/auction/{auction_id}", headers = tokens["bidder"])).json()
+            anonymous = (await client.get(f"{api}/bids/auction/{auction_id}")).json()
+            checks["writer_reads_own_bid"] = len(own) == 1
+            checks["others_read_replica"] = len(anonymous) == 0
+
+            # 3. Réplica retrasada -> todo a la primaria
+            if primary_path:
+                await asyncio.sleep(args.max_lag + 0.5)
+                await replica_router.monitor.measure()
+            lagging = replica_router.monitor.lag_seconds > args.max_lag
+            anonymous = (await client.get(f"{api}/bids/auction/{auction_id}")).json()
+            checks["lagging_replica_falls_back_to_primary"] = lagging and len(anonymous) == 1
+
+            checks["routing_stats"] = dict(replica_router.stats)
+    finally:
+        await engine.dispose()
+        await read_engine.dispose()
+    return checks
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        primary_path = replica_path = None
+        if not args.db_url:
+            primary_path = os.path.join(tmp_dir, "primary.db")
+            replica_path = os.path.join(tmp_dir, "replica.db")
+            args.db_url = f"sqlite+aiosqlite:///{primary_path}"
+            args.read_url = f"sqlite+aiosqlite:///{replica_path}"
+
+        # La configuración debe fijarse antes de importar la aplicación (Settings se instancia al importar)
+        os.environ.update({
+            "DB_URL": args.db_url,
+            "DB_READ_URL": args.read_url,
+            "DB_REPLICA_MAX_LAG_SECONDS": str(args.max_lag),
+            "DB_REPLICA_LAG_CHECK_SECONDS": "3600", # Las mediciones las dispara el script
+            "REPOSITORY_BACKEND": "sqlalchemy",
+            "OUTBOX_RELAY_INTERVAL_SECONDS": "0",
+            "AUCTION_CLOSE_INTERVAL_SECONDS": "0",
+        })
+        start = time.perf_counter()
+        checks = asyncio.run(run(args, primary_path, replica_path))
+
+    stats = checks.pop("routing_stats")
+    for name, ok in checks.items():
+        print(f"{'OK   ' if ok else 'FALLO'} {name}")
+    print(f"Lecturas: {stats['replica']} a la réplica, {stats['primary']} a la primaria ({time.perf_counter() - start:.1f} s)")
+
+    if not all(checks.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Peticiones por segundo frente al nº de workers del servidor de producción ('serve.py').
+
+Para cada nº de workers arranca 'python serve.py' como un proceso aparte (puerto libre, SQLite
+temporal sembrado) y lo carga durante '--duration' segundos desde '--client-procs' procesos
+cliente con conexiones keep-alive. Por escenario mide throughput, p50 y p99, y la eficiencia
+del escalado respecto a un worker. Con '--compare-stack' mide también un worker con el bucle
+y el parser HTTP por defecto de Python (asyncio + h11), como referencia de uvloop + httptools.
+
+Los clientes corren en la misma máquina y compiten por la CPU con el servidor: el escalado
+medido es una cota inferior. Para cifras reales, lanzar la carga desde otra máquina.
+
+Uso (desde 'src/'):
+    python -m benchmarks.server_workers --workers 1,2,4 --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import percentile, save_results
+from pathlib import Path
+from types import SimpleNamespace
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+SCENARIOS = ["health", "get_auction", "list_auctions"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Throughput de 'serve.py' según el nº de workers")
+    parser.add_argument("--workers", default = "1,2,4", help = "Lista de nº de workers, separados por comas")
+    parser.add_argument("--concurrency", type = int, default = 64, help = "Conexiones simultáneas en total")
+    parser.add_argument("--duration", type = float, default = 10.0, help = "Segundos por escenario")
+    parser.add_argument("--client-procs", type = int, default = 0, help = "Procesos cliente (0 = uno por CPU, máx. 4)")
+    parser.add_argument("--scenarios", default = ",".join(SCENARIOS))
+    parser.add_argument("--compare-stack", action = "store_true", help = "Medir también 1 worker con asyncio + h11")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+# --- SERVIDOR ---
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env: dict, port: int) -> subprocess.Popen:
+    """Arranca 'serve.py' y espera a que responda '/health'."""
+    import httpx
+
+    process = subprocess.Popen(
+        [sys.executable, "serve.py"], cwd = SRC_DIR, env = env,
+        stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El servidor ha terminado al arrancar (código {process.returncode})")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout = 1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("El servidor no ha arrancado a tiempo")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout = 40)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# --- CLIENTES (en procesos aparte) ---
+async def _client_load(base_url: str, paths: list[str], connections: int, duration: float) -> tuple[list[float], int]:
+    import httpx
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections = connections, max_keepalive_connections = connections)
+
+    async with httpx.AsyncClient(base_url = base_url, limits = limits, timeout = 30) as client:
+        async def worker(w: int):
+            nonlocal errors
+            i = w
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+                i += connections
+
+        await asyncio.gather(*(worker(w) for w in range(connections)))
+    return latencies, errors
+
+
+def client_process(params: tuple) -> tuple[list[float], int]:
+    return asyncio.run(_client_load(*params))
+
+
+def run_load(port: int, paths: list[str], args, client_procs: int) -> dict:
+    connections = max(1, args.concurrency // client_procs)
+    params = [(f"http://127.0.0.1:{port}", paths, connections, args.duration)] * client_procs
+
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(client_procs) as pool:
+        outputs = pool.map(client_process, params)
+    elapsed = time.perf_counter() - start
+
+    latencies = [l for output, _ in outputs for l in output]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in outputs),
+        "throughput_rps": len(latencies) / args.duration,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "wall_s": elapsed,
+    }
+
+
+# --- DATOS ---
+async def prepare_database(db_url: str) -> list[str]:
+    """Crea el esquema, siembra datos con el sembrado de 'api_load' y devuelve los IDs de subasta."""
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db.session import AsyncSessionLocal, engine
+    from benchmarks.api_load import seed
+
+    import init_db # noqa: F401 (registra todos los modelos en Base.metadata)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        data = await seed(AsyncSessionLocal, SimpleNamespace(users = 50, auctions = 200, bids_per_auction = 10))
+    finally:
+        await engine.dispose()
+    return [str(auction_id) for auction_id, _ in data["auctions"]]
+
+
+def main():
+    args = parse_args()
+    cpus = os.cpu_count() or 1
+    client_procs = args.client_procs or min(4, cpus)
+    scenarios = args.scenarios.split(",")
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir.name, 'workers.db')}"
+    os.environ["DB_URL"] = db_url
+    os.environ["REPOSITORY_BACKEND"] = "sqlalchemy"
+
+    from app.core.config import settings
+
+    auction_ids = asyncio.run(prepare_database(db_url))
+    api = settings.API_V1_STR
+    paths = {
+        "health": ["/health"],
+        "get_auction": [f"{api}/auctions/{auction_id}" for auction_id in auction_ids],
+        "list_auctions": [f"{api}/auctions/"],
+    }
+
+    runs = [(int(n), "uvloop", "httptools") for n in args.workers.split(",")]
+    if args.compare_stack:
+        runs.insert(0, (1, "asyncio", "h11"))
+
+    results = {}
+    try:
+        for workers, loop, http in runs:
+            port = free_port()
+            env = {
+                **os.environ,
+                "SERVER_HOST": "127.0.0.1", "SERVER_PORT": str(port), "SERVER_WORKERS": str(workers),
+                "SERVER_LOOP": loop, "SERVER_HTTP": http, "SERVER_MAX_REQUESTS": "0",
+                # Sin tareas de fondo: solo se mide el servicio de peticiones
+                "AUCTION_CLOSE_INTERVAL_SECONDS": "0", "OUTBOX_RELAY_INTERVAL_SECONDS": "0",
+            }
+            process = start_server(env, port)
+            try:
+                for scenario in scenarios:
+                    name = f"{workers}w_{loop}_{http}_{scenario}"
+                    results[name] = run_load(port, paths[scenario], args, client_procs)
+                    results[name].update(workers = workers, loop = loop, http = http, scenario = scenario)
+                    print(f"{name}: {results[name]['throughput_rps']:.0f} req/s")
+            finally:
+                stop_server(process)
+    finally:
+        tmp_dir.cleanup()
+
+    print(f"\nCPUs: {cpus}, procesos cliente: {client_procs}, conexiones: {args.concurrency}")
+    if cpus == 1:
+        print("Con una sola CPU más workers no pueden escalar (y los clientes compiten con ellos)")
+    print(f"{'workers':>7} {'stack':<18} {'escenario':<14} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errores':>8} {'escala':>7}")
+    for stats in results.values():
+        base = results.get(f"1w_uvloop_httptools_{stats['scenario']}")
+        scale = stats["throughput_rps"] / base["throughput_rps"] if base and base["throughput_rps"] else 0.0
+        print(
+            f"{stats['workers']:>7} {stats['loop'] + '+' + stats['http']:<18} {stats['scenario']:<14} "
+            f"{stats['throughput_rps']:>9.0f} {stats['p50_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['errors']:>8} {scale:>6.2f}x"
+        )
+
+    if args.save:
+        config = {k: v for k, v in vars(args).items()}
+        config.update(cpus = cpus, client_procs = client_procs)
+        path = save_results("server_workers", config, results)
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Micro-benchmark de la capa de servicios sin base de datos.
+
+Usa los repositorios en memoria ('app.infrastructure.memory') para medir el coste propio de
+AuctionService y BidService (dominio, mapeos, logging) en microsegundos por operación,
+separado de la latencia de MariaDB.
+
+Uso (desde 'src/'):
+    python -m benchmarks.service_bench --auctions 1000 --bids-per-auction 50 --ops 20000
+"""
+import argparse
+import asyncio
+import time
+
+from app.application.services.auction_service import AuctionService
+from app.application.services.bid_service import BidService
+from app.application.services.trending_service import TrendingTracker
+from app.api.v1.schemas.bid import BidCreate
+from app.domain.models.auction import Auction
+from app.domain.models.bid import Bid
+from app.domain.models.user import User
+from app.infrastructure.memory.repositories.in_memory_auction_repository import InMemoryAuctionRepository
+from app.infrastructure.memory.repositories.in_memory_bid_repository import InMemoryBidRepository
+from app.infrastructure.memory.store import InMemoryStore
+from app.infrastructure.memory.unit_of_work import InMemoryUnitOfWork
+from benchmarks.common import percentile, save_results
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from loguru import logger
+from uuid import uuid4
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Micro-benchmark de servicios con repositorios en memoria")
+    parser.add_argument("--users", type = int, default = 100)
+    parser.add_argument("--auctions", type = int, default = 1000)
+    parser.add_argument("--bids-per-auction", type = int, default = 20)
+    parser.add_argument("--ops", type = int, default = 10_000, help = "Operaciones por escenario")
+    parser.add_argument("--trending-auctions", type = int, default = 100_000, help = "Subastas distintas que reciben pujas en el ranking")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+def seed(store: InMemoryStore, args) -> tuple[list[User], list[Auction]]:
+    now = datetime.now(timezone.utc)
+    users = [User(username = f"user_{i}", email = f"user_{i}@example.com", password_hash = "x") for i in range(args.users)]
+    auctions = []
+
+    for user in users:
+        store.users[user.id] = user
+        store.user_ids_by_email[user.email] = user.id
+        store.user_ids_by_username[user.username] = user.id
+
+    for i in range(args.auctions):
+        auction = Auction(
+            title = f"Subasta {i}",
+            description = None,
+            starting_price = Decimal("10.00"),
+            start_time = now - timedelta(hours = 1),
+            end_time = now + timedelta(days = 7),
+            seller_id = users[i % len(users)].id
+        )
+        for j in range(args.bids_per_auction):
+            bidder = users[(i + j + 1) % len(users)]
+            bid = Bid(amount = Decimal("10.00") + j + 1, auction_id = auction.id, bidder_id = bidder.id)
+            store.bids[bid.id] = bid
+            store.index_bid(bid)
+            auction.current_price, auction.winner_id = bid.amount, bid.bidder_id
+        store.auctions[auction.id] = auction
+        auctions.append(auction)
+
+    return users, auctions
+
+
+async def measure(ops: int, operation) -> dict:
+    """Ejecuta 'operation(i)' en serie y devuelve la latencia por operación en microsegundos."""
+    samples = []
+    start = time.perf_counter()
+    for i in range(ops):
+        t0 = time.perf_counter()
+        await operation(i)
+        samples.append((time.perf_counter() - t0) * 1_000_000)
+    elapsed = time.perf_counter() - start
+    return {
+        "ops": ops,
+        "ops_per_s": ops / elapsed,
+        "p50_us": percentile(samples, 50),
+        "p99_us": percentile(samples, 99),
+    }
+
+
+async def run(args) -> dict:
+    store = InMemoryStore()
+    users, auctions = seed(store, args)
+
+    # Sin sinks: se mide el servicio, no la escritura de logs
+    logger.remove()
+    auction_repo = InMemoryAuctionRepository(store)
+    bid_repo = InMemoryBidRepository(store)
+    uow = InMemoryUnitOfWork()
+    auction_service = AuctionService(auction_repo, logger.bind(module = "auctions"), uow)
+    bid_service = BidService(logger.bind(module = "bids"), bid_repo, auction_repo, uow)
+
+    results = {}
+    results["get_auction"] = await measure(args.ops, lambda i: auction_service.get_auction(auctions[i % len(auctions)].id))
+    results["bid_history"] = await measure(args.ops, lambda i: bid_service.get_auction_bids(auctions[i % len(auctions)].id))
+    results["list_auctions"] = await measure(max(1, args.ops // 100), lambda i: auction_service.list_auctions())
+
+    placed = []
+
+    async def place_bid(i):
+        auction = auctions[i % len(auctions)]
+        bidder = users[(i + 1) % len(users)]
+        if bidder.id == auction.seller_id:
+            bidder = users[(i + 2) % len(users)]
+        bid = await bid_service.place_bid(BidCreate(amount = Decimal(1_000 + i), auction_id = auction.id), auction.id, bidder.id)
+        placed.append(bid)
+
+    results["place_bid"] = await measure(args.ops, place_bid)
+    results["retract_bid"] = await measure(len(placed), lambda i: bid_service.retract_bid(placed[i].id, placed[i].bidder_id))
+
+    # Ranking en tendencia: más subastas distintas que la cota, para medir también el descarte
+    tracker = TrendingTracker(window_seconds = 900, bucket_seconds = 30, max_tracked = 10_000, snapshot_seconds = 0, max_k = 50)
+    trending_ids = [uuid4() for _ in range(args.trending_auctions)]
+
+    async def record(i):
+        tracker.record(trending_ids[(i * 7919) % len(trending_ids)])
+
+    async def top(i):
+        tracker.top(10)
+
+    results["trending_record"] = await measure(max(args.ops, args.trending_auctions), record)
+    results["trending_top"] = await measure(max(1, args.ops // 100), top)
+    print(f"Subastas en el ranking: {tracker.tracked} (cota {tracker.max_tracked})")
+    return results
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    print(f"{'escenario':<16} {'ops/s':>12} {'p50 µs':>10} {'p99 µs':>10}")
+    for scenario, stats in results.items():
+        print(f"{scenario:<16} {stats['ops_per_s']:>12.0f} {stats['p50_us']:>10.1f} {stats['p99_us']:>10.1f}")
+
+    if args.save:
+        path = save_results("service_bench", vars(args), results)
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
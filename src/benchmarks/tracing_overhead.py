@@ -0,0 +1,119 @@
+"""
+Coste de las trazas en el camino caliente: 'BidService.place_bid' con repositorios en memoria.
+
+Sin BD, el coste de la instrumentación no queda escondido detrás de la latencia de MariaDB:
+es el peor caso relativo. Escenarios (mismo servicio y mismos datos):
+- sin_trazas: 'TRACING_ENABLED=false' (los objetos no se envuelven).
+- sin_muestreo: objetos envueltos, petición no muestreada (el coste de cada petición no trazada).
+- muestreo_100: todas las peticiones trazadas (span raíz, servicio y repositorios), más el
+  coste de convertir y escribir los spans en NDJSON, medido aparte.
+
+Uso (desde 'src/'):
+    python -m benchmarks.tracing_overhead
+    python -m benchmarks.tracing_overhead --ops 50000 --save
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from app.application.services.bid_service import BidService
+from app.api.v1.schemas.bid import BidCreate
+from app.infrastructure.events.sinks import NdjsonFileSink
+from app.infrastructure.memory.repositories.in_memory_auction_repository import InMemoryAuctionRepository
+from app.infrastructure.memory.repositories.in_memory_bid_repository import InMemoryBidRepository
+from app.infrastructure.memory.store import InMemoryStore
+from app.infrastructure.memory.unit_of_work import InMemoryUnitOfWork
+from app.infrastructure.observability.tracing import TracedProxy, Tracer, current_span
+from benchmarks.common import save_results
+from benchmarks.service_bench import measure, seed
+from decimal import Decimal
+from loguru import logger
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Coste de las trazas en 'place_bid'")
+    parser.add_argument("--users", type = int, default = 100)
+    parser.add_argument("--auctions", type = int, default = 1000)
+    parser.add_argument("--bids-per-auction", type = int, default = 20)
+    parser.add_argument("--ops", type = int, default = 20_000, help = "Pujas por escenario")
+    parser.add_argument("--save", action = "store_true", help = "Guardar el resultado en JSON")
+    return parser.parse_args()
+
+
+def build_service(store: InMemoryStore, instrumented: bool) -> BidService:
+    wrap = (lambda target, kind: TracedProxy(target, kind)) if instrumented else (lambda target, kind: target)
+    auction_repo = wrap(InMemoryAuctionRepository(store), "repository")
+    bid_repo = wrap(InMemoryBidRepository(store), "repository")
+    uow = wrap(InMemoryUnitOfWork(), "unit_of_work")
+    return wrap(BidService(logger.bind(module = "bids"), bid_repo, auction_repo, uow), "service")
+
+
+async def run_scenario(args, instrumented: bool, sample_rate: float) -> tuple[dict, Tracer]:
+    store = InMemoryStore()
+    users, auctions = seed(store, args)
+    service = build_service(store, instrumented)
+    tracer = Tracer(sample_rate = sample_rate, max_spans_per_trace = 500, max_queued_spans = 10 * args.ops)
+
+    async def place_bid(i):
+        auction = auctions[i % len(auctions)]
+        bidder = users[(i + 1) % len(users)]
+        if bidder.id == auction.seller_id:
+            bidder = users[(i + 2) % len(users)]
+        bid_in = BidCreate(amount = Decimal(1_000 + i), auction_id = auction.id)
+
+        # Lo que hace 'TracingMiddleware' en cada petición
+        root = tracer.start_trace("POST /api/v1/bids/") if instrumented else None
+        if root is None:
+            await service.place_bid(bid_in, auction.id, bidder.id)
+            return
+        token = current_span.set(root)
+        try:
+            await service.place_bid(bid_in, auction.id, bidder.id)
+        finally:
+            current_span.reset(token)
+            tracer.end_trace(root)
+
+    return await measure(args.ops, place_bid), tracer
+
+
+async def run(args) -> dict:
+    logger.remove() # Sin sinks: se mide la instrumentación, no la escritura de logs
+    results = {}
+    scenarios = {"sin_trazas": (False, 0.0), "sin_muestreo": (True, 0.0), "muestreo_100": (True, 1.0)}
+    for name, (instrumented, sample_rate) in scenarios.items():
+        results[name], tracer = await run_scenario(args, instrumented, sample_rate)
+
+        if tracer.sampled:
+            with tempfile.TemporaryDirectory() as tmp:
+                sink = NdjsonFileSink(Path(tmp) / "traces.ndjson", fsync = False)
+                start = time.perf_counter()
+                spans = await tracer.flush(sink)
+                elapsed = time.perf_counter() - start
+                await sink.close()
+            results[name]["spans_per_trace"] = spans / tracer.sampled
+            results[name]["export_us_per_trace"] = elapsed * 1_000_000 / tracer.sampled
+    return results
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(run(args))
+
+    baseline = results["sin_trazas"]["p50_us"]
+    print(f"{'escenario':<14} {'ops/s':>10} {'p50 µs':>8} {'p99 µs':>8} {'+p50 µs':>8} {'export µs/traza':>16}")
+    for name, stats in results.items():
+        export = f"{stats['export_us_per_trace']:.1f}" if "export_us_per_trace" in stats else "-"
+        print(
+            f"{name:<14} {stats['ops_per_s']:>10.0f} {stats['p50_us']:>8.1f} {stats['p99_us']:>8.1f} "
+            f"{stats['p50_us'] - baseline:>8.1f} {export:>16}"
+        )
+
+    if args.save:
+        path = save_results("tracing_overhead", vars(args), results)
+        print(f"Resultados guardados en {path}")
+
+
+if __name__ == "__main__":
+    main()
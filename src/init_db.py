@@ -1,6 +1,11 @@
 import asyncio
 import logging
 
+from alembic import command
+from alembic.config import Config
+from pathlib import Path
+from sqlalchemy import inspect
+
 # 1. Configuración básica de logs para ver qué pasa
 logging.basicConfig(level = logging.INFO)
 logger = logging.getLogger("DB_INIT")
@@ -11,33 +16,58 @@ from app.infrastructure.db.base import Base
 
 # 3. Importaciones obligatorias de modelos
 # Aunque tengamos __init__.py, aquí prefiero ser explícito
-# Si no se importa esto, las tablas no se crean
+# Si no se importa esto, las tablas no se registran en Base.metadata
+# (los benchmarks importan este módulo para crear el esquema con 'create_all')
 from app.infrastructure.db.models.user_orm import UserORM
 from app.infrastructure.db.models.auction_orm import AuctionORM
 from app.infrastructure.db.models.bid_orm import BidORM
+from app.infrastructure.db.models.auction_image_orm import AuctionImageORM
+from app.infrastructure.db.models.bid_archive_orm import BidArchiveORM
+from app.infrastructure.db.models.outbox_orm import OutboxORM
+from app.infrastructure.db.models.replication_heartbeat_orm import ReplicationHeartbeatORM
+from app.infrastructure.db.models.auth_session_orm import AuthSessionORM
+
 
+# Revisión que corresponde a las BDs creadas con 'create_all' antes de usar Alembic
+BASELINE_REVISION = "0001"
 
-async def init_db():
-    logger.info("⌛ Iniciando la creación de tablas en la Base de Datos...")
 
+async def has_unversioned_schema() -> bool:
+    """True si la BD ya tiene las tablas pero nunca ha pasado por Alembic."""
     try:
-        async with engine.begin() as conn:
-            # Opcional: Descomentar esto si se quiere BORRAR todo y empezar de cero
-            # logger.warning("⚠️ Borrando tablas existentes...")
-            # await conn.run_sync(Base.metadata.drop_all)
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+    finally:
+        await engine.dispose()
+    return "users" in tables and "alembic_version" not in tables
+
+
+def init_db():
+    """
+    Crea o actualiza el esquema con las migraciones de Alembic ('migrations/').
+    Los cambios de esquema ya no se hacen con 'create_all': sobre tablas existentes no añade
+    índices ni columnas, y las migraciones crean los índices sin bloquear las tablas.
+    """
+    logger.info("⌛ Aplicando las migraciones de la Base de Datos...")
 
-            logger.info("🛠️ Creando tablas...")
-            await conn.run_sync(Base.metadata.create_all)
+    config = Config(str(Path(__file__).resolve().parent / "alembic.ini"))
+    config.attributes["skip_logging_config"] = True # Se mantiene la configuración de logs de arriba
 
-        logger.info("✅ ¡Éxito! Tablas creadas: Users, Auctions, Bids.")
+    try:
+        if asyncio.run(has_unversioned_schema()):
+            logger.warning(f"⚠️ BD creada sin Alembic: se marca como la revisión {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+
+        logger.info("🛠️ Migrando hasta la última revisión...")
+        command.upgrade(config, "head")
+
+        logger.info("✅ ¡Éxito! Esquema al día: Users, Auctions, Auction Images, Bids, Bids Archive, Outbox, Replication Heartbeat, Auth Sessions.")
     
     except Exception as e:
-        logger.error(f"❌ Error crítico creando la base de datos: {e}")
+        logger.error(f"❌ Error crítico migrando la base de datos: {e}")
         if "Connection refused" in str(e):
             logger.error("💡 Pista: ¿Está el contenedor de Docker levantado? (docker ps)")
-    finally:
-        await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(init_db())
+    init_db()
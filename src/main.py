@@ -1,17 +1,152 @@
-import uvicorn
+import asyncio
+import contextlib
 
+from app.api.dependencies.images import image_thumbnailer
+from app.api.dependencies.trending import trending_tracker
+from app.api.middleware.db_profiler import query_profiler_middleware
+from app.api.middleware.load_shedding import LoadSheddingMiddleware
 from app.api.middleware.trace import request_id_middleware
+from app.api.middleware.tracing import TracingMiddleware
 from app.api.v1.api import api_router
-from app.core.logging_setup import setup_logging
+from app.core.logging_setup import get_logger, setup_logging
 from app.core.config import settings
+from app.domain.events import BidPlaced
 from app.domain.exceptions import setup_exception_handlers
+from app.infrastructure.db.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.infrastructure.events.in_process_event_bus import event_bus
+from app.infrastructure.observability.tracing import tracer
 
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranca y detiene las tareas en segundo plano de la aplicación.
+    """
+    tasks = []
+
+    # (Monitor del bucle de eventos) El primero en arrancar: también mide el arranque del resto
+    loop_monitor = None
+    if settings.LOOP_MONITOR_ENABLED:
+        from app.infrastructure.observability.loop_monitor import EventLoopMonitor
+
+        loop_monitor = EventLoopMonitor(
+            interval_seconds = settings.LOOP_MONITOR_INTERVAL_SECONDS,
+            block_threshold_seconds = settings.LOOP_MONITOR_BLOCK_THRESHOLD_MS / 1000,
+            window_seconds = settings.LOOP_MONITOR_WINDOW_SECONDS,
+            max_events = settings.LOOP_MONITOR_MAX_EVENTS,
+            logger = get_logger("runtime")
+        )
+        tasks.append(asyncio.create_task(loop_monitor.run()))
+    app.state.loop_monitor = loop_monitor
+
+    # (Perfilado de memoria) Solo si se pide tracemalloc permanente
+    memory_profiler = getattr(app.state, "memory_profiler", None)
+    if memory_profiler and settings.DEBUG_TRACEMALLOC_AT_STARTUP:
+        memory_profiler.start_at_startup()
+
+    # (Exportación de trazas) Por lotes, en un hilo
+    trace_sink = None
+    if settings.TRACING_ENABLED:
+        from app.infrastructure.events.sinks import NdjsonFileSink
+
+        trace_sink = NdjsonFileSink(settings.TRACING_EXPORT_PATH, fsync = False)
+        tasks.append(asyncio.create_task(tracer.run_exporter(trace_sink, settings.TRACING_EXPORT_INTERVAL_SECONDS)))
+
+    # (Suscriptores del bus de eventos)
+    event_bus.subscribe(BidPlaced, trending_tracker.on_bid_placed)
+
+    # (Avisos de outbid) El worker arranca antes de recibir eventos y se para después
+    notifier = None
+    if settings.NOTIFICATIONS_ENABLED:
+        from app.infrastructure.notifications.factory import build_outbid_notifier
+
+        notifier = build_outbid_notifier()
+        notifier.start()
+        event_bus.subscribe(BidPlaced, notifier.on_bid_placed)
+    app.state.outbid_notifier = notifier
+
+    # Las tareas de mantenimiento trabajan sobre la BD: no aplican con repositorios en memoria
+    if settings.REPOSITORY_BACKEND == "sqlalchemy":
+        from app.infrastructure.db.routing import replica_router
+        from app.infrastructure.db.session import AsyncSessionLocal
+
+        # (Retraso de la réplica) Solo si hay réplica configurada
+        if replica_router.monitor:
+            tasks.append(asyncio.create_task(replica_router.monitor.run()))
+
+        # (Archivado de pujas frías) Desactivado por defecto
+        if settings.BID_ARCHIVE_INTERVAL_SECONDS > 0:
+            from app.infrastructure.db.jobs.bid_archival import BidArchiver
+
+            archiver = BidArchiver(AsyncSessionLocal, timedelta(days = settings.BID_ARCHIVE_AFTER_DAYS), settings.BID_ARCHIVE_BATCH_SIZE)
+            tasks.append(asyncio.create_task(archiver.run_periodically(settings.BID_ARCHIVE_INTERVAL_SECONDS)))
+
+        # (Cierre de subastas vencidas)
+        if settings.AUCTION_CLOSE_INTERVAL_SECONDS > 0:
+            from app.infrastructure.db.jobs.auction_closer import run_auction_closer
+
+            tasks.append(asyncio.create_task(
+                run_auction_closer(AsyncSessionLocal, settings.AUCTION_CLOSE_INTERVAL_SECONDS, settings.AUCTION_CLOSE_BATCH_SIZE)
+            ))
+
+        # (Sesiones caducadas)
+        if settings.AUTH_SESSION_CLEANUP_INTERVAL_SECONDS > 0:
+            from app.infrastructure.db.jobs.auth_session_cleanup import run_auth_session_cleanup
+
+            tasks.append(asyncio.create_task(
+                run_auth_session_cleanup(AsyncSessionLocal, settings.AUTH_SESSION_CLEANUP_INTERVAL_SECONDS, settings.AUTH_SESSION_CLEANUP_BATCH_SIZE)
+            ))
+
+        # (Relay del outbox)
+        if settings.OUTBOX_RELAY_INTERVAL_SECONDS > 0:
+            from app.infrastructure.events.outbox_relay import OutboxRelay
+            from app.infrastructure.events.sinks import NdjsonFileSink
+
+            relay = OutboxRelay(
+                AsyncSessionLocal,
+                NdjsonFileSink(settings.OUTBOX_SINK_PATH, fsync = settings.OUTBOX_SINK_FSYNC),
+                batch_size = settings.OUTBOX_BATCH_SIZE,
+                poll_interval = settings.OUTBOX_RELAY_INTERVAL_SECONDS
+            )
+            tasks.append(asyncio.create_task(relay.run()))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    event_bus.unsubscribe(BidPlaced, trending_tracker.on_bid_placed)
+
+    # (Trazas) Las que quedan en la cola se escriben antes de salir
+    if trace_sink:
+        await tracer.flush(trace_sink)
+        await trace_sink.close()
+
+    if notifier:
+        event_bus.unsubscribe(BidPlaced, notifier.on_bid_placed)
+        await notifier.stop()
+
+    # (Miniaturas) El pool de procesos solo existe si ha habido alguna subida
+    await image_thumbnailer.close()
+
+    # (Pool de la BD) Cierra las conexiones: al reciclar un worker no quedan conexiones ni hilos colgados
+    if settings.REPOSITORY_BACKEND == "sqlalchemy":
+        from app.infrastructure.db.session import engine, read_engine
+
+        await engine.dispose()
+        if read_engine is not engine:
+            await read_engine.dispose()
+
+
 def create_application() -> FastAPI:
     """
     Factory para crear la instancia de FastAPI configurada.
@@ -19,7 +154,8 @@ def create_application() -> FastAPI:
     app = FastAPI(
         title = settings.APP_NAME,
         version = "0.1.0",
-        openapi_url = f"{settings.API_V1_STR}/openapi.json" if settings.DEBUG else None
+        openapi_url = f"{settings.API_V1_STR}/openapi.json" if settings.DEBUG else None,
+        lifespan = lifespan
     )
 
     # 1. Configuración de Middlewares
@@ -32,9 +168,35 @@ def create_application() -> FastAPI:
         allow_headers = ["*"],
     )
 
+    # (Perfilado SQL) Se registra antes que el Request ID para ejecutarse dentro de él
+    if settings.DB_PROFILING:
+        app.middleware("http")(query_profiler_middleware)
+
+    # (Trazas) Dentro del Request ID, para que cada traza lleve el suyo
+    if settings.TRACING_ENABLED:
+        app.add_middleware(TracingMiddleware, tracer = tracer)
+
     # (Request ID)
     app.middleware("http")(request_id_middleware)
 
+    # (Control de admisión) El más externo: una petición rechazada no pasa por nada más.
+    # Con repositorios en memoria no hay BD que proteger
+    if settings.LOAD_SHEDDING_ENABLED and settings.REPOSITORY_BACKEND == "sqlalchemy":
+        app.state.db_limiter = AdaptiveConcurrencyLimiter(
+            initial_limit = settings.DB_POOL_SIZE_PER_WORKER + settings.DB_MAX_OVERFLOW_PER_WORKER,
+            min_limit = settings.LOAD_SHEDDING_MIN_LIMIT,
+            max_limit = settings.LOAD_SHEDDING_MAX_LIMIT,
+            tolerance = settings.LOAD_SHEDDING_LATENCY_TOLERANCE
+        )
+        app.add_middleware(LoadSheddingMiddleware, limiter = app.state.db_limiter)
+
+    # (Perfilado bajo demanda) Desactivado por defecto: sin él, '/debug/profile' y '/debug/memory' responden 404
+    if settings.DEBUG_PROFILING_ENABLED:
+        from app.infrastructure.observability.profiler import MemoryProfiler, SamplingProfiler
+
+        app.state.sampling_profiler = SamplingProfiler(interval_seconds = settings.DEBUG_PROFILE_INTERVAL_MS / 1000)
+        app.state.memory_profiler = MemoryProfiler(traceback_frames = settings.DEBUG_TRACEMALLOC_FRAMES)
+
     # 2. Registro de rutas
     app.include_router(api_router, prefix = settings.API_V1_STR)
 
@@ -49,9 +211,16 @@ app = create_application()
 
 @app.get("/health", tags = ["Health"])
 async def health_check():
-    """Endpoint simple para verificar que la API está viva."""
-    return {"status": "ok", "environment": "dev" if settings.DEBUG else "prod"}
+    """Endpoint simple para verificar que la API está viva (y cómo de ocupado está su bucle de eventos)."""
+    health = {"status": "ok", "environment": "dev" if settings.DEBUG else "prod"}
+    loop_monitor = getattr(app.state, "loop_monitor", None)
+    if loop_monitor:
+        health["event_loop_lag_ms"] = loop_monitor.snapshot(with_events = False)["lag_ms"]
+    return health
 
 
 if __name__ == '__main__':
+    # Solo para desarrollo (recarga automática): los workers de 'serve.py' no lo necesitan al importar la app
+    import uvicorn
+
     uvicorn.run("main:app", host = "127.0.0.1", port = 8000, reload = True, reload_dirs = ["src"], log_level = "debug")
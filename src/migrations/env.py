@@ -0,0 +1,89 @@
+"""
+Entorno de Alembic: migraciones asíncronas con el mismo driver y la misma URL que la aplicación.
+
+- El esquema de referencia para '--autogenerate' es 'Base.metadata' (todos los modelos ORM).
+- La URL sale de 'Settings' (ficheros .env y variables de entorno), no de 'alembic.ini'.
+- En modo '--sql' (offline) solo se genera el SQL, para revisarlo antes de aplicarlo en producción.
+"""
+import asyncio
+import sys
+
+from alembic import context
+from logging.config import fileConfig
+from pathlib import Path
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# 'online_ddl' (junto a este fichero) se importa desde las revisiones
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.core.config import settings
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.models.types import GUID, UTCDateTime
+
+# Importaciones obligatorias de modelos (igual que en 'init_db.py'): sin ellas, '--autogenerate'
+# no ve las tablas y propondría borrarlas
+from app.infrastructure.db.models.user_orm import UserORM
+from app.infrastructure.db.models.auction_orm import AuctionORM
+from app.infrastructure.db.models.bid_orm import BidORM
+from app.infrastructure.db.models.auction_image_orm import AuctionImageORM
+from app.infrastructure.db.models.bid_archive_orm import BidArchiveORM
+from app.infrastructure.db.models.outbox_orm import OutboxORM
+from app.infrastructure.db.models.replication_heartbeat_orm import ReplicationHeartbeatORM
+from app.infrastructure.db.models.auth_session_orm import AuthSessionORM
+
+
+config = context.config
+if config.config_file_name is not None and not config.attributes.get("skip_logging_config"):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def render_item(type_, obj, autogen_context):
+    """Los tipos propios se escriben como 'GUID()' / 'UTCDateTime()' e importados de su módulo."""
+    if type_ == "type" and isinstance(obj, (GUID, UTCDateTime)):
+        name = type(obj).__name__
+        autogen_context.imports.add(f"from app.infrastructure.db.models.types import {name}")
+        return f"{name}()"
+    return False
+
+
+def configure(**kwargs) -> None:
+    context.configure(
+        target_metadata = target_metadata,
+        render_item = render_item,
+        compare_type = True,
+        # SQLite no admite la mayoría de ALTER TABLE: se recrea la tabla ("batch")
+        render_as_batch = settings.DATABASE_URL.startswith("sqlite"),
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    configure(url = settings.DATABASE_URL, literal_binds = True, dialect_opts = {"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    configure(connection = connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    # Sin pool: una sola conexión, que se cierra al terminar
+    engine = create_async_engine(settings.DATABASE_URL, poolclass = pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+    finally:
+        await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,59 @@
+"""
+Índices sin parar el servicio (DDL en línea de InnoDB).
+
+Un 'CREATE INDEX' normal puede copiar la tabla y bloquear las escrituras mientras dura. En
+MariaDB/MySQL estas funciones piden 'ALGORITHM=INPLACE, LOCK=NONE': el índice se construye
+mientras la tabla sigue aceptando lecturas y escrituras, y si el servidor no puede hacerlo así,
+la sentencia FALLA en lugar de bloquear en silencio (mejor un despliegue fallido que una caída).
+
+Antes de la sentencia se baja 'lock_wait_timeout': el ALTER necesita un instante el bloqueo de
+metadatos de la tabla, y mientras lo espera (p. ej. tras una transacción larga) todas las
+consultas nuevas a esa tabla se quedan en cola detrás de él. Mejor abortar y reintentar.
+
+En otros motores (SQLite en local y en los benchmarks) se usa el 'create_index' normal.
+
+Los índices se crean "si no existen" (MariaDB y SQLite): una BD creada con 'init_db.py' cuando
+el índice ya estaba en el modelo puede marcarse con 'alembic stamp 0001' y migrarse igual.
+"""
+from alembic import op
+from typing import Sequence
+
+
+LOCK_WAIT_TIMEOUT_SECONDS = 5
+
+
+def _is_mysql() -> bool:
+    # 'get_context' funciona también en modo '--sql' (sin conexión)
+    return op.get_context().dialect.name in ("mysql", "mariadb")
+
+
+def _if_exists_clause(clause: str) -> str:
+    # MySQL no admite 'IF [NOT] EXISTS' en ALTER TABLE ... INDEX; MariaDB sí
+    return f" {clause}" if getattr(op.get_context().dialect, "is_mariadb", False) else ""
+
+
+def create_index(name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+    if not _is_mysql():
+        op.create_index(name, table, list(columns), unique = unique, if_not_exists = True)
+        return
+
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    column_list = ", ".join(f"`{column}`" for column in columns)
+    if_not_exists = _if_exists_clause("IF NOT EXISTS")
+    op.execute(f"SET SESSION lock_wait_timeout = {LOCK_WAIT_TIMEOUT_SECONDS}")
+    op.execute(f"ALTER TABLE `{table}` ADD {kind}{if_not_exists} `{name}` ({column_list}), ALGORITHM=INPLACE, LOCK=NONE")
+
+
+def drop_index(name: str, table: str, foreign_key_column: str | None = None) -> None:
+    """
+    'foreign_key_column': si el índice es el que usa una clave foránea, InnoDB no deja borrarlo.
+    En la misma sentencia se crea el índice de una columna que InnoDB habría creado para la FK.
+    """
+    if not _is_mysql():
+        op.drop_index(name, table_name = table, if_exists = True)
+        return
+
+    if_exists = _if_exists_clause("IF EXISTS")
+    add_fk_index = f"ADD INDEX `{foreign_key_column}` (`{foreign_key_column}`), " if foreign_key_column else ""
+    op.execute(f"SET SESSION lock_wait_timeout = {LOCK_WAIT_TIMEOUT_SECONDS}")
+    op.execute(f"ALTER TABLE `{table}` {add_fk_index}DROP INDEX{if_exists} `{name}`, ALGORITHM=INPLACE, LOCK=NONE")
@@ -0,0 +1,82 @@
+"""Esquema inicial
+
+Las tablas tal y como las creaba 'init_db.py' (Base.metadata.create_all) antes de las
+migraciones: users, auctions y bids, sin los índices de consulta (revisión 0002). Las tablas
+y columnas añadidas después llegan en sus propias revisiones (0004 y 0005).
+
+Una BD creada antes con 'init_db.py' no se migra con esta revisión: se marca con
+'alembic stamp 0001' y después 'alembic upgrade head' ('init_db.py' ya lo hace así).
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 16:26:08.542674
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.infrastructure.db.models.types import GUID
+from app.infrastructure.db.models.types import UTCDateTime
+
+# Identificadores de la revisión (los usa Alembic)
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('is_superuser', sa.Boolean(), nullable=False),
+    sa.Column('created_at', UTCDateTime(), nullable=False),
+    sa.Column('updated_at', UTCDateTime(), nullable=False),
+    sa.Column('deleted_at', UTCDateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('auctions',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('starting_price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('current_price', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('start_time', UTCDateTime(), nullable=False),
+    sa.Column('end_time', UTCDateTime(), nullable=False),
+    sa.Column('state', sa.Enum('DRAFT', 'ACTIVE', 'COMPLETED', 'CANCELLED', name='auctionstate'), nullable=False),
+    sa.Column('created_at', UTCDateTime(), nullable=False),
+    sa.Column('updated_at', UTCDateTime(), nullable=False),
+    sa.Column('deleted_at', UTCDateTime(), nullable=True),
+    sa.Column('seller_id', GUID(), nullable=False),
+    sa.Column('winner_id', GUID(), nullable=True),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['winner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('bids',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', UTCDateTime(), nullable=False),
+    sa.Column('deleted_at', UTCDateTime(), nullable=True),
+    sa.Column('auction_id', GUID(), nullable=False),
+    sa.Column('bidder_id', GUID(), nullable=False),
+    sa.ForeignKeyConstraint(['auction_id'], ['auctions.id'], ),
+    sa.ForeignKeyConstraint(['bidder_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('bids')
+    op.drop_table('auctions')
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
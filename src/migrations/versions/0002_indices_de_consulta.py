@@ -0,0 +1,39 @@
+"""Índices de consulta: pujas por subasta/importe y por pujador, subastas por estado/fin y por vendedor
+
+Se crean en línea ('online_ddl'): en MariaDB, con ALGORITHM=INPLACE y LOCK=NONE, las tablas
+siguen aceptando pujas mientras se construyen. Para revisar el SQL antes de aplicarlo:
+'alembic upgrade 0001:0002 --sql'.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+import online_ddl
+
+# Identificadores de la revisión (los usa Alembic)
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Historial de pujas de una subasta, ordenado por importe ('get_by_auction_id')
+    online_ddl.create_index('ix_bids_auction_id_amount', 'bids', ['auction_id', 'amount'])
+    # Pujas de un usuario
+    online_ddl.create_index('ix_bids_bidder_id_created_at', 'bids', ['bidder_id', 'created_at'])
+    # Subastas activas por fecha de fin ('get_ending_soon' y el cierre automático)
+    online_ddl.create_index('ix_auctions_state_end_time', 'auctions', ['state', 'end_time'])
+    # Subastas de un vendedor ('stream' en la exportación). En InnoDB sustituye al índice implícito de la FK
+    online_ddl.create_index('ix_auctions_seller_id', 'auctions', ['seller_id'])
+
+
+def downgrade() -> None:
+    # Los que sirven a una clave foránea dejan en su lugar el índice de una columna
+    online_ddl.drop_index('ix_auctions_seller_id', 'auctions', foreign_key_column = 'seller_id')
+    online_ddl.drop_index('ix_auctions_state_end_time', 'auctions')
+    online_ddl.drop_index('ix_bids_bidder_id_created_at', 'bids', foreign_key_column = 'bidder_id')
+    online_ddl.drop_index('ix_bids_auction_id_amount', 'bids', foreign_key_column = 'auction_id')
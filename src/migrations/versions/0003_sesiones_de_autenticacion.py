@@ -0,0 +1,41 @@
+"""Sesiones de autenticación (refresh tokens rotatorios)
+
+Tabla nueva y vacía: sus índices se crean con ella, sin necesidad de 'online_ddl'.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 16:34:49.493028
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.infrastructure.db.models.types import GUID
+from app.infrastructure.db.models.types import UTCDateTime
+
+# Identificadores de la revisión (los usa Alembic)
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('auth_sessions',
+    sa.Column('id', GUID(), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('previous_token_hash', sa.String(length=64), nullable=True),
+    sa.Column('created_at', UTCDateTime(), nullable=False),
+    sa.Column('expires_at', UTCDateTime(), nullable=False),
+    sa.Column('revoked_at', UTCDateTime(), nullable=True),
+    sa.Column('user_id', GUID(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_auth_sessions_expires_at', 'auth_sessions', ['expires_at'], unique=False)
+    op.create_index('ix_auth_sessions_user_id', 'auth_sessions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('auth_sessions')
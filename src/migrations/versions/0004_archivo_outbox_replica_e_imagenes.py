@@ -0,0 +1,93 @@
+"""Tablas nuevas: archivo de pujas, outbox, latido de la réplica e imágenes de subastas
+
+Tablas nuevas y vacías: sus índices se crean con ellas, sin necesidad de 'online_ddl'.
+
+Las BDs creadas con una versión anterior de la revisión 0001 (que ya incluía estas tablas)
+las tienen: solo se crean las que faltan.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-20 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from app.infrastructure.db.models.types import GUID
+from app.infrastructure.db.models.types import UTCDateTime
+
+# Identificadores de la revisión (los usa Alembic)
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def existing_tables() -> set[str]:
+    # Sin conexión ('--sql') no se puede consultar: se genera el SQL completo
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    tables = existing_tables()
+
+    if 'bids_archive' not in tables:
+        op.create_table('bids_archive',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('created_at', UTCDateTime(), nullable=False),
+        sa.Column('deleted_at', UTCDateTime(), nullable=True),
+        sa.Column('archived_at', UTCDateTime(), nullable=False),
+        sa.Column('auction_id', GUID(), nullable=False),
+        sa.Column('bidder_id', GUID(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_bids_archive_auction_id', 'bids_archive', ['auction_id'], unique=False)
+
+    if 'outbox' not in tables:
+        op.create_table('outbox',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('aggregate_id', GUID(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+        )
+
+    if 'replication_heartbeat' not in tables:
+        op.create_table('replication_heartbeat',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('beat_at', UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'auction_images' not in tables:
+        op.create_table('auction_images',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('content_type', sa.String(length=50), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('original_key', sa.String(length=255), nullable=False),
+        sa.Column('thumbnail_key', sa.String(length=255), nullable=True),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('created_at', UTCDateTime(), nullable=False),
+        sa.Column('auction_id', GUID(), nullable=False),
+        sa.ForeignKeyConstraint(['auction_id'], ['auctions.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('auction_id', 'sha256', name='uq_auction_images_auction_sha256')
+        )
+        op.create_index('ix_auction_images_sha256', 'auction_images', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auction_images_sha256', table_name='auction_images')
+    op.drop_table('auction_images')
+    op.drop_table('replication_heartbeat')
+    op.drop_table('outbox')
+    op.drop_index('ix_bids_archive_auction_id', table_name='bids_archive')
+    op.drop_table('bids_archive')
@@ -0,0 +1,71 @@
+"""Estadísticas desnormalizadas de las subastas: bid_count, bidder_count y last_bid_at
+
+Añade las columnas y las rellena a partir de las pujas activas con un UPDATE por conjuntos
+(el mismo cálculo que 'app.infrastructure.db.jobs.auction_stats', aquí solo sobre 'bids':
+en una BD que llega a esta revisión el archivo de pujas aún no se ha usado).
+
+En MariaDB, ADD COLUMN con valor por defecto es instantáneo (no reescribe la tabla).
+El relleno recorre todas las subastas en una transacción: en tablas muy grandes se puede
+aplicar la revisión en una ventana de poco tráfico, o rellenar después por lotes con
+'python -m app.infrastructure.db.jobs.auction_stats'.
+
+Las BDs creadas con una versión anterior de la revisión 0001 ya tienen las columnas
+(mantenidas por la aplicación): no se tocan.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-20 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from app.infrastructure.db.models.types import UTCDateTime
+
+# Identificadores de la revisión (los usa Alembic)
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def existing_columns(table: str) -> set[str]:
+    # Sin conexión ('--sql') no se puede consultar: se genera el SQL completo
+    if context.is_offline_mode():
+        return set()
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    if 'bid_count' in existing_columns('auctions'):
+        return
+
+    op.add_column('auctions', sa.Column('bid_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('auctions', sa.Column('bidder_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('auctions', sa.Column('last_bid_at', UTCDateTime(), nullable=True))
+
+    # Relleno desde las pujas activas (subconsultas correlacionadas, una sola sentencia)
+    auctions = sa.table('auctions', sa.column('id'), sa.column('bid_count'), sa.column('bidder_count'), sa.column('last_bid_at'))
+    bids = sa.table('bids', sa.column('auction_id'), sa.column('bidder_id'), sa.column('created_at'), sa.column('deleted_at'))
+
+    def active_bids(aggregate):
+        return (
+            sa.select(aggregate)
+            .where(bids.c.auction_id == auctions.c.id, bids.c.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+
+    op.execute(
+        auctions.update().values(
+            bid_count = active_bids(sa.func.count()),
+            bidder_count = active_bids(sa.func.count(sa.distinct(bids.c.bidder_id))),
+            last_bid_at = active_bids(sa.func.max(bids.c.created_at))
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('auctions', 'last_bid_at')
+    op.drop_column('auctions', 'bidder_count')
+    op.drop_column('auctions', 'bid_count')
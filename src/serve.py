@@ -0,0 +1,101 @@
+"""
+Arranque de producción: varios procesos de uvicorn con uvloop (si está instalado) y httptools.
+
+- Nº de workers: 'SERVER_WORKERS' (0 = uno por CPU). Se exporta a los workers para que cada uno
+  abra solo su parte del pool de la BD ('DB_POOL_SIZE' / workers).
+- Un supervisor vigila a los workers y relanza los que mueren. También recicla cada worker tras
+  'SERVER_MAX_REQUESTS' peticiones (acota fugas de memoria y fragmentación), esperando a sus
+  peticiones en curso hasta 'SERVER_GRACEFUL_TIMEOUT_SECONDS'. Cada worker añade al límite hasta
+  'SERVER_MAX_REQUESTS_JITTER' peticiones al azar: con carga repartida, sin jitter llegarían
+  todos al límite a la vez.
+- Keep-alive y backlog configurables (ver 'Settings').
+
+Estado que NO se comparte entre workers (cada proceso tiene el suyo):
+- Ranking de tendencias ('TrendingTracker'): cada worker cuenta solo las pujas que atiende, así
+  que 'GET /auctions/trending' es una muestra (~1/N de las pujas con N workers) y puede variar
+  según el worker que responda.
+- Cachés de sesiones ('AUTH_SESSION_CACHE_TTL_SECONDS'): un logout tarda hasta el TTL en verse
+  en los demás workers.
+La marca de read-your-writes no está en esta lista: viaja con el cliente (ver 'db/routing.py').
+
+'main.py' sigue siendo el arranque de desarrollo (un proceso con recarga automática).
+
+Uso (desde 'src/'):
+    python serve.py
+"""
+import functools
+import math
+import os
+import random
+import uvicorn
+
+from app.core.config import settings
+from pathlib import Path
+from uvicorn.supervisors import Multiprocess
+
+
+def available_cpus() -> int:
+    """
+    CPUs que puede usar el proceso. 'os.cpu_count()' devuelve las de la máquina: en un contenedor
+    se tienen en cuenta la afinidad y la cuota de CPU del cgroup v2 ('cpu.max', p. ej. "200000 100000" = 2 CPUs).
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS or available_cpus()
+
+
+def build_config(workers: int) -> uvicorn.Config:
+    return uvicorn.Config(
+        "main:app",
+        host = settings.SERVER_HOST,
+        port = settings.SERVER_PORT,
+        workers = workers,
+        loop = settings.SERVER_LOOP,
+        http = settings.SERVER_HTTP,
+        backlog = settings.SERVER_BACKLOG,
+        timeout_keep_alive = settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        limit_max_requests = settings.SERVER_MAX_REQUESTS or None,
+        access_log = settings.SERVER_ACCESS_LOG,
+        proxy_headers = True,
+        forwarded_allow_ips = settings.SERVER_FORWARDED_ALLOW_IPS,
+        lifespan = "on"
+    )
+
+
+def run_worker(server: uvicorn.Server, sockets = None) -> None:
+    """Arranque de cada worker (también de los relanzados): su propio límite de peticiones, con jitter."""
+    config = server.config
+    if config.limit_max_requests:
+        config.limit_max_requests += random.randint(0, settings.SERVER_MAX_REQUESTS_JITTER)
+    server.run(sockets = sockets)
+
+
+def main():
+    workers = worker_count()
+
+    # Los workers heredan el entorno (y vuelven a leer 'Settings' al importar la app)
+    os.environ["SERVER_WORKERS"] = str(workers)
+    config = build_config(workers)
+    server = uvicorn.Server(config)
+
+    # Siempre con supervisor, también con un solo worker: si no, al llegar a 'SERVER_MAX_REQUESTS'
+    # el proceso terminaría en lugar de reciclarse
+    sock = config.bind_socket()
+    try:
+        Multiprocess(config, target = functools.partial(run_worker, server), sockets = [sock]).run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
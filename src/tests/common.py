@@ -0,0 +1,128 @@
+"""
+Utilidades compartidas por las pruebas: esquema de la BD, datos de partida y servicios
+montados como en las dependencias de la API (una sesión por "petición").
+"""
+import init_db # noqa: F401 (registra todos los modelos en Base.metadata)
+
+from app.application.services.auction_service import AuctionService
+from app.application.services.auth_service import AuthService, AuthSessionCache
+from app.application.services.bid_service import BidService
+from app.application.services.user_service import UserService
+from app.domain.models.auction import Auction
+from app.domain.models.user import User
+from app.infrastructure.db.base import Base
+from app.infrastructure.db.repositories.sqlalchemy_auction_repository import SQLAlchemyAuctionRepository
+from app.infrastructure.db.repositories.sqlalchemy_auth_session_repository import SQLAlchemyAuthSessionRepository
+from app.infrastructure.db.repositories.sqlalchemy_bid_repository import SQLAlchemyBidRepository
+from app.infrastructure.db.repositories.sqlalchemy_outbox_repository import SQLAlchemyOutboxRepository
+from app.infrastructure.db.repositories.sqlalchemy_user_repository import SQLAlchemyUserRepository
+from app.infrastructure.db.session import AsyncSessionLocal, engine
+from app.infrastructure.db.unit_of_work import SQLAlchemyUnitOfWork
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+
+
+IS_SQLITE = engine.url.get_backend_name() == "sqlite"
+REFRESH_TOKEN_LIFETIME = timedelta(days = 7)
+
+session_factory = AsyncSessionLocal
+
+
+class LockingReads:
+    """SELECTs de la sesión sobre 'auctions', compilados para MariaDB (SQLite no emite FOR UPDATE)."""
+    def __init__(self, session):
+        self.statements: list[str] = []
+        event.listen(session.sync_session, "do_orm_execute", self._on_execute)
+
+    def _on_execute(self, state):
+        if state.is_select:
+            sql = str(state.statement.compile(dialect = mysql.dialect()))
+            if "FROM auctions" in sql:
+                self.statements.append(sql)
+
+    @property
+    def locked(self) -> bool:
+        return bool(self.statements) and all(sql.rstrip().endswith("FOR UPDATE") for sql in self.statements)
+
+
+async def create_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def drop_schema() -> None:
+    # Cada prueba corre en su propio bucle de eventos: las conexiones del pool no se reutilizan
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def create_users(count: int, password_hash: str = "x") -> list[User]:
+    users = [User(username = f"user_{i}", email = f"user_{i}@example.com", password_hash = password_hash) for i in range(count)]
+    async with session_factory() as session:
+        repo = SQLAlchemyUserRepository(session)
+        for user in users:
+            await repo.create(user)
+        await session.commit()
+    return users
+
+
+async def create_auction(seller_id) -> Auction:
+    auction = Auction(
+        title = "Subasta de prueba",
+        description = "Creada por las pruebas",
+        starting_price = Decimal("10.00"),
+        end_time = datetime.now(timezone.utc) + timedelta(days = 1),
+        seller_id = seller_id
+    )
+    async with session_factory() as session:
+        await SQLAlchemyAuctionRepository(session).create(auction)
+        await session.commit()
+    return auction
+
+
+def auction_repository(session) -> SQLAlchemyAuctionRepository:
+    return SQLAlchemyAuctionRepository(session)
+
+
+def auction_service(session) -> AuctionService:
+    return AuctionService(
+        SQLAlchemyAuctionRepository(session),
+        logger.bind(module = "auctions"),
+        SQLAlchemyUnitOfWork(session),
+        SQLAlchemyOutboxRepository(session)
+    )
+
+
+def bid_service(session) -> BidService:
+    return BidService(
+        logger.bind(module = "bids"),
+        SQLAlchemyBidRepository(session),
+        SQLAlchemyAuctionRepository(session),
+        SQLAlchemyUnitOfWork(session),
+        outbox = SQLAlchemyOutboxRepository(session)
+    )
+
+
+def user_service(session, cache: AuthSessionCache, uow = None) -> UserService:
+    return UserService(
+        SQLAlchemyUserRepository(session),
+        logger.bind(module = "users"),
+        uow or SQLAlchemyUnitOfWork(session),
+        SQLAlchemyAuthSessionRepository(session),
+        cache
+    )
+
+
+def auth_service(session, cache: AuthSessionCache) -> AuthService:
+    return AuthService(
+        SQLAlchemyAuthSessionRepository(session),
+        SQLAlchemyUserRepository(session),
+        cache,
+        REFRESH_TOKEN_LIFETIME,
+        logger.bind(module = "users"),
+        SQLAlchemyUnitOfWork(session)
+    )
@@ -0,0 +1,91 @@
+"""
+Límite de imágenes por subasta: se vuelve a comprobar al registrar la imagen, con la subasta
+bloqueada, porque otra subida puede registrarse mientras esta se transfiere.
+"""
+import tempfile
+import unittest
+
+from tests import common
+from app.application.ports.thumbnailer import Thumbnailer
+from app.application.services.auction_image_service import AuctionImageService
+from app.domain.models.auction_image import AuctionImage
+from app.infrastructure.db.repositories.sqlalchemy_auction_image_repository import SQLAlchemyAuctionImageRepository
+from app.infrastructure.db.unit_of_work import SQLAlchemyUnitOfWork
+from app.infrastructure.storage.local_object_store import LocalObjectStore
+from loguru import logger
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+MAX_BYTES = 1024
+
+
+class NoThumbnailer(Thumbnailer):
+    """Miniaturas desactivadas."""
+    async def create(self, source_key: str):
+        return None
+
+
+class AuctionImageLimitTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await common.create_schema()
+        self.addAsyncCleanup(common.drop_schema)
+        self.seller, = await common.create_users(1)
+        self.auction = await common.create_auction(self.seller.id)
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.store = LocalObjectStore(workdir.name, fsync = False)
+
+
+    def image_service(self, session) -> AuctionImageService:
+        return AuctionImageService(
+            SQLAlchemyAuctionImageRepository(session),
+            common.auction_repository(session),
+            self.store,
+            NoThumbnailer(),
+            logger.bind(module = "auctions"),
+            SQLAlchemyUnitOfWork(session)
+        )
+
+
+    async def count_images(self) -> int:
+        async with common.session_factory() as session:
+            return await SQLAlchemyAuctionImageRepository(session).count_by_auction_id(self.auction.id)
+
+
+    async def test_upload_locks_auction(self):
+        async def chunks():
+            yield PNG
+
+        async with common.session_factory() as session:
+            service = self.image_service(session)
+            reads = common.LockingReads(session)
+            _, created = await service.upload_image(self.auction.id, self.seller.id, chunks(), MAX_BYTES, max_images = 1)
+        self.assertTrue(created)
+        self.assertTrue(any(sql.rstrip().endswith("FOR UPDATE") for sql in reads.statements), reads.statements)
+
+
+    async def test_limit_is_checked_again_when_registering(self):
+        async def chunks():
+            # Otra subida se registra mientras esta se transfiere (ya pasó la comprobación rápida)
+            async with common.session_factory() as other:
+                await SQLAlchemyAuctionImageRepository(other).create(AuctionImage(
+                    auction_id = self.auction.id,
+                    sha256 = "0" * 64,
+                    content_type = "image/png",
+                    size_bytes = 1,
+                    original_key = "images/other"
+                ))
+                await other.commit()
+            yield PNG
+
+        async with common.session_factory() as session:
+            with self.assertRaises(ValueError):
+                await self.image_service(session).upload_image(self.auction.id, self.seller.id, chunks(), MAX_BYTES, max_images = 1)
+
+        self.assertEqual(await self.count_images(), 1)
+        # El fichero subido no queda huérfano en el almacén
+        self.assertEqual([p for p in self.store.root.rglob("*") if p.is_file()], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Cancelar o editar una subasta la lee con SELECT ... FOR UPDATE: 'cancel' comprueba el estado
+que va a sobrescribir y no puede pisar un cierre que ocurra entre la lectura y el commit.
+"""
+import unittest
+
+from tests import common
+from app.domain.models.auction import AuctionState
+
+
+class AuctionLockingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await common.create_schema()
+        self.addAsyncCleanup(common.drop_schema)
+        self.seller, = await common.create_users(1)
+        self.auction = await common.create_auction(self.seller.id)
+
+
+    async def test_cancel_auction_locks_auction(self):
+        async with common.session_factory() as session:
+            reads = common.LockingReads(session)
+            auction = await common.auction_service(session).cancel_auction(self.auction.id, self.seller.id)
+        self.assertTrue(reads.locked, reads.statements)
+        self.assertEqual(auction.state, AuctionState.CANCELLED)
+
+
+    async def test_update_details_locks_auction(self):
+        async with common.session_factory() as session:
+            reads = common.LockingReads(session)
+            auction = await common.auction_service(session).update_details(self.auction.id, self.seller.id, "Nuevo título")
+        self.assertTrue(reads.locked, reads.statements)
+        self.assertEqual(auction.title, "Nuevo título")
+
+
+    async def test_cancel_completed_auction_is_rejected(self):
+        async with common.session_factory() as session:
+            repo = common.auction_repository(session)
+            auction = await repo.get_by_id(self.auction.id)
+            auction.state = AuctionState.COMPLETED
+            await repo.update(auction)
+            await session.commit()
+
+        async with common.session_factory() as session:
+            with self.assertRaises(ValueError):
+                await common.auction_service(session).cancel_auction(self.auction.id, self.seller.id)
+
+        async with common.session_factory() as session:
+            auction = await common.auction_repository(session).get_by_id(self.auction.id)
+        self.assertEqual(auction.state, AuctionState.COMPLETED)
+
+
+if __name__ == "__main__":
+    unittest.main()
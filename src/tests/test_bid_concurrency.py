@@ -0,0 +1,72 @@
+"""
+Pujas simultáneas en la misma subasta: la subasta se lee con SELECT ... FOR UPDATE en
+'place_bid' y 'retract_bid', y el precio, el ganador y los contadores no pierden escrituras.
+"""
+import asyncio
+import unittest
+
+from tests import common
+from app.api.v1.schemas.bid import BidCreate
+from decimal import Decimal
+
+
+class BidConcurrencyTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await common.create_schema()
+        self.addAsyncCleanup(common.drop_schema)
+        self.seller, *self.bidders = await common.create_users(11)
+        self.auction = await common.create_auction(self.seller.id)
+
+
+    async def test_place_bid_locks_auction(self):
+        async with common.session_factory() as session:
+            reads = common.LockingReads(session)
+            service = common.bid_service(session)
+            await service.place_bid(BidCreate(amount = Decimal("20.00"), auction_id = self.auction.id), self.auction.id, self.bidders[0].id)
+        self.assertTrue(reads.locked, reads.statements)
+
+
+    async def test_retract_bid_locks_auction(self):
+        async with common.session_factory() as session:
+            bid = await common.bid_service(session).place_bid(
+                BidCreate(amount = Decimal("20.00"), auction_id = self.auction.id), self.auction.id, self.bidders[0].id
+            )
+        async with common.session_factory() as session:
+            reads = common.LockingReads(session)
+            await common.bid_service(session).retract_bid(bid.id, self.bidders[0].id)
+        self.assertTrue(reads.locked, reads.statements)
+
+
+    @unittest.skipIf(common.IS_SQLITE, "Sin bloqueos de fila en SQLite: definir TEST_DB_URL con MariaDB")
+    async def test_concurrent_single_bids_do_not_lose_updates(self):
+        # Cada puja en su propia sesión, como cada petición. Con la subasta bloqueada, las pujas
+        # se serializan: cada una ve el precio que dejó la anterior y las que no lo superan se rechazan
+        async def place(i, bidder):
+            async with common.session_factory() as session:
+                amount = Decimal("11.00") + i
+                await common.bid_service(session).place_bid(BidCreate(amount = amount, auction_id = self.auction.id), self.auction.id, bidder.id)
+
+        for round_ in range(3):
+            results = await asyncio.gather(
+                *(place(round_ * len(self.bidders) + i, bidder) for i, bidder in enumerate(self.bidders)),
+                return_exceptions = True
+            )
+            unexpected = [r for r in results if isinstance(r, Exception) and not isinstance(r, ValueError)]
+            self.assertEqual(unexpected, [])
+
+        async with common.session_factory() as session:
+            auction = await common.auction_repository(session).get_by_id(self.auction.id)
+        active = [b for b in auction.bids if b.deleted_at is None]
+        best = max(active, key = lambda b: b.amount)
+
+        # Aceptadas en orden de llegada: cada una supera a la anterior
+        amounts = [b.amount for b in sorted(active, key = lambda b: b.created_at)]
+        self.assertEqual(amounts, sorted(amounts))
+        self.assertEqual(auction.current_price, best.amount)
+        self.assertEqual(auction.winner_id, best.bidder_id)
+        self.assertEqual(auction.bid_count, len(active))
+        self.assertEqual(auction.bidder_count, len({b.bidder_id for b in active}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Entrega al menos una vez del relay del outbox: si el destino falla a mitad de una pasada, las
+filas del lote fallido siguen en el outbox y la siguiente pasada las publica; una fila solo se
+borra después de publicarse con éxito.
+"""
+import unittest
+
+from tests import common
+from app.api.v1.schemas.bid import BidCreate
+from app.application.ports.event_sink import EventSink
+from app.infrastructure.db.models.outbox_orm import OutboxORM
+from app.infrastructure.events.outbox_relay import OutboxRelay
+from decimal import Decimal
+from sqlalchemy import select
+
+
+EVENTS = 5
+BATCH_SIZE = 2
+
+
+class RecordingSink(EventSink):
+    """Guarda los mensajes publicados. 'fail_on' (nº de llamada) falla antes o después de guardarlos."""
+    def __init__(self, fail_on: int | None = None, after_publish: bool = False):
+        self.messages: list[dict] = []
+        self.calls = 0
+        self.fail_on = fail_on
+        self.after_publish = after_publish
+
+    async def publish(self, messages):
+        self.calls += 1
+        failing = self.calls == self.fail_on
+        if failing and not self.after_publish:
+            raise RuntimeError("Fallo antes de publicar")
+        self.messages.extend(messages)
+        if failing:
+            raise RuntimeError("Caída después de publicar")
+
+
+class OutboxRelayTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await common.create_schema()
+        self.addAsyncCleanup(common.drop_schema)
+        seller, *bidders = await common.create_users(EVENTS + 1)
+        auction = await common.create_auction(seller.id)
+        # Cada puja deja su evento en el outbox, en la misma transacción
+        for i, bidder in enumerate(bidders):
+            async with common.session_factory() as session:
+                await common.bid_service(session).place_bid(
+                    BidCreate(amount = Decimal("11.00") + i, auction_id = auction.id), auction.id, bidder.id
+                )
+        self.expected = await self.outbox_ids()
+        self.assertEqual(len(self.expected), EVENTS)
+
+
+    async def outbox_ids(self) -> list[int]:
+        async with common.session_factory() as session:
+            return list((await session.execute(select(OutboxORM.id).order_by(OutboxORM.id))).scalars())
+
+
+    async def drain(self, relay: OutboxRelay) -> None:
+        while await relay.relay_once():
+            pass
+
+
+    async def test_failed_batch_is_kept_and_redelivered(self):
+        sink = RecordingSink(fail_on = 2)
+        relay = OutboxRelay(common.session_factory, sink, batch_size = BATCH_SIZE)
+        with self.assertRaises(RuntimeError):
+            await self.drain(relay)
+
+        # Solo se borró el primer lote, el único publicado
+        self.assertEqual([m["id"] for m in sink.messages], self.expected[:BATCH_SIZE])
+        self.assertEqual(await self.outbox_ids(), self.expected[BATCH_SIZE:])
+
+        await self.drain(relay)
+        self.assertEqual([m["id"] for m in sink.messages], self.expected)
+        self.assertEqual(await self.outbox_ids(), [])
+
+
+    async def test_crash_after_publish_redelivers_batch(self):
+        sink = RecordingSink(fail_on = 2, after_publish = True)
+        relay = OutboxRelay(common.session_factory, sink, batch_size = BATCH_SIZE)
+        with self.assertRaises(RuntimeError):
+            await self.drain(relay)
+
+        # Publicado pero no borrado: sigue pendiente
+        self.assertEqual(await self.outbox_ids(), self.expected[BATCH_SIZE:])
+
+        await self.drain(relay)
+        delivered = [m["id"] for m in sink.messages]
+        self.assertEqual(set(delivered), set(self.expected))
+        # El lote de la caída se entrega dos veces (deduplicable por 'id')
+        self.assertEqual(len(delivered), EVENTS + BATCH_SIZE)
+        self.assertEqual(await self.outbox_ids(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
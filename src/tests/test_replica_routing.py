@@ -0,0 +1,76 @@
+"""
+Read-your-writes con varios workers: la marca de "acaba de escribir" la guarda el cliente y la
+reconoce cualquier worker (mismo 'SECRET_KEY'), hasta que caduca. No se puede fabricar ni alargar.
+"""
+import unittest
+
+from app.infrastructure.db.routing import ReadYourWritesMarker, ReplicaRouter
+from app.infrastructure.db.session import engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+SECRET = "test-secret"
+TTL_SECONDS = 10.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ReadYourWritesMarkerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        # Dos workers: procesos distintos, sin memoria compartida
+        self.worker_a = ReadYourWritesMarker(SECRET, TTL_SECONDS, clock = self.clock)
+        self.worker_b = ReadYourWritesMarker(SECRET, TTL_SECONDS, clock = self.clock)
+
+
+    def test_marker_is_honored_by_another_worker_until_it_expires(self):
+        marker = self.worker_a.issue()
+        self.assertTrue(self.worker_b.is_sticky(marker))
+        self.clock.now += TTL_SECONDS + 2
+        self.assertFalse(self.worker_b.is_sticky(marker))
+
+
+    def test_forged_or_missing_markers_are_ignored(self):
+        expires, _, signature = self.worker_a.issue().partition(".")
+        extended = f"{int(expires) + 3600}.{signature}"
+        other_secret = ReadYourWritesMarker("other-secret", TTL_SECONDS, clock = self.clock).issue()
+        for marker in (None, "", "garbage", f"{expires}.", extended, other_secret):
+            self.assertFalse(self.worker_b.is_sticky(marker), marker)
+
+
+class ReplicaRouterTest(unittest.TestCase):
+    def router(self, replica_factory) -> ReplicaRouter:
+        primary_factory = async_sessionmaker(engine)
+        router = ReplicaRouter(
+            primary_factory,
+            replica_factory or primary_factory,
+            max_lag_seconds = 5.0,
+            read_your_writes_seconds = TTL_SECONDS,
+            lag_check_seconds = 1.0,
+            secret_key = SECRET
+        )
+        if router.monitor:
+            router.monitor.lag_seconds = 0.0
+        return router
+
+
+    def test_recent_writer_reads_from_primary_in_any_worker(self):
+        replica_factory = async_sessionmaker(engine)
+        worker_a, worker_b = self.router(replica_factory), self.router(replica_factory)
+        marker = worker_a.mark_write()
+        self.assertFalse(worker_b.route(marker))
+        self.assertTrue(worker_b.route(None))
+
+
+    def test_no_marker_without_replica(self):
+        self.assertIsNone(self.router(None).mark_write())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Cambiar la contraseña o borrar el usuario cierra todas sus sesiones, en la misma unidad de
+trabajo que el cambio: o se confirman ambos, o ninguno.
+"""
+import unittest
+
+from tests import common
+from app.api.v1.schemas.user import UserPasswordUpdate
+from app.application.services.auth_service import AuthSessionCache
+from app.core.security import get_password_hash, parse_refresh_token
+from app.domain.exceptions import InvalidRefreshTokenError
+from app.domain.models.auth_session import AuthSession
+from app.infrastructure.db.unit_of_work import SQLAlchemyUnitOfWork
+from app.infrastructure.memory.repositories.in_memory_auth_session_repository import InMemoryAuthSessionRepository
+from app.infrastructure.memory.store import InMemoryStore
+from datetime import datetime, timezone
+from uuid import uuid4
+
+
+PASSWORD = "old-password"
+NEW_PASSWORD = "new-password"
+
+
+class FailingCommitUnitOfWork(SQLAlchemyUnitOfWork):
+    """El commit falla: lo que se hizo en la unidad de trabajo se deshace al salir."""
+    async def commit(self) -> None:
+        raise RuntimeError("Commit fallido")
+
+
+class UserSessionRevocationTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await common.create_schema()
+        self.addAsyncCleanup(common.drop_schema)
+        self.user, self.other_user = await common.create_users(2, password_hash = get_password_hash(PASSWORD))
+        self.cache = AuthSessionCache(ttl_seconds = 60)
+        self.refresh_tokens = [await self.start_session(self.user) for _ in range(2)]
+        self.other_refresh_token = await self.start_session(self.other_user)
+
+
+    async def start_session(self, user) -> str:
+        async with common.session_factory() as session:
+            _, refresh_token = await common.auth_service(session, self.cache).start_session(user)
+        return refresh_token
+
+
+    async def active_sessions(self, user) -> list:
+        """Estado en la BD, con una caché vacía (como otro worker)."""
+        async with common.session_factory() as session:
+            service = common.auth_service(session, AuthSessionCache(ttl_seconds = 60))
+            states = []
+            for session_id in self.session_ids(user):
+                states.append(await service.is_session_active(session_id))
+        return states
+
+
+    def session_ids(self, user) -> list:
+        tokens = self.refresh_tokens if user is self.user else [self.other_refresh_token]
+        return [parse_refresh_token(token)[0] for token in tokens]
+
+
+    async def test_change_password_revokes_all_sessions(self):
+        async with common.session_factory() as session:
+            await common.user_service(session, self.cache).change_password(
+                self.user.id, UserPasswordUpdate(current_password = PASSWORD, new_password = NEW_PASSWORD)
+            )
+
+        self.assertEqual(await self.active_sessions(self.user), [False, False])
+        self.assertEqual([self.cache.get(i) for i in self.session_ids(self.user)], [False, False])
+        self.assertEqual(await self.active_sessions(self.other_user), [True])
+
+        async with common.session_factory() as session:
+            with self.assertRaises(InvalidRefreshTokenError):
+                await common.auth_service(session, self.cache).refresh(self.refresh_tokens[0])
+
+
+    async def test_delete_user_revokes_all_sessions(self):
+        async with common.session_factory() as session:
+            await common.user_service(session, self.cache).delete_user(self.user.id)
+
+        self.assertEqual(await self.active_sessions(self.user), [False, False])
+        self.assertEqual(await self.active_sessions(self.other_user), [True])
+
+
+    async def test_failed_commit_keeps_password_and_sessions(self):
+        async with common.session_factory() as session:
+            service = common.user_service(session, self.cache, uow = FailingCommitUnitOfWork(session))
+            with self.assertRaises(RuntimeError):
+                await service.change_password(
+                    self.user.id, UserPasswordUpdate(current_password = PASSWORD, new_password = NEW_PASSWORD)
+                )
+
+        self.assertEqual(await self.active_sessions(self.user), [True, True])
+        self.assertEqual([self.cache.get(i) for i in self.session_ids(self.user)], [True, True])
+        async with common.session_factory() as session:
+            self.assertIsNotNone(await common.user_service(session, self.cache).authenticate(self.user.username, PASSWORD))
+
+
+class InMemoryRevokeAllForUserTest(unittest.IsolatedAsyncioTestCase):
+    async def test_revokes_only_active_sessions_of_the_user(self):
+        repo = InMemoryAuthSessionRepository(InMemoryStore())
+        user_id, other_user_id = uuid4(), uuid4()
+        expires_at = datetime.now(timezone.utc).replace(year = 2100)
+        sessions = [AuthSession(user_id = user_id, token_hash = str(i), expires_at = expires_at) for i in range(2)]
+        already_revoked = AuthSession(user_id = user_id, token_hash = "r", expires_at = expires_at, revoked_at = datetime.now(timezone.utc))
+        other = AuthSession(user_id = other_user_id, token_hash = "o", expires_at = expires_at)
+        for auth_session in (*sessions, already_revoked, other):
+            await repo.create(auth_session)
+
+        revoked = await repo.revoke_all_for_user(user_id)
+
+        self.assertCountEqual(revoked, [s.id for s in sessions])
+        for auth_session in sessions:
+            self.assertFalse((await repo.get_by_id(auth_session.id)).is_active())
+        self.assertTrue((await repo.get_by_id(other.id)).is_active())
+
+
+if __name__ == "__main__":
+    unittest.main()